@@ -5,6 +5,4 @@ admin.site.register(Project)
 admin.site.register(Contributor)
 admin.site.register(ProjectInvite)
 admin.site.register(Task)
-
-
-
+admin.site.register(NotificationLedger)
@@ -7,3 +7,5 @@ class ApiConfig(AppConfig):
 
     def ready(self):
        import api.signals
+       import project_tracker.utils.metrics  # DB query timer and Celery task metrics
+       import project_tracker.utils.slow_queries  # Slow query log on the default connection
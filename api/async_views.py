@@ -0,0 +1,203 @@
+"""
+Async variants of the read-heavy API views, served when ASYNC_API_VIEWS is on
+(the ASGI deployment). URLs, permissions, responses and cache keys are the
+same as the sync views in views.py, which these extend; only the I/O changes:
+authentication, the list caches and the queries are awaited (async ORM and
+the redis.asyncio client) instead of holding a worker thread.
+"""
+import logging
+from django.db import models
+from rest_framework import status
+from rest_framework.response import Response
+from project_tracker.utils import async_cache
+from project_tracker.utils.async_views import AsyncAPIViewMixin, AsyncListModelMixin, AsyncPaginationMixin
+from project_tracker.utils.compression import cache_compressed, cached_encoding, precompressed_response, variant_key
+from project_tracker.utils.metrics import record_cache
+from project_tracker.utils.response_handler import build_response
+from .models import Project, Task
+from .views import ProjectListAPIView, ProjectMembersAPIView, ProjectPagination, TaskListAPIView, TaskUpdateAPIView
+
+logger = logging.getLogger('tracker_logger')
+
+LIST_CACHE_TIMEOUT = 60 * 5
+
+
+async def cache_get_many(keys, cache_key):
+    try:
+        return await async_cache.aget_many(keys)
+    except Exception as cache_error:
+        logger.warning("Cache get failed for key %s: %s", cache_key, cache_error)
+        return {}
+
+
+async def cache_set(key, value):
+    try:
+        await async_cache.aset(key, value, timeout=LIST_CACHE_TIMEOUT)
+    except Exception as cache_error:
+        logger.warning("Cache set failed for key %s: %s", key, cache_error)
+
+
+class AsyncProjectPagination(AsyncPaginationMixin, ProjectPagination):
+    pass
+
+
+class AsyncProjectListAPIView(AsyncAPIViewMixin, AsyncListModelMixin, ProjectListAPIView):
+    pagination_class = AsyncProjectPagination
+
+    async def get(self, request, *args, **kwargs):
+        user = request.user
+        cache_key = f"project_list:{user.id}:{request.get_full_path()}"
+
+        encoding = cached_encoding(request)
+        compressed_key = variant_key(cache_key, encoding) if encoding else None
+
+        try:
+            cached = await cache_get_many([key for key in (compressed_key, cache_key) if key], cache_key)
+            if compressed_key in cached:
+                record_cache('project_list', 'compressed')
+                logger.debug("Serving compressed project list for %s from cache", user.email)
+                return precompressed_response(cached[compressed_key], encoding)
+
+            cached_data = cached.get(cache_key)
+            if cached_data:
+                record_cache('project_list', 'hit')
+                logger.debug("Serving project list for %s from cache", user.email)
+                return cache_compressed(Response(cached_data), cache_key, LIST_CACHE_TIMEOUT)
+
+            record_cache('project_list', 'miss')
+            logger.debug("Fetching project list for user: %s", user.email)
+            # ProjectSerializer lists member ids; prefetch them so rendering does no queries.
+            response = await self.alist(self.get_queryset().prefetch_related('members'))
+            await cache_set(cache_key, response.data)
+            return cache_compressed(response, cache_key, LIST_CACHE_TIMEOUT)
+
+        except Exception as e:
+            logger.exception("Unexpected error listing projects for %s: %s", user.email, e)
+            return build_response(
+                False,
+                "Failed to retrieve projects. Please try again later.",
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AsyncTaskListAPIView(AsyncAPIViewMixin, AsyncListModelMixin, TaskListAPIView):
+    pagination_class = AsyncProjectPagination
+
+    async def aget_queryset(self):
+        user = self.request.user
+        project_slug = self.kwargs.get('slug')
+        try:
+            project = await self.get_project_queryset().afirst()
+
+            if not project:
+                logger.warning("User %s attempted to access tasks for project %s without permission", user.email, project_slug)
+                return Task.objects.none()
+
+            return self.get_task_queryset(project)
+
+        except Exception as e:
+            logger.error("Error fetching tasks for project %s: %s", project_slug, e)
+            return Task.objects.none()
+
+    async def get(self, request, *args, **kwargs):
+        user = request.user
+        project_slug = self.kwargs.get('slug')
+        cache_key = f"task_list:{user.id}:{project_slug}:{request.get_full_path()}"
+
+        encoding = cached_encoding(request)
+        compressed_key = variant_key(cache_key, encoding) if encoding else None
+
+        try:
+            cached = await cache_get_many([key for key in (compressed_key, cache_key) if key], cache_key)
+            if compressed_key in cached:
+                record_cache('task_list', 'compressed')
+                logger.debug("Serving compressed task list for project %s and user %s from cache", project_slug, user.email)
+                return precompressed_response(cached[compressed_key], encoding)
+
+            cached_data = cached.get(cache_key)
+            if cached_data:
+                record_cache('task_list', 'hit')
+                logger.debug("Serving task list for project %s and user %s from cache", project_slug, user.email)
+                return cache_compressed(Response(cached_data), cache_key, LIST_CACHE_TIMEOUT)
+
+            record_cache('task_list', 'miss')
+            logger.debug("Fetching task list for project: %s and user: %s", project_slug, user.email)
+            response = await self.alist(await self.aget_queryset())
+            await cache_set(cache_key, response.data)
+            return cache_compressed(response, cache_key, LIST_CACHE_TIMEOUT)
+
+        except Exception as e:
+            logger.exception("Unexpected error listing tasks for project %s and user %s: %s", project_slug, user.email, e)
+            return build_response(
+                False,
+                "Failed to retrieve tasks. Please try again later.",
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class AsyncTaskUpdateAPIView(AsyncAPIViewMixin, TaskUpdateAPIView):
+    """Async GET; PATCH is the inherited sync handler."""
+
+    async def get(self, request, slug, *args, **kwargs):
+        logger.debug("Task retrieval attempt for task slug: %s by %s", slug, request.user.email)
+
+        try:
+            task = await (
+                self.get_queryset()
+                .select_related('project')
+                .prefetch_related('assigned_to')
+                .aget(slug=slug)
+            )
+            self.check_object_permissions(request, task)
+            serializer = self.get_serializer(task)
+
+            logger.info("Task '%s' retrieved successfully by %s", task.title, request.user.email)
+            return build_response(
+                True,
+                "Task retrieved successfully.",
+                data=serializer.data,
+                status_code=status.HTTP_200_OK
+            )
+        except Task.DoesNotExist:
+            logger.warning("Task with slug %s not found for user %s", slug, request.user.email)
+            return build_response(False, errors="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.exception("Unexpected error during task retrieval for %s: %s", slug, e)
+            return build_response(False, errors="Failed to retrieve task.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncProjectMembersAPIView(AsyncAPIViewMixin, ProjectMembersAPIView):
+    async def get(self, request, slug):
+        """Get all members of a project (excluding project creator)"""
+        try:
+            user = request.user
+            project = await Project.objects.filter(
+                slug=slug,
+                is_deleted=False
+            ).filter(
+                models.Q(created_by=user) | models.Q(members__user=user)
+            ).distinct().prefetch_related('members__user').afirst()
+
+            if not project:
+                return build_response(False, "Project not found", status_code=status.HTTP_404_NOT_FOUND)
+
+            members = [
+                {
+                    'id': contributor.id,
+                    'email': contributor.user.email,
+                    'name': f"{contributor.user.first_name} {contributor.user.last_name}".strip(),
+                    'role': getattr(contributor, 'role', 'member')
+                }
+                for contributor in project.members.all()
+            ]
+
+            return build_response(
+                True,
+                "Project members retrieved successfully",
+                data=members,
+                status_code=status.HTTP_200_OK
+            )
+
+        except Exception as e:
+            logger.exception("Error fetching project members for %s: %s", slug, e)
+            return build_response(False, "Failed to retrieve project members", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
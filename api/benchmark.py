@@ -0,0 +1,559 @@
+"""
+End-to-end load benchmark.
+
+Each scenario drives one endpoint with concurrent keep-alive clients, each
+logged in as a seeded user (api/seeding.py). The loop is closed: a client
+sends its next request as soon as the previous one returns. For every
+scenario we report:
+  - throughput;
+  - latency (mean, p50, p95, p99, max);
+  - status codes;
+  - database queries and DB time per request, from the route's counters on
+    /metrics before and after the run.
+`manage.py benchmark` runs the scenarios and writes the results as JSON. Its
+--compare option diffs a run against an earlier one, e.g. from the previous
+commit.
+
+A mix runs several scenarios at once, each with its own clients, and reports
+each part separately as '<mix>/<part>'. login-burst, for example, measures
+project list latency while logins keep the password hashing pool
+(users/hashing.py) busy.
+
+Targets:
+  - wsgi (default): the WSGI application on Django's threaded server, in this
+    process;
+  - asgi: the ASGI application under uvicorn, in this process. It serves the
+    async views when ASYNC_API_VIEWS=True;
+  - any running server (--base-url), e.g. gunicorn as deployed. It must use
+    this database, Redis and SECRET_KEY, because tokens are minted here.
+In-process servers share the GIL with the clients. Use their numbers to
+compare commits, not to plan capacity.
+
+Scenarios either only read or clean up after themselves, with one exception:
+task-update rewrites the descriptions of seeded tasks. Endpoints that delete
+data or send email (delete, invite, OTP, register, logout, import) are not
+benchmarked. email-render and overdue-sweep call the code directly instead of
+going through HTTP. The sweep runs as of SWEEP_DAYS_AHEAD days from now, so a
+realistic share of open tasks is marked overdue, and is then rolled back.
+"""
+import gzip
+import http.client
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import threading
+import time
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+from time import perf_counter
+from urllib.parse import urlsplit
+import django
+from django.conf import settings
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection, connections, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from prometheus_client.parser import text_string_to_metric_families
+from rest_framework.settings import api_settings
+from project_tracker.utils.email_templates import render_email
+from project_tracker.utils.metrics import track_queries
+from users.tokens import TrackerRefreshToken
+from .models import Project, Task
+from .seeding import SEED_PASSWORD, seeded_users
+from .tasks import sweep_task_range
+
+logger = logging.getLogger('tracker_logger')
+
+BENCHMARK_TASK_PREFIX = 'Benchmark task'
+MAX_TASKS_PER_CLIENT = 500      # Task slugs a client picks from
+SWEEP_DAYS_AHEAD = 30
+
+
+# ------------------------------------------------------------------ clients --
+
+class Client:
+    """One simulated user: a keep-alive connection, its tokens and the slugs it can reach."""
+
+    def __init__(self, number, base_url, user, projects, tasks, task_id_range, seed):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host, self.port = parts.hostname, parts.port
+        self.http = None
+        self.number = number
+        self.user = user
+        self.projects = projects
+        self.tasks = tasks
+        self.task_id_range = task_id_range
+        self.rng = random.Random(f"{seed}-{number}")
+        refresh = TrackerRefreshToken.for_user(user)
+        self.access, self.refresh = str(refresh.access_token), str(refresh)
+
+    def request(self, method, path, payload=None, auth=True):
+        """Send one request and read the whole response; returns (status, body)."""
+        headers = {'Accept-Encoding': 'gzip'}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload)
+            headers['Content-Type'] = 'application/json'
+        if auth:
+            headers['Authorization'] = f"Bearer {self.access}"
+        if self.http is None:
+            self.http = self.connection_class(self.host, self.port, timeout=60)
+        try:
+            self.http.request(method, path, body, headers)
+            response = self.http.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.getheader('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return response.status, content
+
+    def close(self):
+        if self.http is not None:
+            self.http.close()
+            self.http = None
+
+
+class Workload:
+    """The users of one seeded dataset, and per-user clients over it."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        users = seeded_users(seed)
+        self.managers = list(users.filter(role='manager').order_by('id'))
+        self.members = list(
+            users.filter(role='member', contributor_profile__projects__isnull=False).distinct().order_by('id')
+        )
+        bounds = Task.objects.filter(project__created_by__in=self.managers).aggregate(low=Min('id'), high=Max('id'))
+        self.task_id_range = (bounds['low'], bounds['high'])
+        if not self.managers or not self.members or bounds['low'] is None:
+            raise ValueError(f"No seeded dataset for seed {seed}")
+
+    def clients(self, base_url, role, count):
+        users = self.managers if role == 'manager' else self.members
+        clients = []
+        for number in range(count):
+            user = users[number % len(users)]
+            projects = Project.objects.filter(is_deleted=False)
+            projects = projects.filter(created_by=user) if role == 'manager' else projects.filter(members__user=user)
+            slugs = list(projects.order_by('id').values_list('slug', flat=True))
+            tasks = list(
+                Task.objects.filter(project__slug__in=slugs, is_deleted=False)
+                .order_by('id').values_list('slug', flat=True)[:MAX_TASKS_PER_CLIENT]
+            )
+            clients.append(Client(number, base_url, user, slugs, tasks, self.task_id_range, self.seed))
+        return clients
+
+
+# ---------------------------------------------------------------- scenarios --
+
+class Scenario:
+    """
+    `run(client)` performs one operation and returns its HTTP status. `route`
+    is the URL name the metrics are labelled with; local scenarios have none
+    and count their queries in-process.
+    """
+
+    def __init__(self, name, route, run, role='manager', concurrency=None, cleanup=None):
+        self.name = name
+        self.route = route
+        self.run = run
+        self.role = role
+        self.concurrency = concurrency
+        self.cleanup = cleanup
+
+    @property
+    def local(self):
+        return self.route is None
+
+
+class Mix:
+    """Scenarios driven at the same time until one of them has sent its requests."""
+
+    def __init__(self, name, parts):
+        self.name = name
+        self.parts = parts
+
+
+def _get(path):
+    return lambda client: client.request('GET', path(client))[0]
+
+
+def _project(client):
+    return client.rng.choice(client.projects)
+
+
+def _task(client):
+    return client.rng.choice(client.tasks)
+
+
+def update_task(client):
+    payload = {'description': f"Benchmark edit {client.rng.getrandbits(32):08x}"}
+    return client.request('PATCH', f"/api/tasks/{_task(client)}/edit/", payload)[0]
+
+
+def create_task(client):
+    payload = {
+        'title': f"{BENCHMARK_TASK_PREFIX} {uuid.uuid4().hex}",
+        'description': 'Created by the load benchmark.',
+        'due_date': (timezone.now().date() + timedelta(days=client.rng.randint(1, 60))).isoformat(),
+    }
+    return client.request('POST', f"/api/projects/{_project(client)}/tasks/add/", payload)[0]
+
+
+def delete_created_tasks():
+    # Set-wise, like delete_dataset(): no per-row cache invalidation threads.
+    tasks = Task.objects.filter(title__startswith=BENCHMARK_TASK_PREFIX, project__created_by__in=seeded_users())
+    assignees = Task.assigned_to.through.objects.filter(task__in=tasks)
+    assignees._raw_delete(assignees.db)
+    tasks._raw_delete(tasks.db)
+
+
+def login(client):
+    payload = {'email': client.user.email, 'password': SEED_PASSWORD}
+    return client.request('POST', '/api/auth/login/', payload, auth=False)[0]
+
+
+def refresh_token(client):
+    # Refresh tokens rotate and the old one is revoked, so keep the new one.
+    status, content = client.request('POST', '/api/auth/token/refresh/', {'refresh': client.refresh}, auth=False)
+    if status == 200:
+        client.refresh = json.loads(content).get('refresh', client.refresh)
+    return status
+
+
+def render_notification(client):
+    due = timezone.now().date() - timedelta(days=client.rng.randint(1, 30))
+    render_email('task_overdue_notification.html', {
+        'task_title': _task(client),
+        'project_name': _project(client),
+        'due_date': due,
+        'days_overdue': (timezone.now().date() - due).days,
+    })
+    return 200
+
+
+def sweep_overdue(client):
+    low, high = client.task_id_range
+    today = timezone.now().date() + timedelta(days=SWEEP_DAYS_AHEAD)
+    with transaction.atomic():
+        sweep_task_range(low, high, today.isoformat())
+        transaction.set_rollback(True)
+    return 200
+
+
+SCENARIOS = [
+    Scenario('project-list', 'project-list', _get(lambda client: '/api/projects/')),
+    Scenario('project-list-member', 'project-list', _get(lambda client: '/api/projects/'), role='member'),
+    Scenario('project-task-list', 'project-task-list', _get(lambda client: f"/api/projects/{_project(client)}/task_list/")),
+    Scenario('project-members', 'project-members', _get(lambda client: f"/api/projects/{_project(client)}/members/")),
+    Scenario('task-detail', 'task-update', _get(lambda client: f"/api/tasks/{_task(client)}/edit/")),
+    Scenario('task-export', 'task-export', _get(lambda client: f"/api/projects/{_project(client)}/tasks/export/")),
+    Scenario('notification-preferences', 'notification-preferences', _get(lambda client: '/api/auth/preferences/notifications/')),
+    Scenario('projects-page', 'projects_html', _get(lambda client: '/projects/')),
+    Scenario('task-update', 'task-update', update_task),
+    Scenario('task-create', 'task-create', create_task, cleanup=delete_created_tasks),
+    Scenario('token-refresh', 'token_refresh', refresh_token),
+    Scenario('login', 'user_login', login),
+    Scenario('email-render', None, render_notification),
+    Scenario('overdue-sweep', None, sweep_overdue, concurrency=1),
+    Mix('login-burst', [
+        Scenario('login', 'user_login', login),
+        Scenario('project-list', 'project-list', _get(lambda client: '/api/projects/'), role='member'),
+    ]),
+]
+SCENARIO_NAMES = [scenario.name for scenario in SCENARIOS]
+
+
+# ------------------------------------------------------------------ servers --
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def setup(self):
+        super().setup()
+        # wsgiref sends headers and body separately; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchmarkWSGIServer(ThreadedWSGIServer):
+    request_queue_size = 128        # Every client connects at once
+
+
+def start_wsgi_server():
+    """Serve the WSGI application on a free port; returns (base_url, stop)."""
+    server = BenchmarkWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler)
+    server.set_app(get_internal_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+    return f"http://127.0.0.1:{server.server_port}", stop
+
+
+def start_asgi_server():
+    """Serve the ASGI application under uvicorn on a free port; returns (base_url, stop)."""
+    import uvicorn
+
+    sock = socket.socket()
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)     # Inherited by accepted connections
+    sock.bind(('127.0.0.1', 0))
+    server = uvicorn.Server(uvicorn.Config(
+        'project_tracker.asgi:application', lifespan='off', log_level='warning', access_log=False,
+    ))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+        thread.join(10)
+    return f"http://127.0.0.1:{sock.getsockname()[1]}", stop
+
+
+def disable_throttles():
+    """Lift the login/OTP rate limits in this process: every client shares one IP."""
+    rates = api_settings.DEFAULT_THROTTLE_RATES
+    for scope in rates:
+        rates[scope] = None
+
+
+def set_log_level(level):
+    logging.getLogger('tracker_logger').setLevel(level)
+
+
+# ------------------------------------------------------------------ running --
+
+def scrape_routes(base_url):
+    """Per-route request, query and DB time totals from /metrics; None if unavailable."""
+    headers = {'Authorization': f"Bearer {settings.METRICS_TOKEN}"} if settings.METRICS_TOKEN else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(f"{base_url}/metrics", headers=headers), timeout=30) as response:
+            text = response.read().decode()
+    except OSError as e:
+        logger.warning("Could not scrape %s/metrics: %s", base_url, e)
+        return None
+
+    routes = defaultdict(Counter)
+    fields = {
+        'http_requests_total': 'requests',
+        'http_request_db_queries_total': 'queries',
+        'http_request_db_seconds_sum': 'db_seconds',
+    }
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name in fields and 'route' in sample.labels:
+                routes[sample.labels['route']][fields[sample.name]] += sample.value
+    return routes
+
+
+def _drive(scenario, client, counter, total, result, stop):
+    try:
+        with track_queries() as timer:
+            result['timer'] = timer
+            while not stop.is_set() and next(counter) < total:
+                start = perf_counter()
+                try:
+                    status = scenario.run(client)
+                except Exception as e:
+                    status = 'error'
+                    result['exceptions'][f"{type(e).__name__}: {e}"] += 1
+                result['latencies'].append(perf_counter() - start)
+                result['statuses'][status] += 1
+    finally:
+        stop.set()      # Ends the other parts of a mix too
+        client.close()
+        connections.close_all()     # This thread's connections (local scenarios)
+
+
+def run_phase(parts, total):
+    """
+    Drive each (scenario, clients) pair at once until one of them has sent
+    `total` operations; returns (seconds, per-client results of each pair).
+    """
+    stop = threading.Event()
+    results, threads = [], []
+    for scenario, clients in parts:
+        counter = itertools.count()
+        part_results = [
+            {'latencies': [], 'statuses': Counter(), 'exceptions': Counter(), 'timer': None}
+            for _ in clients
+        ]
+        threads.extend(
+            threading.Thread(target=_drive, args=(scenario, client, counter, total, result, stop))
+            for client, result in zip(clients, part_results)
+        )
+        results.append(part_results)
+
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return perf_counter() - start, results
+
+
+def latency_summary(latencies):
+    ms = sorted(seconds * 1000 for seconds in latencies)
+    if not ms:
+        return {}
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0]
+    return {
+        'mean': round(statistics.fmean(ms), 3),
+        'p50': round(p50, 3),
+        'p95': round(p95, 3),
+        'p99': round(p99, 3),
+        'max': round(ms[-1], 3),
+    }
+
+
+def run_scenario(scenario, workload, base_url, concurrency, requests, warmup):
+    """Run a scenario or a mix; returns results by name ('<mix>/<part>' for the parts of a mix)."""
+    parts = scenario.parts if isinstance(scenario, Mix) else [scenario]
+    remote = not all(part.local for part in parts)
+    clients = [workload.clients(base_url, part.role, part.concurrency or concurrency) for part in parts]
+    try:
+        if warmup:
+            run_phase(list(zip(parts, clients)), warmup)
+        before = scrape_routes(base_url) if remote else None
+        seconds, results = run_phase(list(zip(parts, clients)), requests)
+        after = scrape_routes(base_url) if remote else None
+    finally:
+        for part, part_clients in zip(parts, clients):
+            for client in part_clients:
+                client.close()
+            if part.cleanup:
+                part.cleanup()
+
+    if not isinstance(scenario, Mix):
+        return {scenario.name: summarize(scenario, clients[0], seconds, results[0], before, after)}
+    return {
+        f"{scenario.name}/{part.name}": summarize(part, part_clients, seconds, part_results, before, after)
+        for part, part_clients, part_results in zip(parts, clients, results)
+    }
+
+
+def summarize(scenario, clients, seconds, results, before, after):
+    statuses, exceptions, latencies = Counter(), Counter(), []
+    for result in results:
+        statuses.update(result['statuses'])
+        exceptions.update(result['exceptions'])
+        latencies.extend(result['latencies'])
+    errors = sum(count for status, count in statuses.items() if status == 'error' or status >= 400)
+
+    if scenario.local:
+        queries = sum(result['timer'].queries for result in results)
+        db_seconds = sum(result['timer'].seconds for result in results)
+        served = len(latencies)
+    elif before is not None and after is not None:
+        diff = after[scenario.route]
+        diff.subtract(before[scenario.route])
+        queries, db_seconds, served = diff['queries'], diff['db_seconds'], diff['requests']
+    else:
+        served = 0
+
+    return {
+        'route': scenario.route,
+        'concurrency': len(clients),
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        'exceptions': dict(exceptions.most_common(5)),
+        'seconds': round(seconds, 3),
+        'throughput': round(len(latencies) / seconds, 2) if seconds else None,
+        'latency_ms': latency_summary(latencies),
+        'db_queries_per_request': round(queries / served, 2) if served else None,
+        'db_ms_per_request': round(db_seconds * 1000 / served, 3) if served else None,
+    }
+
+
+# ------------------------------------------------------------------ results --
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(
+            ['git', *args], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True, timeout=30,
+        ).stdout.strip()
+
+    try:
+        return {'sha': git('rev-parse', 'HEAD'), 'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment(server, base_url, log_level):
+    return {
+        'time': timezone.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'server': server,
+        'base_url': base_url,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'cpus': os.cpu_count(),
+        'settings': {
+            'DEBUG': settings.DEBUG,
+            'ASYNC_API_VIEWS': settings.ASYNC_API_VIEWS,
+            'LOG_LEVEL': log_level or settings.LOG_LEVEL,
+            'LOG_FORMAT': settings.LOG_FORMAT,
+            'SLOW_QUERY_MS': settings.SLOW_QUERY_MS,
+            'PROFILING_ENABLED': settings.PROFILING_ENABLED,
+        },
+    }
+
+
+# (result path, label, True if a higher value is better)
+COMPARED_METRICS = (
+    (('throughput',), 'req/s', True),
+    (('latency_ms', 'p50'), 'p50 ms', False),
+    (('latency_ms', 'p95'), 'p95 ms', False),
+    (('latency_ms', 'p99'), 'p99 ms', False),
+    (('db_queries_per_request',), 'queries', False),
+)
+
+
+def compare(scenarios, baseline_scenarios):
+    """
+    Rows of (scenario, label, baseline, current, regression %) for the
+    scenarios in both runs. Regression is positive when the current run is
+    worse: slower, lower throughput or more queries.
+    """
+    rows = []
+    for name, result in scenarios.items():
+        baseline = baseline_scenarios.get(name)
+        if baseline is None:
+            continue
+        for path, label, higher_is_better in COMPARED_METRICS:
+            old, new = baseline, result
+            for key in path:
+                old, new = (old or {}).get(key), (new or {}).get(key)
+            if old is None or new is None:
+                continue
+            if old:
+                change = (new - old) / old * 100
+                regression = -change if higher_is_better else change
+            else:
+                regression = 0.0 if new == old else float('inf') * (-1 if higher_is_better else 1)
+            rows.append((name, label, old, new, round(regression, 1)))
+    return rows
@@ -0,0 +1,313 @@
+"""
+Streaming task import.
+
+Uploads (CSV or NDJSON) are read incrementally, never loaded whole. Rows are
+grouped into fixed-size chunks which are validated and inserted with bulk
+operations (COPY on PostgreSQL), either inline or on Celery workers through
+api.tasks.import_task_chunk. Progress is kept in the cache under the import id.
+"""
+import csv
+import io
+import json
+import logging
+import re
+import uuid
+from datetime import datetime
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from project_tracker.utils.bulk import bulk_insert
+from project_tracker.utils.create_unique_slug import generate_unique_slugs
+from .models import Project, Task
+from .signals import clear_project_cache_async
+
+logger = logging.getLogger('tracker_logger')
+
+SUPPORTED_FORMATS = ('csv', 'ndjson')
+REQUIRED_COLUMNS = ('title', 'due_date')
+STATUS_VALUES = {value for value, _ in Task.STATUS_CHOICES}
+PROGRESS_TIMEOUT = 60 * 60 * 24
+MAX_ERRORS_PER_CHUNK = 20
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+    """The upload as a whole cannot be read (unknown format, missing columns)."""
+
+
+class ImportRowError(ValueError):
+    """A single row failed validation; the rest of the chunk is still imported."""
+
+
+def detect_format(filename, file_format=None):
+    file_format = (file_format or filename.rsplit('.', 1)[-1]).lower()
+    if file_format in ('jsonl', 'json'):
+        file_format = 'ndjson'
+    if file_format not in SUPPORTED_FORMATS:
+        raise ImportFormatError(f"Unsupported file format '{file_format}'. Use one of: {', '.join(SUPPORTED_FORMATS)}.")
+    return file_format
+
+
+def iter_records(stream, file_format):
+    """Yield (line_number, record, error) from a binary stream, one row at a time."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ImportFormatError(f"CSV header is missing required column(s): {', '.join(missing)}.")
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError:
+            yield line_number, None, "Line is not valid JSON."
+
+
+def clean_record(record, member_ids, today):
+    """Validate one row the way TaskSerializer would and return model-ready values."""
+    if not isinstance(record, dict):
+        raise ImportRowError("Row must be an object.")
+
+    title = (record.get('title') or '').strip()
+    if not title:
+        raise ImportRowError("Task title cannot be empty or only spaces.")
+    if len(title) > Task._meta.get_field('title').max_length:
+        raise ImportRowError("Task title is too long.")
+
+    try:
+        due_date = datetime.strptime(str(record.get('due_date') or '').strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise ImportRowError("due_date must be a date in YYYY-MM-DD format.")
+
+    task_status = (record.get('status') or 'ongoing').strip().lower()
+    if task_status not in STATUS_VALUES:
+        raise ImportRowError(f"Invalid status '{task_status}'.")
+    # Same rule as Task.save(): unfinished tasks past their due date are overdue.
+    if task_status != 'completed' and due_date < today:
+        task_status = 'overdue'
+
+    assignees = record.get('assignees') or []
+    if isinstance(assignees, str):
+        assignees = [email for email in re.split(r'[;,\s]+', assignees) if email]
+    assignees = [str(email).strip().lower() for email in assignees]
+    unknown = [email for email in assignees if email not in member_ids]
+    if unknown:
+        raise ImportRowError(f"Assignees are not part of this project: {', '.join(unknown)}.")
+
+    return {
+        'title': title,
+        'description': record.get('description') or None,
+        'due_date': due_date,
+        'status': task_status,
+        'assigned_to': {member_ids[email] for email in assignees},
+    }
+
+
+def _key(import_id, name=None):
+    return f"task_import:{import_id}" if name is None else f"task_import:{import_id}:{name}"
+
+
+def insert_tasks(project, rows):
+    """Insert validated rows and their assignees; returns the number of tasks created."""
+    with transaction.atomic():
+        slugs = generate_unique_slugs(Task, [row['title'] for row in rows])
+        bulk_insert(Task, [
+            Task(
+                project=project,
+                slug=slug,
+                title=row['title'],
+                description=row['description'],
+                due_date=row['due_date'],
+                status=row['status'],
+            )
+            for slug, row in zip(slugs, rows)
+        ])
+
+        assigned = [(slug, row['assigned_to']) for slug, row in zip(slugs, rows) if row['assigned_to']]
+        if assigned:
+            task_ids = dict(
+                Task.objects.filter(slug__in=[slug for slug, _ in assigned]).values_list('slug', 'id')
+            )
+            through = Task.assigned_to.through
+            bulk_insert(through, [
+                through(task_id=task_ids[slug], contributor_id=contributor_id)
+                for slug, contributor_ids in assigned
+                for contributor_id in contributor_ids
+            ])
+
+    return len(rows)
+
+
+def import_chunk(project, import_id, rows, chunk_number):
+    """
+    Validate and insert one chunk of [line_number, record, error] rows, update
+    the progress counters and finish the import if this was the last chunk.
+    """
+    errors = []
+    created = 0
+
+    try:
+        member_ids = {
+            email.lower(): contributor_id
+            for contributor_id, email in project.members.values_list('id', 'user__email')
+        }
+        today = timezone.now().date()
+
+        cleaned = []
+        for line_number, record, error in rows:
+            if error is None:
+                try:
+                    cleaned.append((line_number, clean_record(record, member_ids, today)))
+                except ImportRowError as e:
+                    error = str(e)
+            if error:
+                errors.append({'line': line_number, 'error': error})
+
+        existing_titles = set(
+            Task.objects.filter(project=project)
+            .annotate(lower_title=Lower('title'))
+            .filter(lower_title__in=[row['title'].lower() for _, row in cleaned])
+            .values_list('lower_title', flat=True)
+        )
+        valid = []
+        for line_number, row in cleaned:
+            if row['title'].lower() in existing_titles:
+                errors.append({'line': line_number, 'error': "A task with this title already exists in this project."})
+            else:
+                valid.append(row)
+
+        created = insert_tasks(project, valid)
+
+    except Exception as e:
+        logger.exception("Task import %s: chunk %s failed: %s", import_id, chunk_number, e)
+        created = 0
+        errors = [{'line': rows[0][0] if rows else None, 'error': f"Chunk {chunk_number} failed: {e}"}]
+
+    cache.incr(_key(import_id, 'processed'), len(rows))
+    cache.incr(_key(import_id, 'created'), created)
+    cache.incr(_key(import_id, 'failed'), len(rows) - created)
+    if errors:
+        cache.set(_key(import_id, f'errors:{chunk_number}'), errors[:MAX_ERRORS_PER_CHUNK], timeout=PROGRESS_TIMEOUT)
+    cache.incr(_key(import_id, 'chunks_done'))
+
+    logger.info("Task import %s: chunk %s created %s of %s rows", import_id, chunk_number, created, len(rows))
+    finish_import(import_id)
+    return created
+
+
+def finish_import(import_id):
+    """Mark the import completed once every chunk is done; safe to call from any worker."""
+    meta = cache.get(_key(import_id))
+    if not meta or meta['total_chunks'] is None:
+        return False
+    if (cache.get(_key(import_id, 'chunks_done')) or 0) < meta['total_chunks']:
+        return False
+    if not cache.add(_key(import_id, 'finished'), True, timeout=PROGRESS_TIMEOUT):
+        return False
+
+    meta['status'] = 'completed'
+    meta['finished_at'] = timezone.now().isoformat()
+    cache.set(_key(import_id), meta, timeout=PROGRESS_TIMEOUT)
+
+    # Bulk inserts bypass the model signals, so invalidate the project once.
+    project = Project.objects.filter(id=meta['project_id']).first()
+    if project:
+        clear_project_cache_async(project)
+    logger.info("Task import %s completed", import_id)
+    return True
+
+
+def get_progress(import_id):
+    meta = cache.get(_key(import_id))
+    if meta is None:
+        return None
+
+    names = ['processed', 'created', 'failed', 'chunks_done']
+    counters = cache.get_many([_key(import_id, name) for name in names])
+    progress = {**meta, **{name: counters.get(_key(import_id, name), 0) for name in names}}
+
+    error_keys = [_key(import_id, f'errors:{number}') for number in range(1, progress['chunks_done'] + 1)]
+    errors = []
+    for chunk_errors in cache.get_many(error_keys).values():
+        errors.extend(chunk_errors)
+    progress['errors'] = sorted(errors, key=lambda error: error['line'] or 0)[:MAX_REPORTED_ERRORS]
+    return progress
+
+
+class TaskImport:
+    """Reads an upload and dispatches its chunks inline or to Celery workers."""
+
+    def __init__(self, project, user=None, chunk_size=None):
+        self.project = project
+        self.user = user
+        self.chunk_size = chunk_size or settings.TASK_IMPORT_CHUNK_SIZE
+        self.import_id = str(uuid.uuid4())
+
+    def _start(self, file_format, run_async):
+        cache.set_many({_key(self.import_id, name): 0 for name in ('processed', 'created', 'failed', 'chunks_done')},
+                       timeout=PROGRESS_TIMEOUT)
+        cache.set(_key(self.import_id), {
+            'import_id': self.import_id,
+            'project_id': self.project.id,
+            'project': self.project.slug,
+            'user_id': getattr(self.user, 'id', None),
+            'file_format': file_format,
+            'async': run_async,
+            'status': 'running',
+            'total_chunks': None,
+            'started_at': timezone.now().isoformat(),
+        }, timeout=PROGRESS_TIMEOUT)
+
+    def _chunks(self, records):
+        """Group records into chunks, flagging titles repeated within the file."""
+        seen_titles = set()
+        chunk = []
+        for line_number, record, error in records:
+            if error is None and isinstance(record, dict):
+                title = (record.get('title') or '').strip().lower()
+                if title and title in seen_titles:
+                    error = "Duplicate task title in the import file."
+                seen_titles.add(title)
+            chunk.append([line_number, record, error])
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, stream, file_format, run_async=False, on_progress=None):
+        from .tasks import import_task_chunk
+
+        self._start(file_format, run_async)
+        total_chunks = 0
+
+        try:
+            for total_chunks, rows in enumerate(self._chunks(iter_records(stream, file_format)), start=1):
+                if run_async:
+                    import_task_chunk.delay(self.import_id, self.project.id, rows, total_chunks)
+                else:
+                    import_chunk(self.project, self.import_id, rows, total_chunks)
+                    if on_progress:
+                        on_progress(get_progress(self.import_id))
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as e:
+            meta = cache.get(_key(self.import_id))
+            meta.update(status='failed', error=str(e))
+            cache.set(_key(self.import_id), meta, timeout=PROGRESS_TIMEOUT)
+            raise ImportFormatError(str(e))
+
+        meta = cache.get(_key(self.import_id))
+        meta['total_chunks'] = total_chunks
+        cache.set(_key(self.import_id), meta, timeout=PROGRESS_TIMEOUT)
+        finish_import(self.import_id)
+
+        logger.info("Task import %s for project '%s' dispatched %s chunk(s)", self.import_id, self.project.slug, total_chunks)
+        return get_progress(self.import_id)
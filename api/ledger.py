@@ -0,0 +1,95 @@
+"""
+Notification ledger.
+
+Every notification is recorded as (entity, kind, recipient, period) before it
+is queued, period being the day it was sent. Senders claim their whole batch
+with one INSERT ... ON CONFLICT DO NOTHING RETURNING per chunk and only mail
+the rows they actually inserted, so re-runs, overlapping sweeps and the
+scheduler can never send the same notification twice on the same day.
+
+Callers claim and enqueue in one transaction. A failed enqueue rolls the
+claims back, so a re-run sends those notifications instead of finding them
+already claimed. A concurrent claim of the same entry waits for that
+transaction. If the broker fails after some mail batches were published,
+a re-run sends those batches again: a rare duplicate rather than a lost
+notification.
+
+Overdue items are re-notified only on the days listed in OVERDUE_RENOTIFY_DAYS
+(days since the due date), instead of every night.
+"""
+from datetime import timedelta
+import logging
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import NotificationLedger
+
+logger = logging.getLogger('tracker_logger')
+
+CLAIM_CHUNK_SIZE = 1000
+LEDGER_COLUMNS = ('entity_type', 'entity_id', 'kind', 'recipient', 'period', 'created_at')
+
+
+def renotify_dates(today):
+    """Due/end dates whose overdue items get a reminder today."""
+    return sorted({today - timedelta(days=days) for days in settings.OVERDUE_RENOTIFY_DAYS if days > 0})
+
+
+def claim_notifications(entries, period):
+    """
+    Record (entity_type, entity_id, kind, recipient) entries for `period` and
+    return the subset that was not in the ledger yet, i.e. the ones to send.
+    Call it in the transaction that enqueues them.
+    """
+    entries = list(set(entries))
+    if not entries:
+        return set()
+
+    table = connection.ops.quote_name(NotificationLedger._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(column) for column in LEDGER_COLUMNS)
+    now = timezone.now()
+    claimed = set()
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(entries), CLAIM_CHUNK_SIZE):
+            chunk = entries[start:start + CLAIM_CHUNK_SIZE]
+            values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(chunk))
+            params = [
+                value
+                for entity_type, entity_id, kind, recipient in chunk
+                for value in (entity_type, entity_id, kind, recipient, period, now)
+            ]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {values} "
+                f"ON CONFLICT DO NOTHING RETURNING entity_type, entity_id, kind, recipient",
+                params,
+            )
+            claimed.update(tuple(row) for row in cursor.fetchall())
+
+    if len(claimed) < len(entries):
+        logger.info("Notification ledger skipped %s already sent notification(s)", len(entries) - len(claimed))
+    return claimed
+
+
+def claim_recipients(entity_type, entity_id, kind, recipients, period):
+    """Single-entity helper: the recipients that have not been notified for `period` yet."""
+    claimed = claim_notifications(
+        ((entity_type, entity_id, kind, recipient) for recipient in recipients), period
+    )
+    return sorted(recipient for _, _, _, recipient in claimed)
+
+
+def purge_ledger(before, batch_size=None):
+    """Delete ledger rows older than `before` in id batches (uses the period index)."""
+    batch_size = batch_size or settings.NOTIFICATION_LEDGER_PURGE_BATCH_SIZE
+    deleted = 0
+
+    while True:
+        ids = list(
+            NotificationLedger.objects.filter(period__lt=before).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        deleted += NotificationLedger.objects.filter(id__in=ids).delete()[0]
+
+    return deleted
@@ -0,0 +1,173 @@
+import json
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api import benchmark
+from api.models import Project, Task
+from api.seeding import delete_dataset, seed_dataset, seeded_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the API against a seeded dataset: throughput, latency percentiles and queries per "
+        "request for each scenario, written as JSON for comparison across commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                            help=f"Scenarios to run (default all): {', '.join(benchmark.SCENARIO_NAMES)}")
+        parser.add_argument('--server', default='wsgi', choices=['wsgi', 'asgi'],
+                            help="In-process server to benchmark (default wsgi); ignored with --base-url")
+        parser.add_argument('--base-url', help="Benchmark a running server instead, e.g. http://localhost:8000")
+        parser.add_argument('--concurrency', type=int, default=10, help="Concurrent clients per scenario, or per part of a mix (default 10)")
+        parser.add_argument('--requests', type=int, default=500, help="Timed requests per scenario (default 500)")
+        parser.add_argument('--warmup', type=int, default=50, help="Untimed requests per scenario first (default 50)")
+        parser.add_argument('--seed', type=int, default=1, help="Dataset seed (default 1)")
+        parser.add_argument('--managers', type=int, default=10, help="Managers to seed (default 10)")
+        parser.add_argument('--members', type=int, default=200, help="Member users to seed (default 200)")
+        parser.add_argument('--projects-per-manager', type=int, default=20, help="Default 20")
+        parser.add_argument('--tasks-per-project', type=int, default=100, help="Default 100")
+        parser.add_argument('--reseed', action='store_true', help="Delete the seed's data and seed again first")
+        parser.add_argument('--teardown', action='store_true', help="Delete the seed's data afterwards")
+        parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                            help="tracker_logger level for the in-process server (default LOG_LEVEL)")
+        parser.add_argument('--output', type=Path,
+                            help="Results file (default benchmarks/<time>-<commit>.json under BASE_DIR)")
+        parser.add_argument('--compare', type=Path, help="Results file of an earlier run to compare with")
+        parser.add_argument('--max-regression', type=float,
+                            help="Fail if any compared metric is worse than the baseline by more than this percent")
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or benchmark.SCENARIO_NAMES
+        unknown = set(names) - set(benchmark.SCENARIO_NAMES)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in benchmark.SCENARIOS if scenario.name in names]
+        baseline = self.load_results(options['compare']) if options['compare'] else None
+
+        dataset = self.prepare_dataset(options)
+        workload = benchmark.Workload(options['seed'])
+
+        stop = None
+        if options['base_url']:
+            server, base_url = 'external', options['base_url'].rstrip('/')
+            if options['log_level']:
+                self.stderr.write("--log-level only applies to the in-process servers")
+        else:
+            server = options['server']
+            benchmark.disable_throttles()
+            if options['log_level']:
+                benchmark.set_log_level(options['log_level'])
+            if server == 'wsgi' and settings.ASYNC_API_VIEWS:
+                self.stderr.write("ASYNC_API_VIEWS is on: the async views are served through WSGI")
+            start = benchmark.start_asgi_server if server == 'asgi' else benchmark.start_wsgi_server
+            base_url, stop = start()
+
+        results = {}
+        self.stdout.write(
+            f"{'scenario':<26} {'conc':>4} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'db ms':>7}"
+        )
+        try:
+            for scenario in scenarios:
+                scenario_results = benchmark.run_scenario(
+                    scenario, workload, base_url, options['concurrency'], options['requests'], options['warmup'],
+                )
+                for name, result in scenario_results.items():
+                    results[name] = result
+                    self.print_result(name, result)
+        finally:
+            if stop:
+                stop()
+            if options['teardown']:
+                delete_dataset(options['seed'])
+
+        document = {
+            'meta': {
+                **benchmark.environment(server, base_url, options['log_level']),
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'warmup': options['warmup'],
+                'seed': options['seed'],
+                'dataset': dataset,
+            },
+            'scenarios': results,
+        }
+        output = options['output'] or self.default_output(document['meta'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+        if baseline is not None:
+            self.report_comparison(results, baseline, options['max_regression'])
+
+    def prepare_dataset(self, options):
+        sizes = {
+            'managers': options['managers'],
+            'members': options['members'],
+            'projects_per_manager': options['projects_per_manager'],
+            'tasks_per_project': options['tasks_per_project'],
+        }
+        projects = sizes['managers'] * sizes['projects_per_manager']
+        expected = (sizes['managers'], sizes['members'], projects, projects * sizes['tasks_per_project'])
+        users = seeded_users(options['seed'])
+        present = (
+            users.filter(role='manager').count(),
+            users.filter(role='member').count(),
+            Project.objects.filter(created_by__in=users).count(),
+            Task.objects.filter(project__created_by__in=users).count(),
+        )
+        if options['reseed'] or present != expected:
+            if any(present):
+                delete_dataset(options['seed'])
+            self.stdout.write(f"Seeding {sizes} (seed {options['seed']})...")
+            counts = seed_dataset(seed=options['seed'], **sizes)
+            self.stdout.write(f"Seeded {counts}")
+        else:
+            self.stdout.write(f"Reusing the dataset of seed {options['seed']} (--reseed to rebuild it)")
+        return sizes
+
+    @staticmethod
+    def default_output(meta):
+        commit = (meta['commit'] or {}).get('sha', 'nogit')[:12]
+        if meta['commit'] and meta['commit']['dirty']:
+            commit += '-dirty'
+        stamp = meta['time'][:19].replace(':', '').replace('-', '')
+        return settings.BASE_DIR / 'benchmarks' / f"{stamp}-{commit}.json"
+
+    @staticmethod
+    def load_results(path):
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read baseline {path}: {e}")
+
+    def print_result(self, name, result):
+        latency = result['latency_ms']
+
+        def number(value, digits=1):
+            return '-' if value is None else f"{value:.{digits}f}"
+
+        line = (
+            f"{name:<26} {result['concurrency']:>4} {result['requests']:>6} {result['errors']:>6} "
+            f"{number(result['throughput']):>9} {number(latency.get('p50')):>8} {number(latency.get('p95')):>8} "
+            f"{number(latency.get('p99')):>8} {number(result['db_queries_per_request']):>7} "
+            f"{number(result['db_ms_per_request']):>7}"
+        )
+        self.stdout.write(self.style.WARNING(line) if result['errors'] else line)
+        for message, count in result['exceptions'].items():
+            self.stdout.write(f"    {count} x {message}")
+
+    def report_comparison(self, results, baseline, max_regression):
+        baseline_commit = (baseline.get('meta', {}).get('commit') or {}).get('sha', 'unknown')[:12]
+        self.stdout.write(f"\nCompared with {baseline_commit} (positive = worse):")
+        self.stdout.write(f"{'scenario':<26} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}")
+        failed = []
+        for name, label, old, new, regression in benchmark.compare(results, baseline.get('scenarios', {})):
+            line = f"{name:<26} {label:<8} {old:>10.2f} {new:>10.2f} {regression:>+7.1f}%"
+            if max_regression is not None and regression > max_regression:
+                failed.append(f"{name} {label}")
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if failed:
+            raise CommandError(f"Regressed by more than {max_regression}%: {', '.join(failed)}")
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from project_tracker.utils.pages import build_pages
+
+
+class Command(BaseCommand):
+    help = "Pre-render the frontend pages (plus gzip/brotli variants) once per deploy."
+
+    def handle(self, *args, **options):
+        manifest = build_pages()
+        for name, entry in manifest.items():
+            self.stdout.write(f"  {name} [{', '.join(entry['encodings'])}] etag {entry['etag']}")
+        self.stdout.write(self.style.SUCCESS(f"Built {len(manifest)} pages"))
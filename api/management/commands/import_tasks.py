@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.importers import SUPPORTED_FORMATS, ImportFormatError, TaskImport, detect_format
+from api.models import Project
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV or NDJSON file of tasks into a project in bulk chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_slug', help="Slug of the target project")
+        parser.add_argument('path', help="CSV (title,description,due_date,status,assignees) or NDJSON file")
+        parser.add_argument('--file-format', choices=SUPPORTED_FORMATS, help="Defaults to the file extension")
+        parser.add_argument('--chunk-size', type=int, help="Rows per chunk (default: TASK_IMPORT_CHUNK_SIZE)")
+        parser.add_argument('--async', dest='run_async', action='store_true',
+                            help="Dispatch chunks to Celery workers instead of importing inline")
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(slug=options['project_slug'], is_deleted=False)
+        except Project.DoesNotExist:
+            raise CommandError(f"Project '{options['project_slug']}' does not exist")
+
+        def report(progress):
+            self.stdout.write(
+                f"  processed {progress['processed']} rows: {progress['created']} created, {progress['failed']} failed"
+            )
+
+        try:
+            file_format = detect_format(options['path'], options['file_format'])
+            with open(options['path'], 'rb') as stream:
+                progress = TaskImport(project, chunk_size=options['chunk_size']).run(
+                    stream, file_format, run_async=options['run_async'], on_progress=report
+                )
+        except (ImportFormatError, OSError) as e:
+            raise CommandError(str(e))
+
+        for error in progress['errors']:
+            self.stdout.write(self.style.WARNING(f"  line {error['line']}: {error['error']}"))
+
+        if options['run_async']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Import {progress['import_id']} dispatched {progress['total_chunks']} chunk(s) to Celery"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Import {progress['import_id']} finished: {progress['created']} created, {progress['failed']} failed"
+            ))
@@ -0,0 +1,87 @@
+import io
+import pstats
+import shutil
+from collections import defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from project_tracker.utils.profiling import list_profiles, profile_dir
+
+
+def shorten(sql, width=120):
+    sql = ' '.join(sql.split())
+    return sql if len(sql) <= width else sql[:width - 3] + '...'
+
+
+class Command(BaseCommand):
+    help = "List the request profiles captured by ProfilingMiddleware, or summarize one."
+
+    def add_arguments(self, parser):
+        parser.add_argument('profile_id', nargs='?', help="Profile id (or a unique prefix); 'latest' for the newest")
+        parser.add_argument('--view', help="Only list profiles of this URL name, e.g. task-update")
+        parser.add_argument('--limit', type=int, default=20, help="Rows per section of a summary (default 20)")
+        parser.add_argument('--sort', default='cumulative', choices=['cumulative', 'tottime', 'ncalls'],
+                            help="Sort order for the function table (default cumulative)")
+        parser.add_argument('--clear', action='store_true', help="Delete all stored profiles")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            shutil.rmtree(profile_dir(), ignore_errors=True)
+            self.stdout.write(self.style.SUCCESS("Profiles cleared"))
+            return
+
+        profiles = list_profiles()
+        if options['view']:
+            profiles = [entry for entry in profiles if entry['view'] == options['view']]
+        if options['profile_id']:
+            return self.summarize(self.find(profiles, options['profile_id']), options['limit'], options['sort'])
+
+        if not profiles:
+            self.stdout.write(f"No matching profiles in {profile_dir()}")
+            return
+        for entry in profiles:
+            self.stdout.write(
+                f"{entry['id']}  {entry['time']}  {entry['method']:<6} {entry['status']}  {entry['ms']:>9.1f} ms  "
+                f"sql {entry['sql_count']:>3} / {entry['sql_ms']:>7.1f} ms  {entry['view'] or '-'}  {entry['path']}"
+            )
+
+    @staticmethod
+    def find(profiles, profile_id):
+        if profile_id == 'latest':
+            if not profiles:
+                raise CommandError("No profiles stored")
+            return profiles[0]
+        matches = [entry for entry in profiles if entry['id'].startswith(profile_id)]
+        if len(matches) != 1:
+            raise CommandError(f"{len(matches)} profiles match '{profile_id}'")
+        return matches[0]
+
+    def summarize(self, entry, limit, sort):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{entry['method']} {entry['path']} ({entry['view'] or '-'}) -> {entry['status']} "
+            f"in {entry['ms']:.1f} ms, {entry['time']}, triggered by {entry['trigger']}"
+        ))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nSQL: {entry['sql_count']} statements, {entry['sql_ms']:.1f} ms"))
+        for query in sorted(entry['sql'], key=lambda query: query['ms'], reverse=True)[:limit]:
+            self.stdout.write(f"  {query['ms']:>8.2f} ms  {'many ' if query['many'] else ''}{shorten(query['sql'])}")
+
+        repeated = defaultdict(lambda: [0, 0.0])
+        for query in entry['sql']:
+            repeated[query['sql']][0] += 1
+            repeated[query['sql']][1] += query['ms']
+        repeated = sorted(((count, ms, sql) for sql, (count, ms) in repeated.items() if count > 1), reverse=True)
+        if repeated:
+            self.stdout.write("  Repeated statements (N+1 candidates):")
+            for count, ms, sql in repeated[:limit]:
+                self.stdout.write(f"  {count:>5}x {ms:>8.2f} ms  {shorten(sql)}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nCache calls:"))
+        for name, call in sorted(entry['cache'].items(), key=lambda item: item[1]['ms'], reverse=True):
+            self.stdout.write(f"  {call['calls']:>5}x {call['ms']:>8.2f} ms  {name}")
+        if not entry['cache']:
+            self.stdout.write("  none")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nTop functions by {sort}:"))
+        output = io.StringIO()
+        stats = pstats.Stats(str(profile_dir() / f"{entry['id']}.prof"), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        self.stdout.write(output.getvalue())
@@ -0,0 +1,75 @@
+import os
+from time import perf_counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from api.seeding import DEFAULT_BLOCK_SIZE, delete_dataset, seed_dataset, seeded_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, deterministic synthetic dataset (users, projects, members, tasks, assignees) "
+        "with bulk writes and no signals, in parallel processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1, help="Dataset seed; the same seed gives the same data (default 1)")
+        parser.add_argument('--managers', type=int, default=100, help="Default 100")
+        parser.add_argument('--members', type=int, default=5000, help="Default 5000")
+        parser.add_argument('--projects-per-manager', type=int, default=50, help="Default 50")
+        parser.add_argument('--tasks-per-project', type=int, default=200, help="Default 200 (1M tasks with the defaults)")
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes (default: CPU count; always 1 on SQLite)")
+        parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                            help=f"Projects per transaction (default {DEFAULT_BLOCK_SIZE})")
+        parser.add_argument('--replace', action='store_true', help="Delete the seed's existing data first")
+        parser.add_argument('--delete', action='store_true', help="Only delete the seed's data")
+
+    def handle(self, *args, **options):
+        seed = options['seed']
+        if options['delete']:
+            self.stdout.write(self.style.SUCCESS(f"Deleted {delete_dataset(seed)} users of seed {seed} and their data"))
+            return
+
+        if min(options['managers'], options['members'], options['block_size'], options['processes']) < 1:
+            raise CommandError("--managers, --members, --block-size and --processes must be at least 1")
+        if seeded_users(seed).exists():
+            if not options['replace']:
+                raise CommandError(f"Seed {seed} already exists; use --replace to regenerate it or --delete to remove it")
+            delete_dataset(seed)
+
+        processes = options['processes']
+        if connection.vendor == 'sqlite' and processes > 1:
+            self.stdout.write("SQLite allows a single writer: seeding in one process")
+            processes = 1
+
+        projects = options['managers'] * options['projects_per_manager']
+        tasks = projects * options['tasks_per_project']
+        self.stdout.write(
+            f"Seeding {options['managers']} managers, {options['members']} members, {projects} projects and "
+            f"{tasks} tasks (seed {seed}, {processes} process(es))"
+        )
+        start = perf_counter()
+
+        def report(counts):
+            elapsed = perf_counter() - start
+            self.stdout.write(
+                f"  {counts['projects']}/{projects} projects, {counts['tasks']} tasks "
+                f"({counts['tasks'] / elapsed:,.0f} tasks/s)"
+            )
+
+        try:
+            counts = seed_dataset(
+                managers=options['managers'],
+                members=options['members'],
+                projects_per_manager=options['projects_per_manager'],
+                tasks_per_project=options['tasks_per_project'],
+                seed=seed,
+                processes=processes,
+                block_size=options['block_size'],
+                on_progress=report,
+            )
+        except KeyboardInterrupt:
+            raise CommandError("Interrupted; the partial data was removed")
+
+        summary = ', '.join(f"{count} {table.replace('_', ' ')}" for table, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {perf_counter() - start:.1f}s: {summary}"))
@@ -0,0 +1,56 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from project_tracker.utils.slow_queries import reset_slow_queries, slow_queries
+
+SORT_FIELDS = {'total': 'total_ms', 'count': 'count', 'mean': 'mean_ms', 'max': 'max_ms'}
+
+
+class Command(BaseCommand):
+    help = "Show the slowest queries recorded by the slow query log, aggregated by fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('fingerprint', nargs='?', help="Show one query in full, with its plan (a unique prefix is enough)")
+        parser.add_argument('--sort', default='total', choices=sorted(SORT_FIELDS), help="Ranking (default total time)")
+        parser.add_argument('--limit', type=int, default=20, help="Rows to show (default 20)")
+        parser.add_argument('--reset', action='store_true', help="Delete the recorded slow queries")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            self.stdout.write(self.style.SUCCESS(f"Deleted {reset_slow_queries()} slow query keys"))
+            return
+
+        entries = slow_queries()
+        if options['fingerprint']:
+            matches = [entry for entry in entries if entry['fingerprint'].startswith(options['fingerprint'])]
+            if len(matches) != 1:
+                raise CommandError(f"{len(matches)} slow queries match '{options['fingerprint']}'")
+            return self.show(matches[0])
+
+        if not entries:
+            self.stdout.write("No slow queries recorded")
+            return
+        entries.sort(key=lambda entry: entry[SORT_FIELDS[options['sort']]], reverse=True)
+        self.stdout.write(f"{'fingerprint':<16} {'count':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  top call site / sql")
+        for entry in entries[:options['limit']]:
+            site = entry['call_sites'][0][0] if entry['call_sites'] else 'unknown'
+            if len(entry['call_sites']) > 1:
+                site += f" (+{len(entry['call_sites']) - 1} more)"
+            sql = entry['sql'] if len(entry['sql']) <= 110 else entry['sql'][:107] + '...'
+            self.stdout.write(
+                f"{entry['fingerprint']} {entry['count']:>6} {entry['total_ms']:>10.1f} {entry['mean_ms']:>9.1f} "
+                f"{entry['max_ms']:>9.1f}  {site}\n{'':<16} {sql}"
+            )
+
+    def show(self, entry):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Fingerprint {entry['fingerprint']}"))
+        self.stdout.write(
+            f"{entry['count']} runs, {entry['total_ms']:.1f} ms total, {entry['mean_ms']:.1f} ms mean, "
+            f"{entry['max_ms']:.1f} ms max, last seen {datetime.fromtimestamp(entry['last_seen']):%Y-%m-%d %H:%M:%S}"
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING("\nSQL:"))
+        self.stdout.write(entry['sql'])
+        self.stdout.write(self.style.MIGRATE_HEADING("\nCall sites:"))
+        for site, count in entry['call_sites']:
+            self.stdout.write(f"  {count:>6}x  {site}")
+        self.stdout.write(self.style.MIGRATE_HEADING("\nPlan:"))
+        self.stdout.write(entry['plan'] or "  not captured (SLOW_QUERY_EXPLAIN is off, or not a SELECT)")
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_sweep_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('task', 'Task'), ('project', 'Project')], max_length=10)),
+                ('entity_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('due_today', 'Due Today'), ('overdue', 'Overdue')], max_length=20)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('period', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period'], name='notification_ledger_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id', 'kind', 'recipient', 'period'), name='unique_notification_ledger_entry')],
+            },
+        ),
+    ]
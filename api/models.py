@@ -27,6 +27,10 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'end_date'], name='project_status_end_date_idx'),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -100,7 +104,10 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='task_status_due_date_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -110,4 +117,37 @@ class Task(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self):
-        return f"{self.title} ({self.project.name})"
\ No newline at end of file
+        return f"{self.title} ({self.project.name})"
+
+
+class NotificationLedger(models.Model):
+    """One row per notification sent, so sweeps never email the same thing twice in a period."""
+    ENTITY_CHOICES = [
+        ('task', 'Task'),
+        ('project', 'Project'),
+    ]
+    KIND_CHOICES = [
+        ('due_today', 'Due Today'),
+        ('overdue', 'Overdue'),
+    ]
+
+    entity_type = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    recipient = models.EmailField()
+    period = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['entity_type', 'entity_id', 'kind', 'recipient', 'period'],
+                name='unique_notification_ledger_entry',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['period'], name='notification_ledger_period_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.entity_type}:{self.entity_id} -> {self.recipient} ({self.period})"
@@ -0,0 +1,132 @@
+"""
+Task notification building.
+
+Recipients (assignees and the project manager) for a set of tasks are
+resolved with a few grouped queries. Users in 'digest' mode get one email
+listing all their items, users in 'immediate' mode get one email per task.
+Each (task, kind, recipient) is claimed in the notification ledger first, so
+nothing already sent today is sent again.
+"""
+from collections import defaultdict
+from project_tracker.utils.email_templates import render_many
+from project_tracker.utils.mailer import build_message
+from .ledger import claim_notifications
+from .models import Task
+
+QUERY_CHUNK_SIZE = 5000
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+        yield ids[start:start + QUERY_CHUNK_SIZE]
+
+
+def collect_task_recipients(task_ids, today):
+    """
+    Return (tasks, recipients) for the given task ids.
+    tasks maps id -> template data; recipients is a set of (email, mode, task_id).
+    Three queries per QUERY_CHUNK_SIZE ids, whatever the number of recipients.
+    """
+    tasks = {}
+    recipients = set()
+
+    for chunk in _chunks(task_ids):
+        for task in Task.objects.filter(id__in=chunk, is_deleted=False).values(
+            'id', 'title', 'due_date', 'project__name',
+            'project__created_by__email', 'project__created_by__notification_mode',
+        ):
+            tasks[task['id']] = {
+                'title': task['title'],
+                'project_name': task['project__name'],
+                'due_date': task['due_date'],
+                'days_overdue': (today - task['due_date']).days,
+            }
+            if task['project__created_by__email']:
+                recipients.add((task['project__created_by__email'], task['project__created_by__notification_mode'], task['id']))
+
+        recipients.update(
+            (email, mode, task_id)
+            for task_id, email, mode in Task.assigned_to.through.objects.filter(task_id__in=chunk).values_list(
+                'task_id', 'contributor__user__email', 'contributor__user__notification_mode'
+            )
+            if email and task_id in tasks
+        )
+
+    return tasks, recipients
+
+
+def build_digest_messages(digests, today):
+    """One digest message per {email: items}, rendered in a single batch."""
+    digests = list(digests.items())
+    html_messages = render_many('task_digest_notification.html', [
+        {'today': today, 'due_today': items['due_today'], 'overdue': items['overdue']}
+        for _, items in digests
+    ])
+
+    messages = []
+    for (email, items), html_message in zip(digests, html_messages):
+        subject = f"Task digest: {len(items['due_today'])} due today, {len(items['overdue'])} overdue"
+        lines = [f"- {task['title']} ({task['project_name']}) is due today" for task in items['due_today']]
+        lines += [f"- {task['title']} ({task['project_name']}) is {task['days_overdue']} day(s) overdue" for task in items['overdue']]
+        messages.append(build_message(subject, "\n".join(lines), [email], html_body=html_message))
+    return messages
+
+
+def build_task_messages(tasks, kind, today):
+    """One message per (task, emails) pair of the same kind, rendered in a single batch."""
+    template = 'task_due_today_notification.html' if kind == 'due_today' else 'task_overdue_notification.html'
+    html_messages = render_many(template, [
+        {
+            'task_title': task['title'],
+            'project_name': task['project_name'],
+            'due_date': task['due_date'],
+            'days_overdue': task['days_overdue'],
+        }
+        for task, _ in tasks
+    ])
+
+    messages = []
+    for (task, emails), html_message in zip(tasks, html_messages):
+        if kind == 'due_today':
+            subject = f"Task Due Today: {task['title']}"
+            body = f"Task {task['title']} is due today ({today})"
+        else:
+            subject = f"Task Overdue: {task['title']}"
+            body = f"Task {task['title']} is overdue as of {today}"
+        messages.append(build_message(subject, body, emails, html_body=html_message))
+    return messages
+
+
+def build_task_notifications(due_today_ids, overdue_ids, today):
+    """Return the messages for one sweep: digests per recipient plus immediate per-task emails."""
+    kinds = {task_id: 'due_today' for task_id in due_today_ids}
+    kinds.update({task_id: 'overdue' for task_id in overdue_ids})
+
+    tasks, recipients = collect_task_recipients(kinds, today)
+    claimed = claim_notifications(
+        (('task', task_id, kinds[task_id], email) for email, _, task_id in recipients), today
+    )
+    recipients = {
+        (email, mode, task_id) for email, mode, task_id in recipients
+        if ('task', task_id, kinds[task_id], email) in claimed
+    }
+
+    digests = defaultdict(lambda: {'due_today': [], 'overdue': []})
+    immediate = defaultdict(set)
+    for email, mode, task_id in recipients:
+        if mode == 'immediate':
+            immediate[task_id].add(email)
+        else:
+            digests[email][kinds[task_id]].append(tasks[task_id])
+
+    for items in digests.values():
+        for kind_items in items.values():
+            kind_items.sort(key=lambda task: (task['due_date'], task['title']))
+
+    messages = build_digest_messages(digests, today)
+    for kind in ('due_today', 'overdue'):
+        messages += build_task_messages([
+            (tasks[task_id], sorted(emails)) for task_id, emails in immediate.items() if kinds[task_id] == kind
+        ], kind, today)
+    return messages, len(digests)
@@ -0,0 +1,143 @@
+"""
+Due-date index for the event-driven scheduler.
+
+Open tasks and projects due within DUE_INDEX_HORIZON_DAYS are kept in a Redis
+sorted set scored by the moment they come due ("task:due_today:<id>" at the
+start of the due date, "task:overdue:<id>" / "project:overdue:<id>" at the
+start of the following day). Save signals keep the index in sync, the
+dispatch_due_items task pops due members in small batches every minute, and
+the nightly reconciliation pass refills the horizon and catches anything
+written without signals.
+
+Days follow timezone.now().date(), the same "today" Task.save() and the
+sweeps use.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+import logging
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+from .models import Project, Task
+
+logger = logging.getLogger('tracker_logger')
+
+DUE_INDEX_KEY = "project_tracker:due_index"
+OPEN_STATUSES = {
+    'project': ('active', 'on_hold'),
+    'task': ('ongoing', 'on_hold'),
+}
+
+# Pop up to ARGV[2] members due by ARGV[1] in one atomic step, with their scores.
+POP_DUE_SCRIPT = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[2]))
+for i = 1, #items, 2 do
+    redis.call('ZREM', KEYS[1], items[i])
+end
+return items
+"""
+
+
+def _redis():
+    return get_redis_connection("default")
+
+
+def day_start(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc).timestamp()
+
+
+def _horizon():
+    return timezone.now().date() + timedelta(days=settings.DUE_INDEX_HORIZON_DAYS)
+
+
+def task_entries(task_id, due_date):
+    return {
+        f"task:due_today:{task_id}": day_start(due_date),
+        f"task:overdue:{task_id}": day_start(due_date + timedelta(days=1)),
+    }
+
+
+def project_entries(project_id, end_date):
+    return {f"project:overdue:{project_id}": day_start(end_date + timedelta(days=1))}
+
+
+def _sync_entries(entries, is_open):
+    """ZADD the entries still ahead of us, ZREM the rest (closed, past or beyond the horizon)."""
+    now = timezone.now().timestamp()
+    horizon = day_start(_horizon() + timedelta(days=1))
+    upcoming = {member: score for member, score in entries.items() if is_open and now < score <= horizon}
+    stale = [member for member in entries if member not in upcoming]
+
+    with _redis().pipeline() as pipe:
+        if upcoming:
+            pipe.zadd(DUE_INDEX_KEY, upcoming)
+        if stale:
+            pipe.zrem(DUE_INDEX_KEY, *stale)
+        pipe.execute()
+
+
+def index_task(task):
+    is_open = not task.is_deleted and task.status in OPEN_STATUSES['task']
+    _sync_entries(task_entries(task.id, task.due_date), is_open)
+
+
+def index_project(project):
+    is_open = not project.is_deleted and project.status in OPEN_STATUSES['project']
+    _sync_entries(project_entries(project.id, project.end_date), is_open)
+
+
+def unindex(kind, object_id):
+    members = [f"task:due_today:{object_id}", f"task:overdue:{object_id}"] if kind == 'task' else [f"project:overdue:{object_id}"]
+    _redis().zrem(DUE_INDEX_KEY, *members)
+
+
+def pop_due_items(limit):
+    """Atomically remove and return up to `limit` (member, score) pairs that are due now."""
+    items = _redis().eval(POP_DUE_SCRIPT, 1, DUE_INDEX_KEY, timezone.now().timestamp(), limit)
+    return [(items[i].decode(), float(items[i + 1])) for i in range(0, len(items), 2)]
+
+
+def restore_items(items):
+    """Put popped items back, e.g. when dispatching them failed."""
+    if items:
+        _redis().zadd(DUE_INDEX_KEY, dict(items))
+
+
+def group_items(items):
+    """Split popped members into {'task:due_today': [ids], 'task:overdue': [...], 'project:overdue': [...]}."""
+    groups = {'task:due_today': [], 'task:overdue': [], 'project:overdue': []}
+    for member, _ in items:
+        kind, _, object_id = member.rpartition(':')
+        if kind in groups:
+            groups[kind].append(int(object_id))
+    return groups
+
+
+def rebuild_index(batch_size=5000):
+    """Re-add every open task and project that comes due later within the horizon."""
+    today = timezone.now().date()
+    horizon = _horizon()
+    now = timezone.now().timestamp()
+    client = _redis()
+    added = 0
+
+    sources = [
+        (Task.objects.filter(status__in=OPEN_STATUSES['task'], is_deleted=False, due_date__range=(today, horizon))
+         .values_list('id', 'due_date'), task_entries),
+        (Project.objects.filter(status__in=OPEN_STATUSES['project'], is_deleted=False, end_date__range=(today, horizon))
+         .values_list('id', 'end_date'), project_entries),
+    ]
+    for queryset, build_entries in sources:
+        entries = {}
+        for object_id, due in queryset.iterator(chunk_size=batch_size):
+            # Entries already due were dispatched (or are swept); only schedule future ones.
+            entries.update({member: score for member, score in build_entries(object_id, due).items() if score > now})
+            if len(entries) >= batch_size:
+                client.zadd(DUE_INDEX_KEY, entries)
+                added += len(entries)
+                entries = {}
+        if entries:
+            client.zadd(DUE_INDEX_KEY, entries)
+            added += len(entries)
+
+    logger.info("Due-date index reconciled: %s entries up to %s", added, horizon)
+    return added
@@ -0,0 +1,284 @@
+"""
+Synthetic data for benchmarks and capacity planning.
+
+seed_dataset() writes managers, member users with their Contributor rows,
+projects with members, and tasks with assignees. Nothing goes through
+Model.save() or signals, so there is no per-row slug lookup or cache
+invalidation. Users, contributors and projects are created with bulk_create,
+because their ids are needed next. Tasks and both M2M through tables are
+written with bulk_insert, i.e. COPY on PostgreSQL.
+
+Projects are written in blocks, each block (projects, members, tasks,
+assignees) in its own transaction, optionally by a pool of processes. Each
+project draws from its own random.Random seeded with (seed, project index).
+The same seed, sizes and day therefore give the same names, slugs, dates,
+statuses and memberships, whatever the number of processes or the block
+size; only database ids differ. Slugs carry the seed and indexes, so they
+are unique without a lookup.
+
+Every seeded user has an @bench.local address and the password SEED_PASSWORD.
+delete_dataset() removes them and everything they own. The scheduler's
+nightly rebuild_index() pass picks the seeded due dates up like any other
+rows written without signals.
+"""
+import logging
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from project_tracker.utils.bulk import bulk_insert
+from users.models import CustomUser
+from .models import Contributor, Project, ProjectInvite, Task
+
+logger = logging.getLogger('tracker_logger')
+
+SEED_EMAIL_DOMAIN = 'bench.local'
+SEED_PASSWORD = 'bench-password-1'
+DEFAULT_BLOCK_SIZE = 50         # Projects per transaction
+BATCH_SIZE = 5000
+
+FIRST_NAMES = ('Asha', 'Ben', 'Chen', 'Dara', 'Eli', 'Farah', 'Gus', 'Hana', 'Ivan', 'Jo', 'Kiran', 'Lena', 'Milo', 'Nia')
+LAST_NAMES = ('Rao', 'Smith', 'Okafor', 'Lopez', 'Kim', 'Novak', 'Haddad', 'Singh', 'Berg', 'Costa')
+WORDS = (
+    'api', 'billing', 'dashboard', 'migration', 'search', 'onboarding', 'reports', 'mobile', 'export', 'audit',
+    'cache', 'invoice', 'login', 'profile', 'settings', 'webhook', 'release', 'pipeline', 'docs', 'alerts',
+)
+VERBS = ('Fix', 'Add', 'Review', 'Refactor', 'Test', 'Design', 'Document', 'Ship', 'Investigate', 'Update')
+LOCATIONS = ('Remote', 'Pune', 'Berlin', 'Austin', None)
+
+# (value, weight) pairs. Work that is past its date is mostly finished; the rest is overdue.
+OPEN_PROJECT_STATUSES = (('active', 85), ('on_hold', 15))
+OPEN_TASK_STATUSES = (('ongoing', 75), ('on_hold', 15), ('completed', 10))
+PAST_COMPLETED_RATE = 0.8       # Projects and tasks past their date that were finished
+TEAM_SIZE = (3, 12)
+ASSIGNEE_COUNTS = ((0, 15), (1, 55), (2, 22), (3, 8))
+DELETED_PROJECT_RATE = 0.02
+DELETED_TASK_RATE = 0.05
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _sentence(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize() + '.'
+
+
+def _slug(text, suffix, max_length=50):
+    # SlugField's max_length; long titles give way to the suffix that makes the slug unique.
+    return f"{slugify(text)[:max_length - len(suffix)].rstrip('-')}{suffix}"
+
+
+def _status(rng, due, today, open_statuses):
+    if due < today:
+        return 'completed' if rng.random() < PAST_COMPLETED_RATE else 'overdue'
+    return _weighted(rng, open_statuses)
+
+
+def seed_users(seed, managers, members, password):
+    """Create the users and members' Contributor rows; returns (manager ids, contributor ids)."""
+    rng = random.Random(f"{seed}:users")
+    users = [
+        CustomUser(
+            email=f"{role}{index}.s{seed}@{SEED_EMAIL_DOMAIN}",
+            role=role,
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password,
+        )
+        for role, count in (('manager', managers), ('member', members))
+        for index in range(count)
+    ]
+    CustomUser.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    contributors = Contributor.objects.bulk_create(
+        [Contributor(user=user, skills=rng.sample(WORDS, 3)) for user in users[managers:]],
+        batch_size=BATCH_SIZE,
+    )
+    return [user.id for user in users[:managers]], [contributor.id for contributor in contributors]
+
+
+def plan_project(seed, index, manager_id, contributor_ids, tasks_per_project, today):
+    """The unsaved project, its member ids and its (task, assignee ids) pairs."""
+    rng = random.Random(f"{seed}:{index}")
+    name = f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {index + 1}"
+    start = today - timedelta(days=rng.randint(0, 365))
+    end = start + timedelta(days=rng.randint(30, 365))
+    project = Project(
+        name=name,
+        slug=_slug(name, f"-s{seed}"),
+        description=_sentence(rng, 8, 30),
+        location=rng.choice(LOCATIONS),
+        status=_status(rng, end, today, OPEN_PROJECT_STATUSES),
+        created_by_id=manager_id,
+        start_date=start,
+        end_date=end,
+        is_deleted=rng.random() < DELETED_PROJECT_RATE,
+    )
+    team = rng.sample(contributor_ids, min(len(contributor_ids), rng.randint(*TEAM_SIZE)))
+
+    span = (end - start).days
+    tasks = []
+    for number in range(tasks_per_project):
+        title = f"{rng.choice(VERBS)} {rng.choice(WORDS)} {rng.choice(WORDS)}"
+        due = start + timedelta(days=rng.randint(0, span))
+        task = Task(
+            title=title,
+            slug=_slug(title, f"-s{seed}-{index + 1}-{number + 1}"),
+            description=_sentence(rng, 10, 40),
+            due_date=due,
+            status=_status(rng, due, today, OPEN_TASK_STATUSES),     # Consistent with Task.save()
+            is_deleted=rng.random() < DELETED_TASK_RATE,
+        )
+        assignees = rng.sample(team, min(len(team), _weighted(rng, ASSIGNEE_COUNTS)))
+        tasks.append((task, assignees))
+    return project, team, tasks
+
+
+def seed_block(indexes, seed, manager_ids, contributor_ids, projects_per_manager, tasks_per_project, today):
+    """Write the projects numbered `indexes`, with everything they own, in one transaction."""
+    plans = [
+        plan_project(seed, index, manager_ids[index // projects_per_manager], contributor_ids, tasks_per_project, today)
+        for index in indexes
+    ]
+    with transaction.atomic():
+        projects = Project.objects.bulk_create([project for project, _, _ in plans])
+
+        member_rows, tasks = [], []
+        for project, team, project_tasks in plans:
+            member_rows.extend(
+                Project.members.through(project_id=project.id, contributor_id=contributor_id) for contributor_id in team
+            )
+            for task, _ in project_tasks:
+                task.project_id = project.id
+                tasks.append(task)
+        bulk_insert(Project.members.through, member_rows, batch_size=BATCH_SIZE)
+        bulk_insert(Task, tasks, batch_size=BATCH_SIZE)
+
+        # COPY does not return ids: look the tasks up by their unique slugs.
+        task_ids = dict(
+            Task.objects.filter(project_id__in=[project.id for project in projects]).values_list('slug', 'id')
+        )
+        assignee_rows = [
+            Task.assigned_to.through(task_id=task_ids[task.slug], contributor_id=contributor_id)
+            for _, _, project_tasks in plans
+            for task, assignees in project_tasks
+            for contributor_id in assignees
+        ]
+        bulk_insert(Task.assigned_to.through, assignee_rows, batch_size=BATCH_SIZE)
+
+    return {
+        'projects': len(projects),
+        'tasks': len(tasks),
+        'project_members': len(member_rows),
+        'task_assignees': len(assignee_rows),
+    }
+
+
+_worker_args = None
+
+
+def _init_worker(args):
+    global _worker_args
+    django.setup()      # A no-op under fork; needed where workers are spawned
+    _worker_args = args
+
+
+def _seed_block_in_worker(indexes):
+    return seed_block(indexes, *_worker_args)
+
+
+def seed_dataset(managers=10, members=200, projects_per_manager=20, tasks_per_project=100, seed=1, today=None,
+                 processes=1, block_size=DEFAULT_BLOCK_SIZE, on_progress=None):
+    """
+    Create the dataset for `seed` and return row counts by table. `on_progress`
+    is called with the running counts after each block. If any block fails,
+    everything written for the seed is deleted again before re-raising.
+    """
+    today = today or timezone.now().date()
+    password = make_password(SEED_PASSWORD)     # Hashed once and shared by every seeded user
+    counts = Counter()
+
+    try:
+        with transaction.atomic():
+            manager_ids, contributor_ids = seed_users(seed, managers, members, password)
+        counts.update(users=managers + members, contributors=len(contributor_ids))
+
+        total = managers * projects_per_manager
+        blocks = [range(start, min(start + block_size, total)) for start in range(0, total, block_size)]
+        args = (seed, manager_ids, contributor_ids, projects_per_manager, tasks_per_project, today)
+
+        if processes > 1 and len(blocks) > 1:
+            connections.close_all()     # Forked workers must open their own connections
+            with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(args,)) as pool:
+                futures = [pool.submit(_seed_block_in_worker, block) for block in blocks]
+                try:
+                    for future in as_completed(futures):
+                        counts.update(future.result())
+                        if on_progress:
+                            on_progress(counts)
+                except BaseException:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+        else:
+            for block in blocks:
+                counts.update(seed_block(block, *args))
+                if on_progress:
+                    on_progress(counts)
+    except BaseException:
+        logger.error("Seeding %s failed; removing its partial data", seed)
+        delete_dataset(seed)
+        raise
+
+    analyze_tables()
+    logger.info("Seeded dataset (seed %s): %s", seed, dict(counts))
+    return dict(counts)
+
+
+def analyze_tables():
+    """Refresh PostgreSQL planner statistics after a bulk load instead of waiting for autovacuum."""
+    if connection.vendor != 'postgresql':
+        return
+    models = (CustomUser, Contributor, Project, Project.members.through, Task, Task.assigned_to.through)
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+
+def seeded_users(seed=None):
+    """Users created by seed_dataset(), optionally only those of one seed."""
+    suffix = f".s{seed}@{SEED_EMAIL_DOMAIN}" if seed is not None else f"@{SEED_EMAIL_DOMAIN}"
+    return CustomUser.objects.filter(email__endswith=suffix)
+
+
+def delete_dataset(seed=None):
+    """
+    Remove the seeded users (of one seed, or all) and what they own. Rows are
+    deleted set-wise without loading them, so no per-row signals (cache
+    invalidation threads) fire; returns the number of users removed.
+    """
+    users = seeded_users(seed)
+    projects = Project.objects.filter(created_by__in=users)
+    tasks = Task.objects.filter(project__in=projects)
+    contributors = Contributor.objects.filter(user__in=users)
+
+    with transaction.atomic():
+        for queryset in (
+            Task.assigned_to.through.objects.filter(task__in=tasks),
+            Task.assigned_to.through.objects.filter(contributor__in=contributors),
+            tasks,
+            Project.members.through.objects.filter(project__in=projects),
+            Project.members.through.objects.filter(contributor__in=contributors),
+            ProjectInvite.objects.filter(project__in=projects),
+            projects,
+            contributors,
+        ):
+            queryset._raw_delete(queryset.db)
+        deleted = users._raw_delete(users.db)
+    logger.info("Deleted seeded dataset (%s users)", deleted)
+    return deleted
@@ -3,7 +3,8 @@ from datetime import date,datetime
 import logging
 from .models import *
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from users.tokens import TrackerRefreshToken
+from users.hashing import hash_password
 
 
 logger = logging.getLogger('tracker_logger')
@@ -65,7 +66,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     
 
 class ProjectInviteSerializer(serializers.ModelSerializer):
-    email = serializers.EmailField()
+    email = serializers.EmailField(required=False)
     emails = serializers.ListField(child=serializers.EmailField(),required=False,write_only=True)
 
     class Meta:
@@ -90,6 +91,41 @@ class ProjectInviteSerializer(serializers.ModelSerializer):
 
         return value
 
+    def validate_emails(self, value):
+        """
+        Set-based counterpart of validate_email for a whole invite list.
+        Resolves users, memberships and pending invites in one query each and
+        stores the split in the context for the view.
+        """
+        project = self.context['project']
+        emails = list(dict.fromkeys(value))
+
+        if project.created_by.email in emails:
+            raise serializers.ValidationError("You cannot invite yourself to your own project.")
+
+        contributors = {
+            contributor.user.email: contributor
+            for contributor in Contributor.objects.select_related('user').filter(user__email__in=emails)
+        }
+
+        member_ids = set(
+            project.members.filter(id__in=[c.id for c in contributors.values()]).values_list('id', flat=True)
+        )
+        for email, contributor in contributors.items():
+            if contributor.id in member_ids:
+                raise serializers.ValidationError(f"{email} is already a member of the project.")
+
+        invite_emails = [email for email in emails if email not in contributors]
+        pending = ProjectInvite.objects.filter(
+            project=project, status='pending', email__in=invite_emails
+        ).values_list('email', flat=True).first()
+        if pending:
+            raise serializers.ValidationError(f"An invitation is already pending for {pending}.")
+
+        self.context['existing_contributors'] = [contributors[email] for email in emails if email in contributors]
+        self.context['invite_emails'] = invite_emails
+        return emails
+
     def validate(self, attrs):
         # Handle both single email and list of emails
         email = attrs.get('email')
@@ -144,12 +180,10 @@ class InviteRegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('token', None)
 
         if User.objects.filter(email=email).exists():
-            logger.warning(f"User with email {email} already exists")
+            logger.warning("User with email %s already exists", email)
             raise serializers.ValidationError("User with this email already exists.")
 
-        user = User.objects.create(email=email, role='member', **validated_data)
-        user.set_password(password)
-        user.save()
+        user = User.objects.create(email=email, role='member', password=hash_password(password), **validated_data)
 
         contributor = Contributor.objects.create(user=user)
 
@@ -157,9 +191,9 @@ class InviteRegisterSerializer(serializers.ModelSerializer):
 
         invite.mark_accepted()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = TrackerRefreshToken.for_user(user)
 
-        logger.info(f"New contributor {email} registered and joined project '{invite.project.name}'")
+        logger.info("New contributor %s registered and joined project '%s'", email, invite.project.name)
 
         return {
             "email": email,
@@ -215,6 +249,42 @@ class TaskSerializer(serializers.ModelSerializer):
                     raise serializers.ValidationError({f"Contributor with ID {contributor.id} is not part of this project."})
 
         return data
+
+
+class TaskBulkChangeSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    assigned_to = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = set(data) - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError(f"Unsupported fields in changes: {', '.join(sorted(unknown))}.")
+        return super().to_internal_value(data)
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("At least one of 'status' or 'assigned_to' is required.")
+        return data
+
+
+class TaskBulkItemSerializer(serializers.Serializer):
+    slug = serializers.SlugField()
+    changes = TaskBulkChangeSerializer()
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    MAX_BATCH_SIZE = 500
+
+    tasks = serializers.ListField(child=TaskBulkItemSerializer(), allow_empty=False, max_length=MAX_BATCH_SIZE)
+
+    def validate_tasks(self, value):
+        slugs = [item['slug'] for item in value]
+        if len(slugs) != len(set(slugs)):
+            raise serializers.ValidationError("Each task slug may appear only once per batch.")
+        return value
+
+
 class TaskListSerializer(serializers.ModelSerializer):
     assigned_to = serializers.SerializerMethodField()
     project_name = serializers.CharField(source='project.name', read_only=True)
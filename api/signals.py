@@ -3,6 +3,8 @@ import logging
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.core.cache import cache
+from django.conf import settings
+from django.db import transaction
 from .models import Project, Task, Contributor
 
 logger = logging.getLogger('tracker_logger')
@@ -14,20 +16,57 @@ def _clear_project_cache(project):
         user_id = project.created_by.id
         # Clear project list cache
         cache.delete_pattern(f"project_list:{user_id}:*")
-        logger.info(f"Cache cleared for Project creator: {user_id}")
+        logger.info("Cache cleared for Project creator: %s", user_id)
 
         # Clear task list cache for this project
         cache.delete_pattern(f"task_list:*:{project.slug}:*")
-        logger.info(f"Task cache cleared for project: {project.slug}")
+        logger.info("Task cache cleared for project: %s", project.slug)
 
         # Clear cache for all project members
         member_ids = project.members.values_list("user__id", flat=True)
         for member_id in member_ids:
             cache.delete_pattern(f"project_list:{member_id}:*")
-            logger.info(f"Cache cleared for member: {member_id}")
+            logger.info("Cache cleared for member: %s", member_id)
 
     except Exception as e:
-        logger.error(f"Error clearing cache for project '{project.slug}': {e}", exc_info=True)
+        logger.error("Error clearing cache for project '%s': %s", project.slug, e, exc_info=True)
+
+
+def clear_projects_cache(project_ids):
+    """
+    Aggregated invalidation for many projects after set-based writes (which
+    bypass the signals below): one scan per key family instead of one
+    delete_pattern per project and member.
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return
+
+    try:
+        projects = Project.objects.filter(id__in=project_ids).values_list('slug', 'created_by_id')
+        slugs = {slug for slug, _ in projects}
+        user_ids = {str(user_id) for _, user_id in projects}
+        user_ids.update(
+            str(user_id) for user_id in Project.members.through.objects.filter(
+                project_id__in=project_ids
+            ).values_list('contributor__user_id', flat=True)
+        )
+
+        stale_keys = [
+            key for key in cache.iter_keys("project_list:*")
+            if key.split(':', 2)[1] in user_ids
+        ]
+        stale_keys.extend(
+            key for key in cache.iter_keys("task_list:*")
+            if key.split(':', 3)[2] in slugs
+        )
+        if stale_keys:
+            cache.delete_many(stale_keys)
+
+        logger.info("Cache cleared for %s projects and %s users (%s keys)", len(slugs), len(user_ids), len(stale_keys))
+
+    except Exception as e:
+        logger.error("Error clearing cache for projects %s: %s", sorted(project_ids), e, exc_info=True)
 
 
 def clear_project_cache_async(project):
@@ -37,19 +76,19 @@ def clear_project_cache_async(project):
 
 @receiver([post_save, post_delete], sender=Project)
 def project_cache_handler(sender, instance, **kwargs):
-    logger.debug(f"Signal: Project change detected -> {instance.slug}")
+    logger.debug("Signal: Project change detected -> %s", instance.slug)
     clear_project_cache_async(instance)
 
 
 @receiver([post_save, post_delete], sender=Task)
 def task_cache_handler(sender, instance, **kwargs):
-    logger.debug(f"Signal: Task change detected -> {instance.slug}")
+    logger.debug("Signal: Task change detected -> %s", instance.slug)
     clear_project_cache_async(instance.project)
 
 
 @receiver([post_save, post_delete], sender=Contributor)
 def contributor_cache_handler(sender, instance, **kwargs):
-    logger.debug(f"Signal: Contributor change detected -> {instance.user.email}")
+    logger.debug("Signal: Contributor change detected -> %s", instance.user.email)
     for project in instance.projects.all():
         clear_project_cache_async(project)
 
@@ -57,5 +96,42 @@ def contributor_cache_handler(sender, instance, **kwargs):
 @receiver(m2m_changed, sender=Project.members.through)
 def project_membership_changed(sender, instance, action, **kwargs):
     if action in ["post_add", "post_remove", "post_clear"]:
-        logger.debug(f"Signal: Project members updated -> {instance.slug}")
-        clear_project_cache_async(instance)
\ No newline at end of file
+        logger.debug("Signal: Project members updated -> %s", instance.slug)
+        clear_project_cache_async(instance)
+
+
+def _sync_due_index(kind, instance, deleted=False):
+    """Keep the scheduler's due-date index in step with committed changes."""
+    from . import scheduler
+
+    def sync():
+        try:
+            if deleted:
+                scheduler.unindex(kind, instance.id)
+            elif kind == 'task':
+                scheduler.index_task(instance)
+            else:
+                scheduler.index_project(instance)
+        except Exception as e:
+            logger.error("Error updating due-date index for %s %s: %s", kind, instance.id, e, exc_info=True)
+
+    transaction.on_commit(sync)
+
+
+@receiver(post_save, sender=Task)
+def task_due_index_handler(sender, instance, **kwargs):
+    if settings.DUE_SCHEDULER_ENABLED:
+        _sync_due_index('task', instance)
+
+
+@receiver(post_save, sender=Project)
+def project_due_index_handler(sender, instance, **kwargs):
+    if settings.DUE_SCHEDULER_ENABLED:
+        _sync_due_index('project', instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+def due_index_delete_handler(sender, instance, **kwargs):
+    if settings.DUE_SCHEDULER_ENABLED:
+        _sync_due_index('task' if sender is Task else 'project', instance, deleted=True)
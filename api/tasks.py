@@ -1,44 +1,119 @@
-from celery import shared_task
+from celery import chord, shared_task
+from datetime import date, timedelta
+from django.db import connection, transaction
+from django.db.models import Max, Min
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from project_tracker.utils.mailer import enqueue_email, enqueue_emails
+from project_tracker.utils.queues import NOTIFICATIONS_QUEUE, throttled
+from project_tracker.utils.email_templates import render_email
 from django.contrib.auth import get_user_model
 from .models import Project, Task
+from .ledger import claim_recipients, purge_ledger, renotify_dates
+from .signals import clear_projects_cache
+from .notifications import build_task_notifications
+from .scheduler import group_items, pop_due_items, rebuild_index, restore_items
 from project_tracker import settings
 import logging
 
 logger = logging.getLogger('tracker_logger')
 User = get_user_model()
 
+# Statuses a sweep may move to 'overdue'
+SWEEP_STATUSES = {
+    'project': ['active', 'on_hold'],
+    'task': ['ongoing', 'on_hold'],
+}
+
+
+def _id_ranges(queryset, chunk_size):
+    """Split the id span of `queryset` into inclusive (low, high) ranges of chunk_size ids."""
+    bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    return [
+        (low, min(low + chunk_size - 1, bounds['high']))
+        for low in range(bounds['low'], bounds['high'] + 1, chunk_size)
+    ]
+
+
+def _mark_overdue_returning(model, kind, date_column, today, low=None, high=None, ids=None, returning='id'):
+    """
+    Set-based UPDATE ... RETURNING for one id range (low/high) or an explicit
+    id list; returns the rows that actually moved to 'overdue'.
+    """
+    statuses = SWEEP_STATUSES[kind]
+    table = connection.ops.quote_name(model._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(statuses))
+
+    if ids is not None:
+        if not ids:
+            return []
+        id_clause, id_params = f"id IN ({', '.join(['%s'] * len(ids))})", list(ids)
+    else:
+        id_clause, id_params = "id BETWEEN %s AND %s", [low, high]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET status = %s, updated_at = %s "
+            f"WHERE {id_clause} AND is_deleted = %s "
+            f"AND status IN ({placeholders}) AND {connection.ops.quote_name(date_column)} < %s "
+            f"RETURNING {returning}",
+            ['overdue', timezone.now(), *id_params, False, *statuses, today],
+        )
+        return cursor.fetchall()
+
+
 @shared_task
 def check_project_overdue():
     """
-    Check for projects that are past their end_date and mark them as overdue
-    Send notifications to created_by and members
+    Check for projects that are past their end_date and mark them as overdue.
+    The work is split into id ranges swept in parallel; finish_project_sweep
+    then invalidates caches once and sends the notifications.
     """
     try:
         today = timezone.now().date()
-        overdue_projects = Project.objects.filter(
-            end_date__lt=today,
-            status__in=['active', 'on_hold'],
-            is_deleted=False
+        ranges = _id_ranges(
+            Project.objects.filter(end_date__lt=today, status__in=SWEEP_STATUSES['project'], is_deleted=False),
+            settings.OVERDUE_SWEEP_CHUNK_SIZE,
         )
-        
-        for project in overdue_projects:
-            # Update project status to overdue
-            project.status = 'overdue'
-            project.save(update_fields=['status', 'updated_at'])
-            
-            # Send notifications
-            send_project_overdue_notification.delay(project.id)
-            
-        logger.info(f"Checked project overdue status. Found {overdue_projects.count()} overdue projects.")
-        return f"Processed {overdue_projects.count()} overdue projects"
+
+        if not ranges:
+            logger.info("Checked project overdue status. Found 0 overdue projects.")
+            return "Processed 0 overdue projects"
+
+        chord(
+            sweep_overdue_projects.s(low, high, today.isoformat()) for low, high in ranges
+        )(finish_project_sweep.s())
+
+        logger.info("Project overdue sweep dispatched in %s chunk(s)", len(ranges))
+        return f"Dispatched {len(ranges)} project sweep chunks"
         
     except Exception as e:
-        logger.error(f"Error in check_project_overdue: {str(e)}")
+        logger.error("Error in check_project_overdue: %s", e)
         raise
 
+@shared_task(ignore_result=False)
+def sweep_overdue_projects(low, high, today):
+    """
+    Mark overdue projects with ids in [low, high]; returns the ids that changed
+    """
+    rows = _mark_overdue_returning(Project, 'project', 'end_date', date.fromisoformat(today), low=low, high=high)
+    return [project_id for project_id, in rows]
+
+@shared_task
+def finish_project_sweep(results):
+    """
+    Chord callback: one aggregated cache invalidation, then notifications for the swept projects
+    """
+    project_ids = [project_id for chunk in results for project_id in chunk]
+
+    clear_projects_cache(project_ids)
+    for project_id in throttled(project_ids, NOTIFICATIONS_QUEUE):
+        send_project_overdue_notification.delay(project_id)
+
+    logger.info("Checked project overdue status. Found %s overdue projects.", len(project_ids))
+    return f"Processed {len(project_ids)} overdue projects"
+
 @shared_task
 def send_project_overdue_notification(project_id):
     """
@@ -52,77 +127,128 @@ def send_project_overdue_notification(project_id):
         members_emails = project.members.values_list('user__email', flat=True)
         recipients.extend(members_emails)
         
-        # Remove duplicates and None values
-        recipients = list(set([email for email in recipients if email]))
+        # Remove duplicates and None values, then skip anyone already notified today.
+        # Claim and enqueue together: if the enqueue fails, the claims roll back.
+        today = timezone.now().date()
+        with transaction.atomic():
+            recipients = claim_recipients('project', project.id, 'overdue', {email for email in recipients if email}, today)
+            if not recipients:
+                logger.info("Overdue notification for project '%s' already sent today", project.name)
+                return
         
-        subject = f"Project Overdue: {project.name}"
+            subject = f"Project Overdue: {project.name}"
         
-        # Create HTML email content
-        context = {
-            'project_name': project.name,
-            'end_date': project.end_date,
-            'today': timezone.now().date(),
-        }
+            # Create HTML email content
+            context = {
+                'project_name': project.name,
+                'end_date': project.end_date,
+                'today': today,
+            }
         
-        html_message = render_to_string('project_overdue_notification.html', context)
+            html_message = render_email('project_overdue_notification.html', context)
         
-        # Send HTML-only email
-        send_mail(
-            subject=subject,
-            message=f"Project {project.name} is overdue as of {timezone.now().date()}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            html_message=html_message,
-            fail_silently=False,
-        )
+            # Hand off to the mail queue
+            enqueue_email(
+                subject=subject,
+                body=f"Project {project.name} is overdue as of {today}",
+                to=recipients,
+                html_body=html_message,
+            )
         
-        logger.info(f"Sent HTML overdue notification for project '{project.name}' to {len(recipients)} recipients")
+        logger.info("Queued HTML overdue notification for project '%s' to %s recipients", project.name, len(recipients))
         
     except Project.DoesNotExist:
-        logger.error(f"Project with id {project_id} does not exist")
+        logger.error("Project with id %s does not exist", project_id)
     except Exception as e:
-        logger.error(f"Error sending project overdue notification: {str(e)}")
+        logger.error("Error sending project overdue notification: %s", e)
         raise
 
 @shared_task
-def check_task_overdue():
+def check_task_overdue(notify_due_today=True):
     """
-    Check for tasks that are due today or overdue
-    Send notifications and update status
+    Check for tasks that are due today or overdue.
+    Id ranges are swept in parallel (status update + due-today lookup);
+    finish_task_sweep invalidates caches once and sends the notifications.
+    With the due-date scheduler enabled the due-today reminders are already
+    sent as tasks come due, so the reconciliation pass skips them.
     """
     try:
         today = timezone.now().date()
-        
-        # Tasks due today
-        tasks_due_today = Task.objects.filter(
-            due_date=today,
-            status__in=['ongoing', 'on_hold'],
-            is_deleted=False
-        )
-        
-        # Tasks that are overdue
-        overdue_tasks = Task.objects.filter(
-            due_date__lt=today,
-            status__in=['ongoing', 'on_hold'],
-            is_deleted=False
+        ranges = _id_ranges(
+            Task.objects.filter(due_date__lte=today, status__in=SWEEP_STATUSES['task'], is_deleted=False),
+            settings.OVERDUE_SWEEP_CHUNK_SIZE,
         )
-        
-        # Update overdue tasks status
-        overdue_tasks.update(status='overdue')
-        
-        # Send notifications for tasks due today
-        for task in tasks_due_today:
-            send_task_due_today_notification.delay(task.id)
-        
-        # Send notifications for overdue tasks
-        for task in overdue_tasks:
-            send_task_overdue_notification.delay(task.id)
-            
-        logger.info(f"Checked task due dates. {tasks_due_today.count()} due today, {overdue_tasks.count()} overdue")
-        return f"Processed {tasks_due_today.count()} due today, {overdue_tasks.count()} overdue"
+
+        if not ranges:
+            logger.info("Checked task due dates. 0 due today, 0 overdue")
+            return "Processed 0 due today, 0 overdue"
+
+        chord(
+            sweep_task_range.s(low, high, today.isoformat()) for low, high in ranges
+        )(finish_task_sweep.s(notify_due_today))
+
+        logger.info("Task due date sweep dispatched in %s chunk(s)", len(ranges))
+        return f"Dispatched {len(ranges)} task sweep chunks"
         
     except Exception as e:
-        logger.error(f"Error in check_task_overdue: {str(e)}")
+        logger.error("Error in check_task_overdue: %s", e)
+        raise
+
+@shared_task(ignore_result=False)
+def sweep_task_range(low, high, today):
+    """
+    For tasks with ids in [low, high]: mark overdue ones (UPDATE ... RETURNING)
+    and collect the ones due today
+    """
+    today = date.fromisoformat(today)
+    overdue = _mark_overdue_returning(Task, 'task', 'due_date', today, low=low, high=high, returning='id, project_id')
+    due_today = Task.objects.filter(
+        id__range=(low, high),
+        due_date=today,
+        status__in=SWEEP_STATUSES['task'],
+        is_deleted=False
+    ).values_list('id', flat=True)
+
+    return {
+        'overdue': [task_id for task_id, _ in overdue],
+        'due_today': list(due_today),
+        'project_ids': sorted({project_id for _, project_id in overdue}),
+    }
+
+@shared_task
+def finish_task_sweep(results, notify_due_today=True):
+    """
+    Chord callback: aggregate the chunk results, invalidate caches once and notify
+    """
+    overdue = [task_id for chunk in results for task_id in chunk['overdue']]
+    due_today = [task_id for chunk in results for task_id in chunk['due_today']] if notify_due_today else []
+
+    clear_projects_cache({project_id for chunk in results for project_id in chunk['project_ids']})
+
+    if due_today or overdue:
+        send_task_notifications.delay(due_today, overdue)
+
+    logger.info("Checked task due dates. %s due today, %s overdue", len(due_today), len(overdue))
+    return f"Processed {len(due_today)} due today, {len(overdue)} overdue"
+
+@shared_task
+def send_task_notifications(due_today_ids, overdue_ids):
+    """
+    Notify recipients about due-today and overdue tasks: one digest email per
+    digest-mode user, one email per task for users in immediate mode
+    """
+    try:
+        today = timezone.now().date()
+        # Claim and enqueue together: if the enqueue fails, the claims roll back.
+        with transaction.atomic():
+            messages, digest_count = build_task_notifications(due_today_ids, overdue_ids, today)
+            enqueue_emails(messages)
+
+        logger.info("Queued %s task digests and %s immediate task notifications", digest_count, len(messages) - digest_count)
+        return f"Queued {len(messages)} notification emails"
+
+    except Exception as e:
+        logger.error("Error sending task notifications: %s", e)
         raise
 
 @shared_task
@@ -136,34 +262,36 @@ def send_task_due_today_notification(task_id):
         recipients = list(task.assigned_to.values_list('user__email', flat=True))
         recipients.append(task.project.created_by.email)
         
-        recipients = list(set([email for email in recipients if email]))
+        # Claim and enqueue together: if the enqueue fails, the claims roll back.
+        with transaction.atomic():
+            recipients = claim_recipients('task', task.id, 'due_today', {email for email in recipients if email}, timezone.now().date())
+            if not recipients:
+                return
         
-        subject = f"Task Due Today: {task.title}"
+            subject = f"Task Due Today: {task.title}"
         
-        context = {
-            'task_title': task.title,
-            'project_name': task.project.name,
-            'due_date': task.due_date,
-        }
+            context = {
+                'task_title': task.title,
+                'project_name': task.project.name,
+                'due_date': task.due_date,
+            }
         
-        html_message = render_to_string('task_due_today_notification.html', context)
+            html_message = render_email('task_due_today_notification.html', context)
         
-        # Send HTML-only email
-        send_mail(
-            subject=subject,
-            message=f"Task {task.title} is ovedue as of {timezone.now().date()}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            html_message=html_message,
-            fail_silently=False,
-        )
+            # Hand off to the mail queue
+            enqueue_email(
+                subject=subject,
+                body=f"Task {task.title} is ovedue as of {timezone.now().date()}",
+                to=recipients,
+                html_body=html_message,
+            )
         
-        logger.info(f"Sent HTML due today notification for task '{task.title}' to {len(recipients)} recipients")
+        logger.info("Queued HTML due today notification for task '%s' to %s recipients", task.title, len(recipients))
         
     except Task.DoesNotExist:
-        logger.error(f"Task with id {task_id} does not exist")
+        logger.error("Task with id %s does not exist", task_id)
     except Exception as e:
-        logger.error(f"Error sending task due today notification: {str(e)}")
+        logger.error("Error sending task due today notification: %s", e)
         raise
 
 @shared_task
@@ -178,47 +306,174 @@ def send_task_overdue_notification(task_id):
         recipients = list(task.assigned_to.values_list('user__email', flat=True))
         recipients.append(task.project.created_by.email)
         
-        # Remove duplicates and None values
-        recipients = list(set([email for email in recipients if email]))
+        # Remove duplicates and None values.
+        # Claim and enqueue together: if the enqueue fails, the claims roll back.
+        with transaction.atomic():
+            recipients = claim_recipients('task', task.id, 'overdue', {email for email in recipients if email}, timezone.now().date())
+            if not recipients:
+                return
         
-        subject = f"Task Overdue: {task.title}"
+            subject = f"Task Overdue: {task.title}"
         
-        context = {
-            'task_title': task.title,
-            'project_name': task.project.name,
-            'due_date': task.due_date,
-            'days_overdue': (timezone.now().date() - task.due_date).days,
-        }
+            context = {
+                'task_title': task.title,
+                'project_name': task.project.name,
+                'due_date': task.due_date,
+                'days_overdue': (timezone.now().date() - task.due_date).days,
+            }
         
-        html_message = render_to_string('task_overdue_notification.html', context)
+            html_message = render_email('task_overdue_notification.html', context)
         
-        # Send HTML-only email
-        send_mail(
-            subject=subject,
-            message =f"Task {task.title} is ovedue as of {timezone.now().date()}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipients,
-            html_message=html_message,
-            fail_silently=False,
-        )
+            # Hand off to the mail queue
+            enqueue_email(
+                subject=subject,
+                body=f"Task {task.title} is ovedue as of {timezone.now().date()}",
+                to=recipients,
+                html_body=html_message,
+            )
         
-        logger.info(f"Sent HTML overdue notification for task '{task.title}' to {len(recipients)} recipients")
+        logger.info("Queued HTML overdue notification for task '%s' to %s recipients", task.title, len(recipients))
         
     except Task.DoesNotExist:
-        logger.error(f"Task with id {task_id} does not exist")
+        logger.error("Task with id %s does not exist", task_id)
     except Exception as e:
-        logger.error(f"Error sending task overdue notification: {str(e)}")
+        logger.error("Error sending task overdue notification: %s", e)
         raise
 
 @shared_task
 def check_daily_notifications():
     """
-    Master task that runs all daily checks
+    Master task that runs all daily checks.
+    With the due-date scheduler enabled this is a reconciliation pass only:
+    it refills the due-date index and sweeps anything the scheduler missed.
     """
     try:
+        send_overdue_reminders.delay()
+        purge_notification_ledger.delay()
+
+        if settings.DUE_SCHEDULER_ENABLED:
+            reconcile_due_index.delay()
+            check_project_overdue.delay()
+            check_task_overdue.delay(notify_due_today=False)
+            logger.info("Daily reconciliation checks dispatched")
+            return
+
         check_project_overdue.delay()
         check_task_overdue.delay()
         logger.info("Daily notification checks completed")
     except Exception as e:
-        logger.error(f"Error in daily notifications: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error("Error in daily notifications: %s", e)
+        raise
+
+@shared_task
+def send_overdue_reminders():
+    """
+    Re-notify items that have been overdue for exactly one of the
+    OVERDUE_RENOTIFY_DAYS; the ledger drops anything already sent today
+    """
+    try:
+        today = timezone.now().date()
+        dates = renotify_dates(today)
+        if not dates:
+            return "Overdue reminders disabled"
+
+        project_ids = list(Project.objects.filter(
+            status='overdue', end_date__in=dates, is_deleted=False
+        ).values_list('id', flat=True))
+        for project_id in throttled(project_ids, NOTIFICATIONS_QUEUE):
+            send_project_overdue_notification.delay(project_id)
+
+        task_ids = list(Task.objects.filter(
+            status='overdue', due_date__in=dates, is_deleted=False
+        ).values_list('id', flat=True))
+        chunk_size = settings.OVERDUE_SWEEP_CHUNK_SIZE
+        for start in throttled(range(0, len(task_ids), chunk_size), NOTIFICATIONS_QUEUE):
+            send_task_notifications.delay([], task_ids[start:start + chunk_size])
+
+        logger.info("Overdue reminders dispatched for %s projects and %s tasks", len(project_ids), len(task_ids))
+        return f"Reminded {len(project_ids)} projects and {len(task_ids)} tasks"
+
+    except Exception as e:
+        logger.error("Error sending overdue reminders: %s", e)
+        raise
+
+@shared_task
+def purge_notification_ledger():
+    """
+    Delete ledger rows older than NOTIFICATION_LEDGER_RETENTION_DAYS
+    """
+    before = timezone.now().date() - timedelta(days=settings.NOTIFICATION_LEDGER_RETENTION_DAYS)
+    deleted = purge_ledger(before)
+    logger.info("Purged %s notification ledger rows older than %s", deleted, before)
+    return deleted
+
+@shared_task
+def reconcile_due_index():
+    """
+    Re-add upcoming tasks and projects to the due-date index
+    """
+    return rebuild_index()
+
+@shared_task
+def dispatch_due_items():
+    """
+    Pop due entries from the due-date index in small batches and apply them:
+    overdue transitions with set-based updates, then notifications
+    """
+    if not settings.DUE_SCHEDULER_ENABLED:
+        return "Due-date scheduler disabled"
+
+    today = timezone.now().date()
+    processed = 0
+
+    for _ in range(settings.DUE_SCHEDULER_MAX_BATCHES):
+        items = pop_due_items(settings.DUE_SCHEDULER_BATCH_SIZE)
+        if not items:
+            break
+
+        try:
+            groups = group_items(items)
+
+            project_rows = _mark_overdue_returning(Project, 'project', 'end_date', today, ids=groups['project:overdue'])
+            task_rows = _mark_overdue_returning(
+                Task, 'task', 'due_date', today, ids=groups['task:overdue'], returning='id, project_id'
+            )
+            # Entries may be stale (task completed or moved since indexing); re-check against the DB.
+            due_today = list(Task.objects.filter(
+                id__in=groups['task:due_today'],
+                due_date=today,
+                status__in=SWEEP_STATUSES['task'],
+                is_deleted=False
+            ).values_list('id', flat=True))
+
+            overdue_project_ids = [project_id for project_id, in project_rows]
+            overdue_task_ids = [task_id for task_id, _ in task_rows]
+            clear_projects_cache(set(overdue_project_ids) | {project_id for _, project_id in task_rows})
+
+            for project_id in throttled(overdue_project_ids, NOTIFICATIONS_QUEUE):
+                send_project_overdue_notification.delay(project_id)
+            if due_today or overdue_task_ids:
+                send_task_notifications.delay(due_today, overdue_task_ids)
+
+        except Exception as e:
+            logger.error("Error dispatching due items, returning %s to the index: %s", len(items), e)
+            restore_items(items)
+            raise
+
+        processed += len(items)
+        if len(items) < settings.DUE_SCHEDULER_BATCH_SIZE:
+            break
+
+    if processed:
+        logger.info("Dispatched %s due-date entries", processed)
+    return f"Dispatched {processed} due-date entries"
+
+@shared_task
+def import_task_chunk(import_id, project_id, rows, chunk_number):
+    """
+    Validate and bulk insert one chunk of a streaming task import
+    """
+    from .importers import import_chunk
+
+    project = Project.objects.get(id=project_id)
+    return import_chunk(project, import_id, rows, chunk_number)
@@ -1,3 +1,148 @@
-from django.test import TestCase
+import tracemalloc
+from datetime import date, datetime, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from project_tracker.utils.email_templates import clear_template_cache, render_email, render_many
+from users.tokens import TrackerRefreshToken
+from .models import Project
+from .seeding import seed_dataset, seeded_users
 
-# Create your tests here.
+# Peak bytes allocated while streaming an export, whatever the number of rows.
+# Buffering them would take hundreds of MB at 1M tasks; streaming holds one chunk.
+EXPORT_MEMORY_BOUND = 4 * 1024 * 1024
+
+
+class _GeneratedRows:
+    """
+    Stands in for the task and assignee querysets of api/exporters.py:
+    yields `count` tasks lazily, each assigned to one contributor.
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.task_ids = []
+
+    def filter(self, task_id__in=None, **kwargs):
+        self.task_ids = task_id__in or []
+        return self
+
+    def order_by(self, *fields):
+        return self
+
+    values_list = order_by
+
+    def iterator(self, chunk_size=None):
+        stamp = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        for number in range(1, self.count + 1):
+            yield (
+                number, f"task-{number}", f"Task {number}", "Generated task for the export memory test.",
+                date(2025, 6, 1), 'ongoing', stamp, stamp,
+            )
+
+    def __iter__(self):
+        return ((task_id, 'member@example.com') for task_id in self.task_ids)
+
+
+@override_settings(TASK_EXPORT_CHUNK_SIZE=200)
+class TaskExportMemoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(managers=1, members=20, projects_per_manager=1, tasks_per_project=2000, seed=1)
+        seed_dataset(managers=1, members=20, projects_per_manager=1, tasks_per_project=10000, seed=2)
+
+    def export(self, seed, file_format):
+        """Stream the export of the seed's project; returns (lines, peak traced bytes)."""
+        manager = seeded_users(seed).get(role='manager')
+        project = Project.objects.get(created_by=manager)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {TrackerRefreshToken.for_user(manager).access_token}")
+
+        response = client.get(f"/api/projects/{project.slug}/tasks/export/", {'file_format': file_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        # The rows are only read once the body is consumed.
+        tracemalloc.start()
+        try:
+            lines = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return lines, peak
+
+    def test_export_memory_is_bounded(self):
+        for file_format in ('csv', 'ndjson'):
+            with self.subTest(file_format=file_format):
+                small_lines, small_peak = self.export(1, file_format)
+                large_lines, large_peak = self.export(2, file_format)
+                self.assertGreater(large_lines, small_lines * 4)
+                self.assertLess(small_peak, EXPORT_MEMORY_BOUND)
+                self.assertLess(large_peak, EXPORT_MEMORY_BOUND)
+
+    def test_export_memory_is_bounded_at_one_million_rows(self):
+        rows = 1_000_000
+        generated = _GeneratedRows(rows)
+        task = SimpleNamespace(objects=generated, assigned_to=SimpleNamespace(through=SimpleNamespace(objects=generated)))
+        with mock.patch('api.exporters.Task', task):
+            lines, peak = self.export(1, 'csv')
+        self.assertEqual(lines, rows + 1)     # Plus the header
+        self.assertLess(peak, EXPORT_MEMORY_BOUND)
+
+
+# One context per email template under frontend/, with markup and ampersands to exercise autoescaping.
+EMAIL_CONTEXTS = {
+    'project_invitation.html': {
+        'project_name': 'Billing <b>API</b>',
+        'inviter_name': 'Asha & Ben',
+        'inviter_email': 'asha@example.com',
+        'invite_link': 'https://tracker.example.com/invite_register?token=abc&next=/',
+        'recipient_email': 'new@example.com',
+    },
+    'project_overdue_notification.html': {
+        'project_name': 'Billing <b>API</b>',
+        'end_date': date(2025, 5, 31),
+        'today': date(2025, 6, 2),
+    },
+    'task_due_today_notification.html': {
+        'task_title': 'Fix "login" & <signup>',
+        'project_name': 'Billing API',
+        'due_date': date(2025, 6, 2),
+    },
+    'task_overdue_notification.html': {
+        'task_title': 'Fix "login" & <signup>',
+        'project_name': 'Billing API',
+        'due_date': date(2025, 5, 28),
+        'days_overdue': 5,
+    },
+    'task_digest_notification.html': {
+        'today': date(2025, 6, 2),
+        'due_today': [{'title': 'Write <docs>', 'project_name': 'Billing API', 'due_date': date(2025, 6, 2)}],
+        'overdue': [
+            {'title': 'Fix "login" & <signup>', 'project_name': 'Billing API', 'due_date': date(2025, 5, 28), 'days_overdue': 5},
+            {'title': 'Ship export', 'project_name': 'Reports', 'due_date': date(2025, 6, 1), 'days_overdue': 1},
+        ],
+    },
+}
+
+
+class EmailTemplateTests(SimpleTestCase):
+    """render_email()/render_many() reach into Django's template internals; their output must not drift."""
+
+    def setUp(self):
+        clear_template_cache()
+
+    def test_render_email_matches_render_to_string(self):
+        for name, context in EMAIL_CONTEXTS.items():
+            with self.subTest(template=name):
+                self.assertEqual(render_email(name, context), render_to_string(name, context))
+
+    def test_render_many_matches_render_to_string(self):
+        for name, context in EMAIL_CONTEXTS.items():
+            # The second context drops keys, which must not leak in from the first.
+            contexts = [context, {}, {**context, 'project_name': 'Second project'}]
+            with self.subTest(template=name):
+                self.assertEqual(render_many(name, contexts), [render_to_string(name, values) for values in contexts])
@@ -1,5 +1,15 @@
 from django.urls import path
 from .views import *
+from django.conf import settings  # after the star import, which re-exports project_tracker.settings
+
+if settings.ASYNC_API_VIEWS:
+    # ASGI deployment: same routes, async implementations of the read-heavy views.
+    from .async_views import (
+        AsyncProjectListAPIView as ProjectListAPIView,
+        AsyncProjectMembersAPIView as ProjectMembersAPIView,
+        AsyncTaskListAPIView as TaskListAPIView,
+        AsyncTaskUpdateAPIView as TaskUpdateAPIView,
+    )
 
 urlpatterns = [
     # ---------------------- PROJECT MANAGEMENT ----------------------
@@ -14,9 +24,13 @@ urlpatterns = [
 
     # ---------------------- TASK MANAGEMENT -------------------------
     path('projects/<slug:slug>/tasks/add/', TaskCreateAPIView.as_view(), name='task-create'),
+    path('tasks/bulk-update/', TaskBulkUpdateAPIView.as_view(), name='task-bulk-update'),
     path('tasks/<slug:slug>/edit/', TaskUpdateAPIView.as_view(), name='task-update'),
     path('tasks/<slug:slug>/delete/', TaskDeleteAPIView.as_view(), name='task-delete'),
     path('projects/<slug:slug>/task_list/', TaskListAPIView.as_view(), name='project-task-list'),
+    path('projects/<slug:slug>/tasks/export/', TaskExportAPIView.as_view(), name='task-export'),
+    path('projects/<slug:slug>/tasks/import/', TaskImportAPIView.as_view(), name='task-import'),
+    path('projects/<slug:slug>/tasks/import/<uuid:import_id>/', TaskImportStatusAPIView.as_view(), name='task-import-status'),
 
     # ---------------------- PROJECT MEMBERS -------------------------
     path('projects/<slug:slug>/members/', ProjectMembersAPIView.as_view(), name='project-members'),
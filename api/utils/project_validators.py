@@ -14,11 +14,11 @@ def validate_project_access(project, user, action="perform this action"):
     """
     # Check if user is the creator of the project
     if project.created_by != user:
-        logger.warning(f"Unauthorized attempt by {user.email} to {action} on project '{project.name}'")
+        logger.warning("Unauthorized attempt by %s to %s on project '%s'", user.email, action, project.name)
         return build_response(False,errors=f"You are not authorized to {action} on this project.",status_code=status.HTTP_403_FORBIDDEN,)
 
     if getattr(project, "is_deleted", False):
-        logger.warning(f"Attempt to {action} on deleted project '{project.name}' by {user.email}")
+        logger.warning("Attempt to %s on deleted project '%s' by %s", action, project.name, user.email)
         return build_response(False,errors="This project has already been deleted.",status_code=status.HTTP_400_BAD_REQUEST,)
 
     return None
@@ -34,7 +34,7 @@ def validate_project_member_access(project, user, action="access this project"):
 
     # Check if the project is deleted
     if getattr(project, "is_deleted", False):
-        logger.warning(f"Attempt to {action} on deleted project '{project.name}' by {user.email}")
+        logger.warning("Attempt to %s on deleted project '%s' by %s", action, project.name, user.email)
         return build_response(
             False,
             errors="This project has already been deleted.",
@@ -52,5 +52,5 @@ def validate_project_member_access(project, user, action="access this project"):
             return None 
 
     # Otherwise, deny access
-    logger.warning(f"Unauthorized attempt by {user.email} to {action} on project '{project.name}'")
+    logger.warning("Unauthorized attempt by %s to %s on project '%s'", user.email, action, project.name)
     return build_response(False, errors=f"You are not authorized to {action} on this project.",status_code=status.HTTP_403_FORBIDDEN)
@@ -3,18 +3,29 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from django.conf import settings
 from rest_framework.permissions import IsAuthenticated,AllowAny
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from users.authentication import StatelessJWTAuthentication
+from users.hashing import PasswordHashingBusy, busy_response
 from rest_framework.exceptions import ValidationError
 from project_tracker.utils.response_handler import build_response
+from project_tracker.utils.throttling import UserTokenBucketThrottle
 from .serializers import *
 from .decorators import manager_required
 from django.shortcuts import get_object_or_404
 from .models import *
-from django.core.mail import send_mail,EmailMultiAlternatives
+from project_tracker.utils.mailer import PRIORITY_INTERACTIVE, build_message, enqueue_emails
 from .utils.project_validators import validate_project_access,validate_project_member_access
 from rest_framework.pagination import PageNumberPagination
 from django.core.cache import cache
-from django.template.loader import render_to_string
+from project_tracker.utils.email_templates import render_email
+from project_tracker.utils.compression import cache_compressed, cached_encoding, precompressed_response, variant_key
+from project_tracker.utils.metrics import record_cache
+from django.db import transaction
+from django.utils import timezone
+from collections import defaultdict
+from .signals import clear_project_cache_async
+from .importers import TaskImport, ImportFormatError, detect_format, get_progress
+from .exporters import EXPORT_FORMATS, stream_tasks
+from django.http import StreamingHttpResponse
 
 
 
@@ -24,7 +35,7 @@ logger = logging.getLogger('tracker_logger')
 
 class ProjectCreateAPIView(generics.CreateAPIView):
     serializer_class = ProjectSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @manager_required
@@ -36,27 +47,27 @@ class ProjectCreateAPIView(generics.CreateAPIView):
             serializer.is_valid(raise_exception=True)
 
             project = serializer.save(created_by=request.user)
-            logger.info(f"Project '{project.name}' created successfully by {request.user.email}")
+            logger.info("Project '%s' created successfully by %s", project.name, request.user.email)
 
             return build_response(True,message="Project created successfully.",data=serializer.data,status_code=status.HTTP_201_CREATED,)
 
         except ValidationError as e:
-            logger.warning(f"Validation error during project creation by {request.user.email}: {e.detail}")
+            logger.warning("Validation error during project creation by %s: %s", request.user.email, e.detail)
             return build_response(False,message="Validation error occurred.",errors=e.detail,status_code=status.HTTP_400_BAD_REQUEST,)
 
         except Exception as e:
-            logger.exception(f"Unexpected error during project creation by {request.user.email}: {e}")
+            logger.exception("Unexpected error during project creation by %s: %s", request.user.email, e)
             return build_response(False,errors="An unexpected error occurred while creating the project.",status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,)
 class ProjectUpdateAPIView(generics.UpdateAPIView):
     serializer_class = ProjectSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_field = "slug"
     queryset = Project.objects.all()
     @manager_required
     def get(self, request, slug, *args, **kwargs):
         """Get project details for editing"""
-        logger.debug(f"Project details request by {request.user.email} for slug: {slug}")
+        logger.debug("Project details request by %s for slug: %s", request.user.email, slug)
         
         try:
             project = self.get_object()
@@ -66,7 +77,7 @@ class ProjectUpdateAPIView(generics.UpdateAPIView):
                 return invalid_response
                 
             serializer = self.get_serializer(project)
-            logger.info(f"Project '{project.name}' details retrieved by {request.user.email}")
+            logger.info("Project '%s' details retrieved by %s", project.name, request.user.email)
             return build_response(
                 True, 
                 message="Project details retrieved successfully.", 
@@ -75,7 +86,7 @@ class ProjectUpdateAPIView(generics.UpdateAPIView):
             )
             
         except Exception as exc:
-            logger.exception(f"Unexpected error during project details retrieval by {request.user.email}: {exc}")
+            logger.exception("Unexpected error during project details retrieval by %s: %s", request.user.email, exc)
             return build_response(
                 False, 
                 errors="An unexpected error occurred while retrieving project details.", 
@@ -84,7 +95,7 @@ class ProjectUpdateAPIView(generics.UpdateAPIView):
 
     @manager_required
     def patch(self, request, slug, *args, **kwargs):
-        logger.debug(f"Project update attempt by {request.user.email} for slug: {slug}")
+        logger.debug("Project update attempt by %s for slug: %s", request.user.email, slug)
 
         try:
             project = get_object_or_404(Project, slug=slug)
@@ -95,11 +106,11 @@ class ProjectUpdateAPIView(generics.UpdateAPIView):
             serializer = self.get_serializer(project, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
-            logger.info(f"Project '{project.name}' updated successfully by {request.user.email}")
+            logger.info("Project '%s' updated successfully by %s", project.name, request.user.email)
             return build_response(True, message="Project updated successfully.", data=serializer.data, status_code=status.HTTP_200_OK)
 
         except ValidationError as exc:
-            logger.warning(f"Validation error during update by {request.user.email}: {exc.detail}")
+            logger.warning("Validation error during update by %s: %s", request.user.email, exc.detail)
             return build_response(
                 False,
                 errors=exc.detail,
@@ -107,18 +118,18 @@ class ProjectUpdateAPIView(generics.UpdateAPIView):
             )
 
         except Exception as exc:
-            logger.exception(f"Unexpected error during project update by {request.user.email}: {exc}")
+            logger.exception("Unexpected error during project update by %s: %s", request.user.email, exc)
             return build_response(False, errors="An unexpected error occurred while updating the project.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 class ProjectDeleteAPIView(generics.DestroyAPIView):
     serializer_class = ProjectSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_field = "slug"
     queryset = Project.objects.all()
 
     @manager_required
     def delete(self, request, slug, *args, **kwargs):
-        logger.debug(f"Delete request for project slug: {slug} by {request.user.email}")
+        logger.debug("Delete request for project slug: %s by %s", slug, request.user.email)
 
         try:
             project = get_object_or_404(Project, slug=slug)
@@ -130,11 +141,11 @@ class ProjectDeleteAPIView(generics.DestroyAPIView):
             project.is_deleted = True
             project.save()
 
-            logger.info(f"Project '{project.name}' soft deleted by {request.user.email}")
+            logger.info("Project '%s' soft deleted by %s", project.name, request.user.email)
             return build_response(True, message="Project deleted successfully.", status_code=status.HTTP_200_OK)
 
         except Exception as exc:
-            logger.exception(f"Error during project deletion: {exc}")
+            logger.exception("Error during project deletion: %s", exc)
             return build_response(False, errors="An unexpected error occurred while deleting the project.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 class ProjectPagination(PageNumberPagination):
     """Custom pagination class for Projects."""
@@ -145,7 +156,7 @@ class ProjectPagination(PageNumberPagination):
 
 class ProjectListAPIView(generics.ListAPIView):
     serializer_class = ProjectSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     pagination_class = ProjectPagination
 
@@ -165,39 +176,49 @@ class ProjectListAPIView(generics.ListAPIView):
             return queryset.order_by('-created_at')
 
         except Exception as e:
-            logger.exception(f"Error fetching queryset for user {user.email}: {e}")
+            logger.exception("Error fetching queryset for user %s: %s", user.email, e)
             return Project.objects.none()
 
     def list(self, request, *args, **kwargs):
         user = request.user
         cache_key = f"project_list:{user.id}:{request.get_full_path()}"
+        encoding = cached_encoding(request)
+        compressed_key = variant_key(cache_key, encoding) if encoding else None
 
         try:
-            # Try fetching from cache
+            # Try fetching from cache, the compressed body first
             try:
-                cached_data = cache.get(cache_key)
+                cached = cache.get_many([key for key in (compressed_key, cache_key) if key])
             except Exception as cache_error:
-                logger.warning(f"Cache get failed for key {cache_key}: {cache_error}")
-                cached_data = None
+                logger.warning("Cache get failed for key %s: %s", cache_key, cache_error)
+                cached = {}
 
+            if compressed_key in cached:
+                record_cache('project_list', 'compressed')
+                logger.debug("Serving compressed project list for %s from cache", user.email)
+                return precompressed_response(cached[compressed_key], encoding)
+
+            cached_data = cached.get(cache_key)
             if cached_data:
-                logger.debug(f"Serving project list for {user.email} from cache")
-                return Response(cached_data)
+                record_cache('project_list', 'hit')
+                logger.debug("Serving project list for %s from cache", user.email)
+                return cache_compressed(Response(cached_data), cache_key, 60 * 5)
 
             # Fetch from DB (normal flow)
-            logger.debug(f"Fetching project list for user: {user.email}")
+            record_cache('project_list', 'miss')
+            logger.debug("Fetching project list for user: %s", user.email)
             response = super().list(request, *args, **kwargs)
 
             # Try setting cache but ignore cache errors
             try:
                 cache.set(cache_key, response.data, timeout=60 * 5)
             except Exception as cache_error:
-                logger.warning(f"Cache set failed for key {cache_key}: {cache_error}")
+                logger.warning("Cache set failed for key %s: %s", cache_key, cache_error)
 
-            return response
+            return cache_compressed(response, cache_key, 60 * 5)
 
         except Exception as e:
-            logger.exception(f"Unexpected error listing projects for {user.email}: {e}")
+            logger.exception("Unexpected error listing projects for %s: %s", user.email, e)
             return build_response(
                 False,
                 "Failed to retrieve projects. Please try again later.",
@@ -207,13 +228,15 @@ class ProjectListAPIView(generics.ListAPIView):
         
 class ProjectInviteAPIView(generics.GenericAPIView):
     serializer_class = ProjectInviteSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle]
+    throttle_scope = 'invite'
 
     @manager_required
     def post(self, request, slug):
-        logger.debug(f"Invite request received for project slug: {slug}")
-        project = get_object_or_404(Project, slug=slug)
+        logger.debug("Invite request received for project slug: %s", slug)
+        project = get_object_or_404(Project.objects.select_related('created_by'), slug=slug)
 
         invalid_response = validate_project_access(project, request.user, "invite members")
         if invalid_response:
@@ -228,60 +251,62 @@ class ProjectInviteAPIView(generics.GenericAPIView):
             if not emails:
                 return build_response(False,errors="No email provided for invitation.",status_code=status.HTTP_400_BAD_REQUEST)
 
-            successful_invites = []
-            
-            for email in emails:
-                serializer_data = {'email': email}
-                serializer = self.get_serializer(data=serializer_data, context={'project': project})
-                serializer.is_valid(raise_exception=True)
-
-                validated_email = serializer.validated_data['email']
-                user = User.objects.filter(email=validated_email).first()
-
-                if user and hasattr(user, 'contributor_profile'):
-                    contributor = user.contributor_profile
-                    project.members.add(contributor)
-                    logger.info(f"Existing contributor {validated_email} added directly to project {project.name}")
-                    successful_invites.append(validated_email)
-                    continue
+            serializer = self.get_serializer(data={'emails': emails}, context={'project': project})
+            serializer.is_valid(raise_exception=True)
 
-                invite = ProjectInvite.objects.create(
-                    project=project,
-                    invited_by=request.user,
-                    email=validated_email
-                )
+            contributors = serializer.context['existing_contributors']
+            invite_emails = serializer.context['invite_emails']
 
-                invite_link = f"{settings.BASE_URL}/invite_register?token={invite.token}"
-                logger.info(f"Invite created for {validated_email} with link {invite_link}")
+            with transaction.atomic():
+                if contributors:
+                    project.members.add(*contributors)
+                invites = ProjectInvite.objects.bulk_create([
+                    ProjectInvite(project=project, invited_by=request.user, email=email)
+                    for email in invite_emails
+                ])
 
-                self.send_html_invitation_email(project, invite, request.user, invite_link)
+            for contributor in contributors:
+                logger.info("Existing contributor %s added directly to project %s", contributor.user.email, project.name)
+
+            # Queued only once the invites are committed: a published task can't be
+            # recalled, so it must never carry a token that was rolled back.
+            messages = []
+            for invite in invites:
+                invite_link = f"{settings.BASE_URL}/invite_register?token={invite.token}"
+                logger.info("Invite created for %s with link %s", invite.email, invite_link)
+                messages.append(self.build_invitation_email(project, invite, request.user, invite_link))
+            emails_queued = self.queue_invitation_emails(project, messages)
 
-                successful_invites.append(validated_email)
+            successful_invites = [contributor.user.email for contributor in contributors] + invite_emails
 
             if len(successful_invites) == 1:
-                return build_response(True, f"Invitation sent successfully to {successful_invites[0]}.", status.HTTP_201_CREATED)
+                message = f"Invitation sent successfully to {successful_invites[0]}."
             else:
-                return build_response(True, f"Invitations sent successfully to {len(successful_invites)} emails.", status.HTTP_201_CREATED)
+                message = f"Invitations sent successfully to {len(successful_invites)} emails."
+            if not emails_queued:
+                message += " Some invitation emails could not be sent right now; the invites were saved."
+            return build_response(True, message, status_code=status.HTTP_201_CREATED)
+
+        except ValidationError as e:
+            logger.warning("Validation error in project invitation: %s", e.detail)
+            return build_response(False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.exception(f"Error in project invitation: {e}")
+            logger.exception("Error in project invitation: %s", e)
             return build_response(False, errors=str(e),status_code= status.HTTP_400_BAD_REQUEST)
 
-    def send_html_invitation_email(self, project, invite, inviter, invite_link):
-        """Send HTML invitation email using template from frontend directory"""
+    def queue_invitation_emails(self, project, messages):
+        """Queue the emails of committed invites; returns False if they could not be queued."""
         try:
-            # Context data for the template - matches your template variables
-            context = {
-                'project_name': project.name,
-                'inviter_name': f"{inviter.first_name} {inviter.last_name}",
-                'inviter_email': inviter.email,
-                'invite_link': invite_link,
-                'recipient_email': invite.email,
-            }
-            
-            html_content = render_to_string('project_invitation.html', context)
-            
-            text_content = f"""
+            enqueue_emails(messages, priority=PRIORITY_INTERACTIVE)
+            return True
+        except Exception as e:
+            logger.exception("Invites for project %s were saved but their emails could not be queued: %s", project.name, e)
+            return False
+
+    def build_invitation_email(self, project, invite, inviter, invite_link):
+        """Build the HTML invitation email (template from frontend directory) for the mail queue"""
+        text_content = f"""
             You've been invited to join '{project.name}'
             
             Invited by: {inviter.first_name} {inviter.last_name} ({inviter.email})
@@ -292,29 +317,27 @@ class ProjectInviteAPIView(generics.GenericAPIView):
             
             If you have any questions, please contact {inviter.email}
             """
-            
-            email = EmailMultiAlternatives(
-                subject=f"🎯 Join {project.name} on Project Tracker",
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[invite.email],
-            )
-            
-            email.attach_alternative(html_content, "text/html")
-            
-            email.send(fail_silently=True)
-            logger.info(f"HTML invitation email sent successfully to {invite.email}")
-            
+
+        try:
+            # Context data for the template - matches your template variables
+            context = {
+                'project_name': project.name,
+                'inviter_name': f"{inviter.first_name} {inviter.last_name}",
+                'inviter_email': inviter.email,
+                'invite_link': invite_link,
+                'recipient_email': invite.email,
+            }
+            html_content = render_email('project_invitation.html', context)
         except Exception as e:
-            logger.error(f"Failed to send HTML email to {invite.email}: {e}")
-            send_mail(
-                subject=f"Invitation to join project: {project.name}",
-                message=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[invite.email],
-                fail_silently=True,
-            )
-            logger.info(f"Fallback text email sent to {invite.email}")
+            logger.error("Failed to render HTML invitation for %s, falling back to text: %s", invite.email, e)
+            return build_message(f"Invitation to join project: {project.name}", text_content, [invite.email])
+
+        return build_message(
+            f"🎯 Join {project.name} on Project Tracker",
+            text_content,
+            [invite.email],
+            html_body=html_content,
+        )
         
 class InviteRegisterAPIView(generics.GenericAPIView):
     serializer_class = InviteRegisterSerializer
@@ -322,34 +345,36 @@ class InviteRegisterAPIView(generics.GenericAPIView):
 
 
     def post(self, request, token):
-        logger.debug(f"Invite registration attempt for token: {token}")
+        logger.debug("Invite registration attempt for token: %s", token)
 
         try:
             serializer = self.get_serializer(data={**request.data, "token": token})
             serializer.is_valid(raise_exception=True)
             data = serializer.save()
 
-            logger.info(f"User {data['email']} successfully registered and joined project {data['project']}")
+            logger.info("User %s successfully registered and joined project %s", data['email'], data['project'])
             return build_response(True,"Account created and invitation accepted successfully.",data=data,status_code=status.HTTP_201_CREATED)
         except ValidationError as exc:
-            logger.warning(f"Validation error at register invitation api")
+            logger.warning("Validation error at register invitation api")
             return build_response(
                 False,
                 errors=exc.detail,
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+        except PasswordHashingBusy as exc:
+            return busy_response(exc)
         except Exception as e:
-            logger.exception(f"Error during invite registration: {e}")
+            logger.exception("Error during invite registration: %s", e)
             return build_response(False, errors=str(e), status_code=status.HTTP_400_BAD_REQUEST)
         
 
 class TaskCreateAPIView(generics.CreateAPIView):
     serializer_class = TaskSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, slug, *args, **kwargs):
-        logger.debug(f"Task creation attempt under project: {slug}")
+        logger.debug("Task creation attempt under project: %s", slug)
 
         try:
             project = get_object_or_404(Project, slug=slug, is_deleted=False)
@@ -364,21 +389,21 @@ class TaskCreateAPIView(generics.CreateAPIView):
             if assigned_to:
                 task.assigned_to.set(assigned_to)
 
-            logger.info(f"Task '{task.title}' created successfully under project '{project.name}'")
+            logger.info("Task '%s' created successfully under project '%s'", task.title, project.name)
 
             return build_response(True,"Task created successfully.",data=serializer.data,status_code=status.HTTP_201_CREATED)
 
         except serializers.ValidationError as e:
-            logger.warning(f"Validation error during task creation: {e.detail}")
+            logger.warning("Validation error during task creation: %s", e.detail)
             return build_response(False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.exception(f"Unexpected error while creating task: {e}")
+            logger.exception("Unexpected error while creating task: %s", e)
             return build_response(False, "Failed to create task.", status_code=status.HTTP_400_BAD_REQUEST)
         
 class TaskUpdateAPIView(generics.UpdateAPIView):
     serializer_class = TaskSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_field = "slug"
 
@@ -393,13 +418,13 @@ class TaskUpdateAPIView(generics.UpdateAPIView):
         )
 
     def get(self, request, slug, *args, **kwargs):
-        logger.debug(f"Task retrieval attempt for task slug: {slug} by {request.user.email}")
+        logger.debug("Task retrieval attempt for task slug: %s by %s", slug, request.user.email)
 
         try:
             task = self.get_object()
             serializer = self.get_serializer(task)
             
-            logger.info(f"Task '{task.title}' retrieved successfully by {request.user.email}")
+            logger.info("Task '%s' retrieved successfully by %s", task.title, request.user.email)
             return build_response(
                 True,
                 "Task retrieved successfully.",
@@ -407,14 +432,14 @@ class TaskUpdateAPIView(generics.UpdateAPIView):
                 status_code=status.HTTP_200_OK
             )
         except Task.DoesNotExist:
-            logger.warning(f"Task with slug {slug} not found for user {request.user.email}")
+            logger.warning("Task with slug %s not found for user %s", slug, request.user.email)
             return build_response(False, errors="Task not found.", status_code=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.exception(f"Unexpected error during task retrieval for {slug}: {e}")
+            logger.exception("Unexpected error during task retrieval for %s: %s", slug, e)
             return build_response(False, errors="Failed to retrieve task.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def patch(self, request, slug, *args, **kwargs):
-        logger.debug(f"Task update attempt for task slug: {slug} by {request.user.email}")
+        logger.debug("Task update attempt for task slug: %s by %s", slug, request.user.email)
 
         try:
             task = get_object_or_404(Task, slug=slug)
@@ -432,7 +457,7 @@ class TaskUpdateAPIView(generics.UpdateAPIView):
                 updated_task.assigned_to.set(serializer.validated_data['assigned_to'])
                 updated_task.save()
 
-            logger.info(f"Task '{updated_task.title}' updated successfully by {request.user.email}")
+            logger.info("Task '%s' updated successfully by %s", updated_task.title, request.user.email)
             return build_response(
                 True,
                 "Task updated successfully.",
@@ -440,20 +465,179 @@ class TaskUpdateAPIView(generics.UpdateAPIView):
                 status_code=status.HTTP_200_OK
             )
         except serializers.ValidationError as e:
-            logger.warning(f"Validation error during task updation: {e.detail}")
+            logger.warning("Validation error during task updation: %s", e.detail)
             return build_response(False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.exception(f"Unexpected error during task update for {slug}: {e}")
+            logger.exception("Unexpected error during task update for %s: %s", slug, e)
             return build_response(False, errors="Failed to update task.", status_code=status.HTTP_400_BAD_REQUEST)
+class TaskBulkUpdateAPIView(generics.GenericAPIView):
+    """
+    Apply status and assignee changes to a batch of tasks in one request.
+    Changes are grouped and written with set-based UPDATEs and through-table
+    diffs, so the query count does not grow with the batch size.
+    """
+    serializer_class = TaskBulkUpdateSerializer
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        user = request.user
+        logger.debug("Bulk task update attempt by %s", user.email)
+
+        try:
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            items = serializer.validated_data['tasks']
+
+            tasks = {
+                task.slug: task
+                for task in Task.objects.select_related('project').filter(
+                    slug__in=[item['slug'] for item in items],
+                    is_deleted=False
+                )
+            }
+
+            accessible_project_ids = set(
+                Project.objects.filter(
+                    id__in={task.project_id for task in tasks.values()},
+                    is_deleted=False
+                ).filter(
+                    models.Q(created_by=user) | models.Q(members__user=user)
+                ).values_list('id', flat=True)
+            )
+
+            requested_contributors = {
+                contributor_id
+                for item in items
+                for contributor_id in item['changes'].get('assigned_to', [])
+            }
+            memberships = set()
+            if requested_contributors:
+                memberships = set(
+                    Project.members.through.objects.filter(
+                        project_id__in=accessible_project_ids,
+                        contributor_id__in=requested_contributors
+                    ).values_list('project_id', 'contributor_id')
+                )
+
+            results = []
+            status_groups = defaultdict(list)
+            assignments = {}
+            touched_projects = {}
+
+            for item in items:
+                slug, changes = item['slug'], item['changes']
+                task = tasks.get(slug)
+
+                if task is None:
+                    results.append({'slug': slug, 'result': 'not_found', 'error': "Task not found."})
+                    continue
+
+                if task.project_id not in accessible_project_ids:
+                    results.append({'slug': slug, 'result': 'forbidden', 'error': "You are not authorized to update this task."})
+                    continue
+
+                assigned_to = changes.get('assigned_to')
+                if assigned_to is not None:
+                    outsiders = [cid for cid in assigned_to if (task.project_id, cid) not in memberships]
+                    if outsiders:
+                        results.append({
+                            'slug': slug,
+                            'result': 'invalid',
+                            'error': f"Contributors {outsiders} are not part of this project."
+                        })
+                        continue
+                    assignments[task.id] = set(assigned_to)
+
+                if 'status' in changes:
+                    status_groups[changes['status']].append(task.id)
+
+                touched_projects[task.project_id] = task.project
+                results.append({'slug': slug, 'result': 'updated'})
+
+            with transaction.atomic():
+                self.apply_status_changes(status_groups, touched_ids=set(assignments))
+                self.apply_assignment_changes(assignments)
+
+            # Set-based writes bypass the model signals, so invalidate once per project.
+            for project in touched_projects.values():
+                clear_project_cache_async(project)
+
+            updated_count = sum(1 for result in results if result['result'] == 'updated')
+            logger.info("Bulk update by %s: %s of %s tasks updated", user.email, updated_count, len(items))
+            return build_response(
+                True,
+                f"{updated_count} of {len(items)} tasks updated.",
+                data={'results': results},
+                status_code=status.HTTP_200_OK
+            )
+
+        except serializers.ValidationError as e:
+            logger.warning("Validation error during bulk task update: %s", e.detail)
+            return build_response(False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logger.exception("Unexpected error during bulk task update by %s: %s", user.email, e)
+            return build_response(False, errors="Failed to update tasks.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def apply_status_changes(status_groups, touched_ids):
+        """One UPDATE per target status; also bumps updated_at for assignee-only changes."""
+        now = timezone.now()
+        today = now.date()
+
+        for new_status, task_ids in status_groups.items():
+            if new_status == 'completed':
+                value = models.Value(new_status)
+            else:
+                # Same rule as Task.save(): unfinished tasks past their due date are overdue.
+                value = models.Case(
+                    models.When(due_date__lt=today, then=models.Value('overdue')),
+                    default=models.Value(new_status),
+                )
+            Task.objects.filter(id__in=task_ids).update(status=value, updated_at=now)
+            touched_ids.difference_update(task_ids)
+
+        if touched_ids:
+            Task.objects.filter(id__in=touched_ids).update(updated_at=now)
+
+    @staticmethod
+    def apply_assignment_changes(assignments):
+        """Diff the through table against the requested assignees: one read, one delete, one insert."""
+        if not assignments:
+            return
+
+        through = Task.assigned_to.through
+        stale_row_ids = []
+        kept = defaultdict(set)
+
+        for row_id, task_id, contributor_id in through.objects.filter(
+            task_id__in=assignments
+        ).values_list('id', 'task_id', 'contributor_id'):
+            if contributor_id in assignments[task_id]:
+                kept[task_id].add(contributor_id)
+            else:
+                stale_row_ids.append(row_id)
+
+        if stale_row_ids:
+            through.objects.filter(id__in=stale_row_ids).delete()
+
+        through.objects.bulk_create([
+            through(task_id=task_id, contributor_id=contributor_id)
+            for task_id, contributor_ids in assignments.items()
+            for contributor_id in contributor_ids - kept[task_id]
+        ])
+
+
 class TaskDeleteAPIView(generics.DestroyAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_field = "slug"
     queryset = Task.objects.all()
 
     def delete(self, request, slug, *args, **kwargs):
-        logger.debug(f"Task delete request received for {slug} by {request.user.email}")
+        logger.debug("Task delete request received for %s by %s", slug, request.user.email)
 
         try:
             task = get_object_or_404(Task, slug=slug)
@@ -469,92 +653,204 @@ class TaskDeleteAPIView(generics.DestroyAPIView):
             task.is_deleted = True
             task.save(update_fields=["is_deleted"])
 
-            logger.info(f"Task '{task.title}' soft-deleted by {request.user.email}")
+            logger.info("Task '%s' soft-deleted by %s", task.title, request.user.email)
             return build_response(True, "Task deleted successfully.", status.HTTP_200_OK)
 
         except Exception as e:
-            logger.exception(f"Unexpected error during task deletion: {e}")
+            logger.exception("Unexpected error during task deletion: %s", e)
             return build_response(False, errors="Failed to delete task.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class TaskListAPIView(generics.ListAPIView):
     serializer_class = TaskListSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     pagination_class = ProjectPagination  
 
+    def get_project_queryset(self):
+        user = self.request.user
+        return (
+            Project.objects
+            .select_related('created_by')
+            .prefetch_related('members__user')
+            .filter(slug=self.kwargs.get('slug'), is_deleted=False)
+            .filter(models.Q(created_by=user) | models.Q(members__user=user))
+            .distinct()
+        )
+
+    def get_task_queryset(self, project):
+        queryset = (
+            Task.objects
+            .select_related('project')
+            .prefetch_related('assigned_to__user')
+            .filter(project=project, is_deleted=False)
+        )
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+
+        return queryset.order_by('-created_at')
+
     def get_queryset(self):
         user = self.request.user
         project_slug = self.kwargs.get('slug')
-        status_filter = self.request.query_params.get('status')
         try:
-            project = (
-                Project.objects
-                .select_related('created_by')  
-                .prefetch_related('members__user')  
-                .filter(slug=project_slug, is_deleted=False)
-                .filter(models.Q(created_by=user) | models.Q(members__user=user))
-                .distinct()
-                .first()
-            )
+            project = self.get_project_queryset().first()
 
             if not project:
-                logger.warning(f"User {user.email} attempted to access tasks for project {project_slug} without permission")
+                logger.warning("User %s attempted to access tasks for project %s without permission", user.email, project_slug)
                 return Task.objects.none()
 
-            queryset = (
-                Task.objects
-                .select_related('project')  
-                .prefetch_related('assigned_to__user')  
-                .filter(project=project, is_deleted=False)
-            )
-
-            if status_filter:
-                queryset = queryset.filter(status=status_filter)
-
-            return queryset.order_by('-created_at')
+            return self.get_task_queryset(project)
 
         except Exception as e:
-            logger.error(f"Error fetching tasks for project {project_slug}: {e}")
+            logger.error("Error fetching tasks for project %s: %s", project_slug, e)
             return Task.objects.none()
 
     def list(self, request, *args, **kwargs):
         user = request.user
         project_slug = self.kwargs.get('slug')
         cache_key = f"task_list:{user.id}:{project_slug}:{request.get_full_path()}"
+        encoding = cached_encoding(request)
+        compressed_key = variant_key(cache_key, encoding) if encoding else None
 
         try:
             try:
-                cached_data = cache.get(cache_key)
+                cached = cache.get_many([key for key in (compressed_key, cache_key) if key])
             except Exception as cache_error:
-                logger.warning(f"Cache get failed for key {cache_key}: {cache_error}")
-                cached_data = None
+                logger.warning("Cache get failed for key %s: %s", cache_key, cache_error)
+                cached = {}
 
+            if compressed_key in cached:
+                record_cache('task_list', 'compressed')
+                logger.debug("Serving compressed task list for project %s and user %s from cache", project_slug, user.email)
+                return precompressed_response(cached[compressed_key], encoding)
+
+            cached_data = cached.get(cache_key)
             if cached_data:
-                logger.debug(f"Serving task list for project {project_slug} and user {user.email} from cache")
-                return Response(cached_data)
+                record_cache('task_list', 'hit')
+                logger.debug("Serving task list for project %s and user %s from cache", project_slug, user.email)
+                return cache_compressed(Response(cached_data), cache_key, 60 * 5)
 
             # Fetch from DB (normal flow)
-            logger.debug(f"Fetching task list for project: {project_slug} and user: {user.email}")
+            record_cache('task_list', 'miss')
+            logger.debug("Fetching task list for project: %s and user: %s", project_slug, user.email)
             response = super().list(request, *args, **kwargs)
 
             # Try setting cache but ignore cache errors
             try:
                 cache.set(cache_key, response.data, timeout=60 * 5)
             except Exception as cache_error:
-                logger.warning(f"Cache set failed for key {cache_key}: {cache_error}")
+                logger.warning("Cache set failed for key %s: %s", cache_key, cache_error)
 
-            return response
+            return cache_compressed(response, cache_key, 60 * 5)
 
         except Exception as e:
-            logger.exception(f"Unexpected error listing tasks for project {project_slug} and user {user.email}: {e}")
+            logger.exception("Unexpected error listing tasks for project %s and user %s: %s", project_slug, user.email, e)
             return build_response(
                 False,
                 "Failed to retrieve tasks. Please try again later.",
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+class TaskImportAPIView(generics.GenericAPIView):
+    """
+    Stream a CSV/NDJSON upload of tasks into a project.
+    Pass async=true to hand the chunks to Celery workers and poll the status endpoint.
+    """
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @manager_required
+    def post(self, request, slug, *args, **kwargs):
+        logger.debug("Task import request for project %s by %s", slug, request.user.email)
+        project = get_object_or_404(Project, slug=slug)
+
+        invalid_response = validate_project_access(project, request.user, "import tasks")
+        if invalid_response:
+            return invalid_response
+
+        upload = request.FILES.get('file')
+        if not upload:
+            return build_response(False, errors="No file provided for import.", status_code=status.HTTP_400_BAD_REQUEST)
+
+        run_async = str(request.data.get('async', '')).lower() in ('1', 'true', 'yes')
+
+        try:
+            file_format = detect_format(upload.name, request.data.get('file_format'))
+            progress = TaskImport(project, user=request.user).run(upload.file, file_format, run_async=run_async)
+
+            if run_async:
+                logger.info("Task import %s queued for project '%s'", progress['import_id'], project.name)
+                return build_response(True, "Task import started.", data=progress, status_code=status.HTTP_202_ACCEPTED)
+
+            logger.info("Task import %s finished for project '%s': %s created", progress['import_id'], project.name, progress['created'])
+            return build_response(True, f"{progress['created']} tasks imported.", data=progress, status_code=status.HTTP_201_CREATED)
+
+        except ImportFormatError as e:
+            logger.warning("Rejected task import for project %s: %s", slug, e)
+            return build_response(False, errors=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logger.exception("Unexpected error during task import for project %s: %s", slug, e)
+            return build_response(False, errors="Failed to import tasks.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class TaskImportStatusAPIView(generics.GenericAPIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @manager_required
+    def get(self, request, slug, import_id, *args, **kwargs):
+        project = get_object_or_404(Project, slug=slug)
+
+        invalid_response = validate_project_access(project, request.user, "view task imports")
+        if invalid_response:
+            return invalid_response
+
+        progress = get_progress(import_id)
+        if not progress or progress['project_id'] != project.id:
+            return build_response(False, errors="Import not found.", status_code=status.HTTP_404_NOT_FOUND)
+
+        return build_response(True, "Import status retrieved successfully.", data=progress, status_code=status.HTTP_200_OK)
+
+
+class TaskExportAPIView(generics.GenericAPIView):
+    """Stream every task of a project as CSV (default) or NDJSON (?file_format=ndjson)."""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, slug, *args, **kwargs):
+        logger.debug("Task export request for project %s by %s", slug, request.user.email)
+
+        try:
+            project = get_object_or_404(Project, slug=slug)
+
+            invalid_response = validate_project_member_access(project, request.user, "export tasks")
+            if invalid_response:
+                return invalid_response
+
+            file_format = request.query_params.get('file_format', 'csv').lower()
+            if file_format not in EXPORT_FORMATS:
+                return build_response(
+                    False,
+                    errors=f"Unsupported export format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}.",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+            response = StreamingHttpResponse(stream_tasks(project, file_format), content_type=EXPORT_FORMATS[file_format])
+            response['Content-Disposition'] = f'attachment; filename="{project.slug}-tasks.{file_format}"'
+
+            logger.info("Task export (%s) for project '%s' started by %s", file_format, project.name, request.user.email)
+            return response
+
+        except Exception as e:
+            logger.exception("Unexpected error during task export for project %s: %s", slug, e)
+            return build_response(False, errors="Failed to export tasks.", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class ProjectMembersAPIView(generics.ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request, slug):
@@ -590,11 +886,11 @@ class ProjectMembersAPIView(generics.ListAPIView):
             )
 
         except Exception as e:
-            logger.exception(f"Error fetching project members for {slug}: {e}")
+            logger.exception("Error fetching project members for %s: %s", slug, e)
             return build_response(False, "Failed to retrieve project members", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class ContributorSkillAPIView(generics.GenericAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SkillSerializer
 
@@ -612,7 +908,7 @@ class ContributorSkillAPIView(generics.GenericAPIView):
                 status_code=status.HTTP_200_OK
             )
         except Exception as e:
-            logger.error(f"Error fetching skills: {str(e)}")
+            logger.error("Error fetching skills: %s", e)
             return build_response(success=False, errors=str(e))
 
     def post(self, request):
@@ -630,11 +926,11 @@ class ContributorSkillAPIView(generics.GenericAPIView):
             )
 
         except ValidationError as e:
-            logger.warning(f"Validation error in ContributorSkillAPIView (POST): {e}")
+            logger.warning("Validation error in ContributorSkillAPIView (POST): %s", e)
             return build_response(success=False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Unexpected error in ContributorSkillAPIView (POST): {str(e)}")
+            logger.error("Unexpected error in ContributorSkillAPIView (POST): %s", e)
             return build_response(success=False, errors=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def patch(self, request):
@@ -659,9 +955,9 @@ class ContributorSkillAPIView(generics.GenericAPIView):
             )
 
         except ValidationError as e:
-            logger.warning(f"Validation error in ContributorSkillAPIView (PATCH): {e}")
+            logger.warning("Validation error in ContributorSkillAPIView (PATCH): %s", e)
             return build_response(success=False, errors=e.detail, status_code=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Unexpected error in ContributorSkillAPIView (PATCH): {str(e)}")
+            logger.error("Unexpected error in ContributorSkillAPIView (PATCH): %s", e)
             return build_response(success=False, errors=str(e), status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
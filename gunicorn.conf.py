@@ -0,0 +1,7 @@
+# Loaded automatically by gunicorn from the working directory; command-line flags still apply.
+
+
+def on_starting(server):
+    # Before workers fork: drop request metrics left by this container's previous run.
+    from project_tracker.utils.metrics import clear_process_files
+    clear_process_files()
@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_tracker.settings')
 
@@ -8,10 +9,25 @@ app = Celery('project_tracker')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def clear_metrics_files(**kwargs):
+    # Before the pool forks: drop task metrics left by this container's previous run.
+    from project_tracker.utils.metrics import clear_process_files
+    clear_process_files()
+
 app.conf.beat_schedule = {
     'check-daily-notifications-midnight': {
         'task': 'api.tasks.check_daily_notifications',
-        'schedule': crontab(hour=0, minute=0),  # Daily at midnight
+        'schedule': crontab(hour=0, minute=0),  # Daily at midnight (reconciliation when the scheduler is on)
+    },
+    'dispatch-due-items': {
+        'task': 'api.tasks.dispatch_due_items',
+        'schedule': 60.0,  # Every minute: pop due entries from the due-date index
+    },
+    'purge-expired-otps': {
+        'task': 'users.tasks.purge_expired_otps',
+        'schedule': crontab(minute=15),  # Hourly: drop expired EmailOTP rows
     },
 }
 
@@ -30,7 +30,7 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ["*"]
 
@@ -54,6 +54,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'project_tracker.utils.metrics.MetricsMiddleware',
+    'project_tracker.utils.profiling.ProfilingMiddleware',
+    'project_tracker.utils.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -63,6 +67,20 @@ MIDDLEWARE = [
 ]
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Response compression (project_tracker/utils/compression.py)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))             # Bytes; smaller bodies go out as is
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 5))    # 0-11; mid levels suit per-request compression
+
+# Prometheus metrics on /metrics (project_tracker/utils/metrics.py); PROMETHEUS_MULTIPROC_DIR aggregates across processes
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')       # When set, scrapes must send "Authorization: Bearer <token>"
+
+# On-demand profiling (project_tracker/utils/profiling.py; inspect with `manage.py profiles`)
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0.0))     # Fraction of requests profiled
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')                         # "X-Profile-Request: <token>" profiles one request
+PROFILING_DIR = Path(os.getenv('PROFILING_DIR', BASE_DIR / 'profiles'))
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', 100))           # Oldest profiles are removed beyond this
+
 ROOT_URLCONF = 'project_tracker.urls'
 TEMPLATES = [
     {
@@ -97,6 +115,11 @@ DATABASES = {
     }
 }
 
+# Slow query log for the default database (project_tracker/utils/slow_queries.py; report with `manage.py slow_queries`)
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))                      # Threshold; 0 turns the log off
+SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', str(DEBUG)) == 'True'   # EXPLAIN (ANALYZE, BUFFERS) slow SELECTs; off in production
+SLOW_QUERY_RETENTION = int(os.getenv('SLOW_QUERY_RETENTION', 7 * 24 * 3600)) # Seconds an aggregate survives without new samples
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -116,6 +139,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Argon2id first; the others stay so existing hashes verify and get upgraded on login
+PASSWORD_HASHERS = [
+    'users.hashers.TrackerArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))   # KiB per hash
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 2))
+
+# Password hashing pool (users/hashing.py), per web process
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', 2))
+PASSWORD_HASHING_QUEUE_SIZE = int(os.getenv('PASSWORD_HASHING_QUEUE_SIZE', 16))
+PASSWORD_HASHING_WAIT = float(os.getenv('PASSWORD_HASHING_WAIT', 2))            # Seconds to wait for a slot
+PASSWORD_HASHING_RETRY_AFTER = int(os.getenv('PASSWORD_HASHING_RETRY_AFTER', 2))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -134,6 +175,17 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / "frontend"]
 STATIC_ROOT=BASE_DIR / "staticfiles"
 
+# collectstatic fingerprints and gzip/brotli-compresses every file; WhiteNoise serves them from
+# the app process, hashed names with a one-year immutable Cache-Control
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+WHITENOISE_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', 3600))   # Seconds, for files without a hash in the name
+
+# Frontend pages rendered once per deploy by `manage.py build_pages` (project_tracker/utils/pages.py)
+PRERENDERED_PAGES_ROOT = BASE_DIR / "prerendered"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -141,20 +193,33 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Token-bucket rates (project_tracker/utils/throttling.py): '<view throttle_scope>_<ip|email|user>'
+    'DEFAULT_THROTTLE_RATES': {
+        'otp_send_ip': os.getenv('THROTTLE_OTP_SEND_IP', '20/hour'),
+        'otp_send_email': os.getenv('THROTTLE_OTP_SEND_EMAIL', '5/hour'),
+        'otp_verify_ip': os.getenv('THROTTLE_OTP_VERIFY_IP', '60/hour'),
+        'otp_verify_email': os.getenv('THROTTLE_OTP_VERIFY_EMAIL', '10/hour'),
+        'login_ip': os.getenv('THROTTLE_LOGIN_IP', '30/min'),
+        'login_email': os.getenv('THROTTLE_LOGIN_EMAIL', '10/min'),
+        'invite_user': os.getenv('THROTTLE_INVITE_USER', '30/hour'),
+    },
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES')) if os.getenv('NUM_PROXIES') else None,
 }
 
 #Authenetication user root part
 AUTH_USER_MODEL = 'users.CustomUser'
 
 #Emailauthentication
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Use django.core.mail.backends.filebased.EmailBackend or .console.EmailBackend locally/in tests
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
 EMAIL_HOST =  os.getenv('EMAIL_HOST')
-EMAIL_PORT = int(os.getenv('EMAIL_PORT'))
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
@@ -162,11 +227,44 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 EMAIL_TOKEN_MAX_AGE = 300        
 
+# Email OTPs (users/otp_store.py): 'redis' keeps hashed codes with a native TTL, 'db' uses the EmailOTP table
+OTP_BACKEND = os.getenv('OTP_BACKEND', 'redis')
+OTP_TTL_SECONDS = int(os.getenv('OTP_TTL_SECONDS', 300))
+OTP_MAX_ATTEMPTS = int(os.getenv('OTP_MAX_ATTEMPTS', 5))          # Wrong guesses before the code is discarded
+OTP_PURGE_BATCH_SIZE = int(os.getenv('OTP_PURGE_BATCH_SIZE', 10000))
+
+# Streaming task import/export (api/importers.py, api/exporters.py)
+TASK_IMPORT_CHUNK_SIZE = int(os.getenv('TASK_IMPORT_CHUNK_SIZE', 1000))
+TASK_EXPORT_CHUNK_SIZE = int(os.getenv('TASK_EXPORT_CHUNK_SIZE', 2000))     # Rows per server-side cursor fetch
+
+# Nightly overdue sweep (api/tasks.py): ids per parallel chunk
+OVERDUE_SWEEP_CHUNK_SIZE = int(os.getenv('OVERDUE_SWEEP_CHUNK_SIZE', 10000))
+
+# Event-driven due-date scheduler (api/scheduler.py); the midnight job becomes a reconciliation pass
+DUE_SCHEDULER_ENABLED = os.getenv('DUE_SCHEDULER_ENABLED', 'True') == 'True'
+DUE_SCHEDULER_BATCH_SIZE = int(os.getenv('DUE_SCHEDULER_BATCH_SIZE', 500))     # Entries popped per batch
+DUE_SCHEDULER_MAX_BATCHES = int(os.getenv('DUE_SCHEDULER_MAX_BATCHES', 20))    # Batches per dispatch run
+DUE_INDEX_HORIZON_DAYS = int(os.getenv('DUE_INDEX_HORIZON_DAYS', 3))           # Only items due this soon are indexed
+
+# Notification ledger (api/ledger.py): overdue items are re-notified only on these days past due
+OVERDUE_RENOTIFY_DAYS = [int(days) for days in os.getenv('OVERDUE_RENOTIFY_DAYS', '1,3,7').split(',') if days.strip()]
+NOTIFICATION_LEDGER_RETENTION_DAYS = int(os.getenv('NOTIFICATION_LEDGER_RETENTION_DAYS', 30))
+NOTIFICATION_LEDGER_PURGE_BATCH_SIZE = int(os.getenv('NOTIFICATION_LEDGER_PURGE_BATCH_SIZE', 10000))
+
+# Outbound mail queue (project_tracker/utils/mailer.py)
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 50))           # Messages sent per connection/Celery task
+MAIL_RETRY_BACKOFF = int(os.getenv('MAIL_RETRY_BACKOFF', 30))     # Seconds before the first retry, doubled each time
+MAIL_RETRY_BACKOFF_MAX = int(os.getenv('MAIL_RETRY_BACKOFF_MAX', 900))
+
 
 
 LOG_DIR = BASE_DIR / 'logs'
 LOG_DIR.mkdir(exist_ok=True)
 
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG' if DEBUG else 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')                                 # 'json' or 'text'
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))     # Fraction of tracker_logger DEBUG records kept
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -177,21 +275,38 @@ LOGGING = {
             'style': '{',
             'datefmt': '%Y-%m-%d %H:%M:%S',
         },
+        'json': {
+            '()': 'project_tracker.utils.log.JSONFormatter',
+        },
+    },
+
+    'filters': {
+        'sample_debug': {
+            '()': 'project_tracker.utils.log.SamplingFilter',
+            'rate': LOG_DEBUG_SAMPLE_RATE,
+            'level': 'DEBUG',
+        },
     },
 
     'handlers': {
         'file': {
             'class': 'logging.FileHandler',
             'filename': LOG_DIR / 'project_tracker.log',
-            'formatter': 'detailed',
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'detailed',
             'level': 'DEBUG',
         },
+        # Callers only enqueue; a background thread formats and writes to 'file'
+        'queue': {
+            '()': 'project_tracker.utils.log.QueueListenerHandler',
+            'handlers': ['file'],
+        },
     },
 
     'loggers': {
         'tracker_logger': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
+            'filters': ['sample_debug'],
             'propagate': False,
         },
     },
@@ -203,13 +318,22 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),   # Access token valid for 15 minutes
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),      # Refresh token valid for 7 days
     "ROTATE_REFRESH_TOKENS": True,                    # Rotate on refresh for better security
-    "BLACKLIST_AFTER_ROTATION": True,                 # Blacklist old refresh token after rotation
+    "BLACKLIST_AFTER_ROTATION": False,                # Rotated tokens are revoked in Redis instead (users/token_store.py)
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TrackerTokenRefreshSerializer",
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,               
     "AUTH_HEADER_TYPES": ("Bearer",),                
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# Stateless JWT auth (users/authentication.py): how long token versions are cached
+TOKEN_VERSION_CACHE_TTL = int(os.getenv('TOKEN_VERSION_CACHE_TTL', 300))   # Redis, cleared on change
+TOKEN_VERSION_LOCAL_TTL = int(os.getenv('TOKEN_VERSION_LOCAL_TTL', 5))     # Per process; bounds revocation lag
+
+# ASGI deployment (docker-compose "asgi" profile): serve the read-heavy views from api/async_views.py
+ASYNC_API_VIEWS = os.getenv('ASYNC_API_VIEWS', 'False') == 'True'
+ASYNC_REDIS_POOL_KWARGS = {'max_connections': int(os.getenv('ASYNC_REDIS_MAX_CONNECTIONS', 50))}   # Per event loop
+
 BASE_URL = os.getenv('BASE_URL', 'http://127.0.0.1:8000')
 
 
@@ -230,3 +354,44 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Kolkata'
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False') == 'True'   # Run tasks inline (tests/local)
+CELERY_IMPORTS = ['project_tracker.utils.mailer']
+CELERY_TASK_IGNORE_RESULT = True        # Fire-and-forget by default; chord header tasks opt back in
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv('CELERY_WORKER_PREFETCH_MULTIPLIER', 1))
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),  # Redis priorities 0 (first) .. 9
+    'queue_order_strategy': 'priority',
+}
+
+# Dedicated queues (project_tracker/utils/queues.py); priority 0 is served first
+CELERY_TASK_ROUTES = {
+    'api.tasks.dispatch_due_items': {'queue': 'sweeps', 'priority': 0},
+    'api.tasks.sweep_overdue_projects': {'queue': 'sweeps', 'priority': 6},
+    'api.tasks.sweep_task_range': {'queue': 'sweeps', 'priority': 6},
+    'api.tasks.check_*': {'queue': 'sweeps', 'priority': 3},
+    'api.tasks.finish_*': {'queue': 'sweeps', 'priority': 3},
+    'api.tasks.send_*': {'queue': 'notifications'},
+    'api.tasks.reconcile_due_index': {'queue': 'maintenance'},
+    'api.tasks.purge_notification_ledger': {'queue': 'maintenance'},
+    'users.tasks.purge_expired_otps': {'queue': 'maintenance'},
+    'project_tracker.utils.mailer.send_email_batch': {'queue': 'mail'},
+}
+
+# Per-task rate limits (per worker instance) to protect the database and the SMTP relay
+NOTIFICATION_RATE_LIMIT = os.getenv('NOTIFICATION_RATE_LIMIT', '120/m')
+CELERY_TASK_ANNOTATIONS = {
+    'project_tracker.utils.mailer.send_email_batch': {'rate_limit': os.getenv('MAIL_RATE_LIMIT', '30/m')},
+    'api.tasks.send_task_notifications': {'rate_limit': NOTIFICATION_RATE_LIMIT},
+    'api.tasks.send_project_overdue_notification': {'rate_limit': NOTIFICATION_RATE_LIMIT},
+    'api.tasks.send_task_due_today_notification': {'rate_limit': NOTIFICATION_RATE_LIMIT},
+    'api.tasks.send_task_overdue_notification': {'rate_limit': NOTIFICATION_RATE_LIMIT},
+}
+
+# Producer backpressure: fan-out loops pause while a queue is deeper than its limit (0 disables)
+QUEUE_MAX_DEPTH = {
+    'notifications': int(os.getenv('NOTIFICATIONS_QUEUE_MAX_DEPTH', 5000)),
+    'mail': int(os.getenv('MAIL_QUEUE_MAX_DEPTH', 2000)),
+}
+QUEUE_BACKPRESSURE_CHECK_EVERY = int(os.getenv('QUEUE_BACKPRESSURE_CHECK_EVERY', 100))  # Messages between depth checks
+QUEUE_BACKPRESSURE_POLL = int(os.getenv('QUEUE_BACKPRESSURE_POLL', 2))                  # Seconds between polls
+QUEUE_BACKPRESSURE_MAX_WAIT = int(os.getenv('QUEUE_BACKPRESSURE_MAX_WAIT', 300))        # Give up waiting after this
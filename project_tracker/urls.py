@@ -9,8 +9,8 @@ For more details, see:
 
 from django.contrib import admin
 from django.urls import path, include
-from django.views.generic import TemplateView
-from django.contrib.staticfiles.urls import staticfiles_urlpatterns
+from project_tracker.utils.metrics import metrics_view
+from project_tracker.utils.pages import PageView
 
 
 urlpatterns = [
@@ -21,12 +21,14 @@ urlpatterns = [
     path('api/', include('api.urls')),                # Project, Tasks, Invites
     path('api/auth/', include('users.urls')),         # Authentication, OTP, Login
 
+    # ---------------------- MONITORING ------------------------
+    path('metrics', metrics_view, name='metrics'),    # Prometheus scrape
+
     # ---------------------- FRONTEND PAGES --------------------
-    path('', TemplateView.as_view(template_name='index.html')),
-    path('projects/', TemplateView.as_view(template_name='projects.html'), name='projects_html'),
-    path('invite_register/', TemplateView.as_view(template_name='invite_register.html'), name='invite-register-page'),
-    path('tasks/', TemplateView.as_view(template_name='tasks.html'), name='tasks'),
+    path('', PageView.as_view(template_name='index.html')),
+    path('projects/', PageView.as_view(template_name='projects.html'), name='projects_html'),
+    path('invite_register/', PageView.as_view(template_name='invite_register.html'), name='invite-register-page'),
+    path('tasks/', PageView.as_view(template_name='tasks.html'), name='tasks'),
 ]
 
-# ---------------------- STATIC FILES ---------------------------
-urlpatterns += staticfiles_urlpatterns()
+# Static files are served by WhiteNoiseMiddleware (see STORAGES in settings).
@@ -0,0 +1,46 @@
+"""
+Async access to the default Redis cache for ASGI views.
+
+Keys and values go through django-redis's own make_key/encode/decode, so an
+entry written here is the same entry cache.get()/cache.set() see, and the
+existing delete_pattern/iter_keys invalidation keeps working. Only the I/O
+differs: it runs on a redis.asyncio client instead of a thread-pool hop
+through Django's default cache.aget().
+
+redis.asyncio connections belong to the event loop that opened them, so one
+client (with its own pool) is kept per running loop.
+"""
+import asyncio
+import weakref
+from django.conf import settings
+from django.core.cache import cache
+from redis import asyncio as aioredis
+
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(settings.CACHES['default']['LOCATION'], **settings.ASYNC_REDIS_POOL_KWARGS)
+        _clients[loop] = client
+    return client
+
+
+async def aget(key, default=None):
+    value = await get_async_redis().get(cache.client.make_key(key))
+    return default if value is None else cache.client.decode(value)
+
+
+async def aget_many(keys):
+    values = await get_async_redis().mget([cache.client.make_key(key) for key in keys])
+    return {key: cache.client.decode(value) for key, value in zip(keys, values) if value is not None}
+
+
+async def aset(key, value, timeout):
+    await get_async_redis().set(cache.client.make_key(key), cache.client.encode(value), ex=timeout)
+
+
+async def adelete(key):
+    await get_async_redis().delete(cache.client.make_key(key))
@@ -0,0 +1,118 @@
+"""
+Async DRF views for the ASGI deployment.
+
+AsyncAPIViewMixin gives an APIView an async dispatch() that authenticates
+with the authenticator's aauthenticate() when it has one (awaiting Redis on
+the event loop) and awaits coroutine handlers. Sync handlers on the same
+view (e.g. a PATCH next to an async GET) still work; they run through
+sync_to_async like any sync view under ASGI. Permission checks are plain
+function calls, so views doing I/O in has_permission() should stay sync.
+
+AsyncListModelMixin.alist() is ListModelMixin.list() for a given queryset.
+
+AsyncPaginationMixin adds apaginate_queryset() to a PageNumberPagination
+subclass: the same page numbers, links and response shape, with the count
+and page fetched through the async ORM.
+"""
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.paginator import InvalidPage, Page
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+
+class AsyncAPIViewMixin:
+    # Handlers may mix async and sync methods; dispatch() is always async.
+    view_is_async = True
+
+    async def perform_aauthentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.perform_aauthentication(request)
+        self.check_permissions(request)
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncPaginationMixin:
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        if page_number in self.last_page_strings:
+            page_number = paginator.num_pages
+
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        bottom = (number - 1) * page_size
+        objects = [obj async for obj in queryset[bottom:bottom + page_size]]
+        self.page = Page(objects, number, paginator)
+        return objects
+
+
+class AsyncListModelMixin:
+    async def alist(self, queryset):
+        page = await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        objects = [obj async for obj in queryset]
+        return Response(self.get_serializer(objects, many=True).data)
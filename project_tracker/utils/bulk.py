@@ -0,0 +1,59 @@
+import io
+from django.db import connection
+
+
+def copy_supported():
+    """COPY is only used on PostgreSQL through psycopg2 (the driver pinned in requirements)."""
+    return connection.vendor == 'postgresql' and connection.Database.__name__ == 'psycopg2'
+
+
+def _copy_literal(value):
+    # Unquoted empty field is NULL in COPY's CSV format, a quoted one is ''.
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
+def bulk_insert(model, objs, fields=None, batch_size=None):
+    """
+    Insert unsaved instances with PostgreSQL COPY when available, otherwise
+    with bulk_create. Neither path sends model signals.
+
+    COPY does not populate primary keys on `objs`, so callers that need ids
+    must re-select the rows (e.g. by a unique slug). Only scalar columns are
+    supported on the COPY path.
+    """
+    if not objs:
+        return 0
+
+    if not copy_supported():
+        model.objects.bulk_create(objs, batch_size=batch_size)
+        return len(objs)
+
+    opts = model._meta
+    if fields is None:
+        fields = [field for field in opts.concrete_fields if not field.primary_key]
+    else:
+        fields = [opts.get_field(name) for name in fields]
+
+    buffer = io.StringIO()
+    for obj in objs:
+        row = (
+            _copy_literal(field.get_db_prep_save(field.pre_save(obj, add=True), connection))
+            for field in fields
+        )
+        buffer.write(','.join(row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    sql = f"COPY {connection.ops.quote_name(opts.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+    return len(objs)
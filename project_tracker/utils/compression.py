@@ -0,0 +1,193 @@
+"""
+Negotiated response compression.
+
+CompressionMiddleware compresses text-like responses (HTML, JSON, CSV, JS,
+CSS, SVG) of at least COMPRESSION_MIN_SIZE bytes with brotli or gzip,
+whichever the client's Accept-Encoding prefers. Brotli is used only when the
+Brotli package is installed. Streaming responses, sync or async, are
+compressed chunk by chunk and flushed after each chunk, so exports still
+reach the client incrementally.
+
+Cached list views can also cache the compressed body: mark the response with
+cache_compressed() and the middleware stores the bytes it produced under
+"<cache key>:<encoding>". The next hit sends them back with
+precompressed_response(), skipping both rendering and compression. Variant
+keys extend the list key, so the existing pattern invalidation clears them too.
+"""
+import logging
+import re
+import zlib
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered.
+    brotli = None
+
+logger = logging.getLogger('tracker_logger')
+
+GZIP_MAX_RANDOM_BYTES = 100     # BREACH mitigation, as in django.middleware.gzip
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+_q_value = re.compile(r'q\s*=\s*([0-9.]+)')
+
+
+def supported_encodings():
+    """Encodings this server can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(request):
+    """The supported encoding with the highest q-value in Accept-Encoding, or None."""
+    weights = {}
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        match = _q_value.search(params)
+        try:
+            weights[coding] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            weights[coding] = 0.0
+
+    best, best_q = None, 0.0
+    for coding in supported_encodings():
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return compress_string(data, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def process(self, chunk):
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def variant_key(cache_key, encoding):
+    return f"{cache_key}:{encoding}"
+
+
+def cached_encoding(request):
+    """Encoding whose cached variant a list view may serve for this DRF request, or None."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    if renderer is None or renderer.format != 'json':
+        return None
+    return negotiate_encoding(request)
+
+
+def cache_compressed(response, cache_key, timeout):
+    """Ask CompressionMiddleware to cache the compressed body under cache_key's variant."""
+    response.compressed_cache_key = cache_key
+    response.compressed_cache_timeout = timeout
+    return response
+
+
+def precompressed_response(body, encoding):
+    response = HttpResponse(body, content_type='application/json')
+    response.headers['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not is_compressible(response):
+            return response
+        # Small bodies are not worth the CPU or the header overhead.
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # The compressed size is only known once the stream ends.
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            self.store_variant(response, encoding)
+
+        # Compressed bytes differ from the original, so a strong ETag becomes weak.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def store_variant(response, encoding):
+        cache_key = getattr(response, 'compressed_cache_key', None)
+        if not cache_key or response.status_code != 200:
+            return
+        if not response.get('Content-Type', '').startswith('application/json'):
+            return
+        try:
+            cache.set(variant_key(cache_key, encoding), response.content, timeout=response.compressed_cache_timeout)
+        except Exception as cache_error:
+            logger.warning("Cache set failed for compressed variant of %s: %s", cache_key, cache_error)
@@ -1,8 +1,12 @@
-
 from django.utils.text import slugify
 import random
 import string
 
+
+def _random_suffix(length):
+    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
 def generate_secure_slug(instance, field_name: str, slug_field: str = 'slug', length: int = 6):
     """
     Generate a unique, readable but secure slug.
@@ -12,12 +16,43 @@ def generate_secure_slug(instance, field_name: str, slug_field: str = 'slug', le
     base_slug = slugify(base_value)
     
     # Generate a short random suffix (6 chars)
-    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+    suffix = _random_suffix(length)
     slug = f"{base_slug}-{suffix}"
 
     ModelClass = instance.__class__
     while ModelClass.objects.filter(**{slug_field: slug}).exists():
-        suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
+        suffix = _random_suffix(length)
         slug = f"{base_slug}-{suffix}"
 
     return slug
+
+
+def generate_unique_slugs(model, values, slug_field: str = 'slug', length: int = 6):
+    """
+    Bulk variant of generate_secure_slug for many instances at once.
+    Checks candidates with one query per round instead of one per instance
+    and trims the readable part so the slug fits the column.
+    Returns slugs in the same order as `values`.
+    """
+    max_length = model._meta.get_field(slug_field).max_length
+    bases = [slugify(value)[:max_length - length - 1].rstrip('-') for value in values]
+    slugs = [None] * len(values)
+    used = set()
+    pending = list(range(len(values)))
+
+    while pending:
+        candidates = {}
+        for index in pending:
+            slug = f"{bases[index]}-{_random_suffix(length)}"
+            if slug not in used and slug not in candidates:
+                candidates[slug] = index
+
+        taken = set(model.objects.filter(**{f"{slug_field}__in": list(candidates)}).values_list(slug_field, flat=True))
+        for slug, index in candidates.items():
+            if slug not in taken:
+                slugs[index] = slug
+                used.add(slug)
+
+        pending = [index for index in pending if slugs[index] is None]
+
+    return slugs
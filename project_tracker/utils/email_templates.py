@@ -0,0 +1,85 @@
+"""
+Email template rendering for notification workers.
+
+Each template under frontend/ is loaded and compiled once per worker process
+and kept with its top-level static text pre-joined, so a render only walks
+the dynamic nodes. render_many() renders one template for many contexts
+through a single Context, which is what digest and bulk sends use.
+
+Output matches render_to_string(name, context) without a request (no
+context processors). Call clear_template_cache() after editing a template
+in a long-running process.
+"""
+from functools import lru_cache
+from django.template import Context
+from django.template.base import TextNode
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode
+from django.utils.safestring import SafeString
+
+
+class EmailTemplate:
+    """A compiled template whose top-level static fragments are pre-rendered."""
+
+    def __init__(self, name):
+        self.name = name
+        self.template = get_template(name).template
+        self.parts = self._compile(self.template.nodelist)
+
+    @staticmethod
+    def _compile(nodelist):
+        # Inheritance resolves blocks at render time; keep those templates as they are.
+        if any(isinstance(node, ExtendsNode) for node in nodelist):
+            return None
+
+        parts = []
+        for node in nodelist:
+            if isinstance(node, TextNode):
+                if parts and isinstance(parts[-1], str):
+                    parts[-1] += node.s
+                else:
+                    parts.append(node.s)
+            else:
+                parts.append(node)
+        return parts
+
+    def _render(self, context):
+        if self.parts is None:
+            return self.template._render(context)
+        return ''.join(
+            part if isinstance(part, str) else str(part.render_annotated(context))
+            for part in self.parts
+        )
+
+    def render(self, context=None):
+        return self.render_many([context or {}])[0]
+
+    def render_many(self, contexts):
+        context = Context(autoescape=self.template.engine.autoescape)
+        context.template_name = self.name
+        rendered = []
+
+        with context.bind_template(self.template):
+            for values in contexts:
+                with context.render_context.push_state(self.template), context.push(values):
+                    rendered.append(SafeString(self._render(context)))
+        return rendered
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name):
+    return EmailTemplate(name)
+
+
+def clear_template_cache():
+    get_email_template.cache_clear()
+
+
+def render_email(name, context=None):
+    """Drop-in replacement for render_to_string(name, context) for email templates."""
+    return get_email_template(name).render(context)
+
+
+def render_many(name, contexts):
+    """Render `name` once per context, in order."""
+    return get_email_template(name).render_many(contexts)
@@ -0,0 +1,119 @@
+"""
+Logging plumbing for LOGGING in settings.
+
+QueueListenerHandler is what the application loggers write to. It renders
+the message in the caller (cheap %-formatting, and args such as model
+instances are only touched in the thread that owns them) and puts the record
+on an in-process queue. A QueueListener thread then does the JSON/text
+formatting and the file I/O, so a request never waits on the disk. The
+listener starts on first use in each process, which also covers Celery's
+forked pool workers, and drains the queue when logging shuts down.
+
+JSONFormatter writes one JSON object per line; values passed with `extra=`
+become top-level fields. SamplingFilter keeps a fraction of a logger's
+records at or below a level (DEBUG by default), for chatty debug events.
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`.
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'source': f"{record.filename}:{record.lineno}",
+            'process': record.process,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RESERVED_ATTRS)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Pass only `rate` (0..1) of the records at or below `level`; higher levels always pass."""
+
+    def __init__(self, rate=1.0, level='DEBUG'):
+        super().__init__()
+        self.rate = float(rate)
+        self.level = logging.getLevelName(level) if isinstance(level, str) else level
+
+    def filter(self, record):
+        return record.levelno > self.level or self.rate >= 1 or random.random() < self.rate
+
+
+def _handler_by_name(name):
+    getter = getattr(logging, 'getHandlerByName', None)     # Python 3.12+
+    return getter(name) if getter else logging._handlers.get(name)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hands records to a background QueueListener that feeds the handlers named
+    in `handlers`, which are other handlers of the same LOGGING config.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        self.targets = []
+        for name in handlers:
+            target = _handler_by_name(name)
+            if target is None:
+                # dictConfig retries handlers that fail with this message once the rest exist.
+                raise ValueError(f"Handler '{name}': target not configured yet")
+            self.targets.append(target)
+        self.respect_handler_level = respect_handler_level
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        # Threads do not survive fork(): start a listener in each process that logs.
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(self.queue, *self.targets, respect_handler_level=self.respect_handler_level)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Render the message here, in the thread that owns the args; the listener only formats.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def close(self):
+        # logging.shutdown() closes handlers newest first, so the queue drains before 'file' closes.
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+        self.listener = None
+        self._pid = None
+        super().close()
@@ -0,0 +1,119 @@
+"""
+Outbound mail service.
+
+Request handlers and notification tasks never talk to SMTP directly: they
+build plain-dict messages and enqueue them on the dedicated ``mail`` Celery
+queue. A mail worker sends each batch over a single ``get_connection()`` and
+retries only the messages that failed, with exponential backoff.
+
+Interactive mail (OTPs, invitations) is sent with PRIORITY_INTERACTIVE so it
+overtakes queued notification digests on the same queue.
+"""
+from smtplib import SMTPException
+import logging
+import time
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from .queues import MAIL_QUEUE, queue_depth, throttled
+
+logger = logging.getLogger('tracker_logger')
+
+METRICS_KEY_PREFIX = 'mail_metrics'
+
+# Redis priority steps: lower is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 6
+
+
+def build_message(subject, body, to, html_body=None, from_email=None):
+    """Return a JSON-serialisable message accepted by enqueue_emails()."""
+    return {
+        'subject': subject,
+        'body': body,
+        'to': list(to),
+        'html_body': html_body,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+    }
+
+
+def enqueue_emails(messages, priority=PRIORITY_BULK):
+    """
+    Queue messages for delivery, MAIL_BATCH_SIZE messages per Celery task.
+    Large bulk fan-outs pause while the mail queue is deeper than its limit;
+    interactive mail is sent from a request and never waits.
+    """
+    batch_size = settings.MAIL_BATCH_SIZE
+    batches = range(0, len(messages), batch_size)
+    if priority != PRIORITY_INTERACTIVE:
+        batches = throttled(batches, MAIL_QUEUE)
+    for start in batches:
+        send_email_batch.apply_async(args=[messages[start:start + batch_size]], priority=priority)
+    logger.debug("Enqueued %s email(s) on the '%s' queue", len(messages), MAIL_QUEUE)
+
+
+def enqueue_email(subject, body, to, html_body=None, from_email=None, priority=PRIORITY_BULK):
+    enqueue_emails([build_message(subject, body, to, html_body=html_body, from_email=from_email)], priority=priority)
+
+
+def _to_email_message(message, connection):
+    email = EmailMultiAlternatives(
+        subject=message['subject'],
+        body=message['body'],
+        from_email=message['from_email'],
+        to=message['to'],
+        connection=connection,
+    )
+    if message.get('html_body'):
+        email.attach_alternative(message['html_body'], "text/html")
+    return email
+
+
+def _record_metrics(sent, failed, elapsed):
+    try:
+        for name, amount in (('sent', sent), ('failed', failed), ('batches', 1)):
+            key = f"{METRICS_KEY_PREFIX}:{name}"
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, amount)
+        cache.set(f"{METRICS_KEY_PREFIX}:last_batch_seconds", round(elapsed, 4), timeout=None)
+    except Exception as e:
+        logger.warning("Failed to record mail metrics: %s", e)
+
+
+def mail_metrics():
+    """Counters for delivered/failed mail, last batch latency and current queue depth."""
+    names = ['sent', 'failed', 'batches', 'last_batch_seconds']
+    values = cache.get_many([f"{METRICS_KEY_PREFIX}:{name}" for name in names])
+    metrics = {name: values.get(f"{METRICS_KEY_PREFIX}:{name}", 0) for name in names}
+    metrics['queue_depth'] = queue_depth(MAIL_QUEUE)
+    return metrics
+
+
+@shared_task(bind=True, max_retries=5)
+def send_email_batch(self, messages):
+    """Send a batch of queued messages over one SMTP connection."""
+    started = time.monotonic()
+    failed = []
+
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for message in messages:
+                try:
+                    connection.send_messages([_to_email_message(message, connection)])
+                except (SMTPException, OSError) as e:
+                    logger.warning("Failed to send '%s' to %s: %s", message['subject'], message['to'], e)
+                    failed.append(message)
+    except (SMTPException, OSError) as e:
+        logger.error("Could not open mail connection: %s", e)
+        failed = messages
+
+    elapsed = time.monotonic() - started
+    _record_metrics(len(messages) - len(failed), len(failed), elapsed)
+    logger.info("Mail batch done: %s sent, %s failed in %.3fs", len(messages) - len(failed), len(failed), elapsed)
+
+    if failed:
+        countdown = min(settings.MAIL_RETRY_BACKOFF_MAX, settings.MAIL_RETRY_BACKOFF * 2 ** self.request.retries)
+        raise self.retry(args=[failed], countdown=countdown)
+
+    return len(messages)
@@ -0,0 +1,278 @@
+"""
+Prometheus metrics, served as text on /metrics.
+
+MetricsMiddleware records per-route request latency, status codes and the
+time spent in database queries. Routes are labelled with the URL name from
+api/urls.py and users/urls.py, so /api/projects/<slug>/task_list/ is a single
+"project-task-list" series, not one per project. List views count cache
+hits and misses with record_cache(), and Celery signals record every task's
+duration and outcome.
+
+Gunicorn workers and Celery pool processes are separate processes. When
+PROMETHEUS_MULTIPROC_DIR is set, each process writes its samples to mmap
+files in that directory and /metrics sums them, so one scrape covers all
+workers. The web and worker containers share the directory through a volume;
+file names carry the hostname as well as the pid, so processes in different
+containers never write to the same file. gunicorn.conf.py and the Celery
+worker_init hook clear a container's old files when it starts.
+
+Without PROMETHEUS_MULTIPROC_DIR (runserver, tests) the metrics stay in the
+process that serves the scrape.
+
+Mail delivery counters already live in Redis (see mailer._record_metrics).
+They and the Celery queue depths are read when /metrics is scraped.
+"""
+import glob
+import hmac
+import logging
+import os
+import re
+import socket
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, values
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+logger = logging.getLogger('tracker_logger')
+
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+HOSTNAME = socket.gethostname().replace('_', '-')   # '_' separates the fields of a metrics file name
+KNOWN_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+
+def process_identifier():
+    return f"{HOSTNAME}-{os.getpid()}"
+
+
+def clear_process_files():
+    """Remove this host's metrics files; call once at startup, before workers fork."""
+    if not MULTIPROC_DIR:
+        return
+    # Exact owner only: a glob on "web-*" would also take web-asgi's live files.
+    owned = re.compile(rf"_{re.escape(HOSTNAME)}-\d+\.db$")
+    for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+        if owned.search(os.path.basename(path)):
+            os.remove(path)
+
+
+if MULTIPROC_DIR:
+    # Must happen before the metrics below are created.
+    values.ValueClass = values.MultiProcessValue(process_identifier)
+
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to produce a response, by route.',
+    ['route', 'method'],
+)
+REQUESTS = Counter(
+    'http_requests', 'Responses sent, by route and status code.',
+    ['route', 'method', 'status'],
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', 'Time spent in database queries per request, by route.',
+    ['route'],
+)
+REQUEST_DB_QUERIES = Counter(
+    'http_request_db_queries', 'Database queries run while serving requests, by route.',
+    ['route'],
+)
+CACHE_LOOKUPS = Counter(
+    'list_cache_lookups', "List view cache lookups; result is 'compressed', 'hit' or 'miss'.",
+    ['cache', 'result'],
+)
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds', 'Celery task run time, by task.',
+    ['task'],
+    buckets=(.01, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+TASKS = Counter(
+    'celery_tasks', "Celery task runs, by task and final state (success, failure, retry).",
+    ['task', 'state'],
+)
+
+
+def record_cache(cache_name, result):
+    CACHE_LOOKUPS.labels(cache_name, result).inc()
+
+
+# ---------------------------------------------------------------- DB time --
+
+class QueryTimer:
+    __slots__ = ('seconds', 'queries')
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.queries = 0
+
+
+# Set by track_queries() for the duration of a request. sync_to_async copies the
+# context into its thread, so queries run by async views are counted as well.
+_query_timer = ContextVar('query_timer', default=None)
+
+
+@contextmanager
+def track_queries():
+    """Count and time the queries run in this context; yields the QueryTimer."""
+    timer = QueryTimer()
+    token = _query_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _query_timer.reset(token)
+
+
+def time_query(execute, sql, params, many, context):
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += perf_counter() - start
+        timer.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    # connection_created fires on every reconnect of the same wrapper object.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+connection_created.connect(install_query_timer, dispatch_uid='metrics_query_timer')
+
+
+# ------------------------------------------------------------- middleware --
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name if match.url_name else f"/{match.route}"
+
+
+@lru_cache(maxsize=1024)
+def request_series(route, method, status):
+    """The labelled children for one route/method/status; .labels() is too slow to repeat per request."""
+    return (
+        REQUEST_LATENCY.labels(route, method),
+        REQUESTS.labels(route, method, str(status)),
+        REQUEST_DB_TIME.labels(route),
+        REQUEST_DB_QUERIES.labels(route),
+    )
+
+
+def observe_request(request, response, elapsed, timer):
+    method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+    latency, requests, db_time, db_queries = request_series(route_name(request), method, response.status_code)
+    latency.observe(elapsed)
+    requests.inc()
+    db_time.observe(timer.seconds)
+    if timer.queries:
+        db_queries.inc(timer.queries)
+
+
+class MetricsMiddleware:
+    """
+    Times each request through the rest of the middleware stack and the view.
+    Streaming responses are timed up to the first byte, not the last.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = perf_counter()
+        with track_queries() as timer:
+            response = self.get_response(request)
+        observe_request(request, response, perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        start = perf_counter()
+        with track_queries() as timer:
+            response = await self.get_response(request)
+        observe_request(request, response, perf_counter() - start, timer)
+        return response
+
+
+# ----------------------------------------------------------------- Celery --
+
+_task_started = {}
+
+
+@task_prerun.connect(dispatch_uid='metrics_task_prerun')
+def task_started(task_id=None, **kwargs):
+    _task_started[task_id] = perf_counter()
+
+
+@task_postrun.connect(dispatch_uid='metrics_task_postrun')
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    start = _task_started.pop(task_id, None)
+    if start is not None:
+        TASK_DURATION.labels(task.name).observe(perf_counter() - start)
+    TASKS.labels(task.name, (state or 'unknown').lower()).inc()
+
+
+# ------------------------------------------------------------------ scrape --
+
+class BrokerMetricsCollector:
+    """Mail counters from Redis and Celery queue depths, read at scrape time."""
+
+    def collect(self):
+        from .mailer import mail_metrics
+        from .queues import MAIL_QUEUE, MAINTENANCE_QUEUE, NOTIFICATIONS_QUEUE, SWEEPS_QUEUE, queue_depth
+
+        try:
+            mail = mail_metrics()
+        except Exception as e:
+            logger.warning("Could not read mail metrics: %s", e)
+        else:
+            yield CounterMetricFamily('mail_sent', 'Emails delivered.', value=mail['sent'])
+            yield CounterMetricFamily('mail_failed', 'Emails that failed a delivery attempt.', value=mail['failed'])
+            yield CounterMetricFamily('mail_batches', 'Mail batches sent.', value=mail['batches'])
+            yield GaugeMetricFamily('mail_last_batch_seconds', 'Duration of the last mail batch.', value=mail['last_batch_seconds'])
+
+        # queue_depth() returns None when the broker cannot be read; such queues are left out
+        # rather than failing the whole scrape, and celery_broker_up reports the outage.
+        depth = GaugeMetricFamily('celery_queue_depth', 'Messages waiting on a Celery queue.', labels=['queue'])
+        broker_up = 1
+        for queue_name in ('celery', SWEEPS_QUEUE, NOTIFICATIONS_QUEUE, MAIL_QUEUE, MAINTENANCE_QUEUE):
+            messages = queue_depth(queue_name)
+            if messages is None:
+                broker_up = 0
+                continue
+            depth.add_metric([queue_name], messages)
+        yield depth
+        yield GaugeMetricFamily('celery_broker_up', 'Whether the Celery broker could be read (1) or not (0).', value=broker_up)
+
+
+broker_registry = CollectorRegistry(auto_describe=False)
+broker_registry.register(BrokerMetricsCollector())
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry) + generate_latest(broker_registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,99 @@
+"""
+Pre-rendered frontend pages.
+
+The SPA pages under frontend/ are static: they take no context, and all data
+comes from the API. `manage.py build_pages` renders each one once per deploy
+into PRERENDERED_PAGES_ROOT and writes .gz and .br copies next to it (at
+maximum compression, since it happens once) plus a manifest of content
+hashes. PageView sends the variant that matches Accept-Encoding, with a
+content-hash ETag for cheap 304 revalidation. The page URLs themselves are
+not fingerprinted, so browsers still revalidate them.
+
+When no build exists (local development), PageView renders the template on
+every request, like the TemplateView it replaces. Rebuild after editing a page.
+"""
+import gzip
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+from django.views.generic import TemplateView
+from .compression import brotli, negotiate_encoding
+
+logger = logging.getLogger('tracker_logger')
+
+PAGE_TEMPLATES = ('index.html', 'projects.html', 'invite_register.html', 'tasks.html')
+MANIFEST_NAME = 'pages.json'
+VARIANT_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+
+def build_pages(output_dir=None):
+    """Render every page and its compressed variants; returns the manifest written."""
+    output_dir = output_dir or settings.PRERENDERED_PAGES_ROOT
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+
+    for name in PAGE_TEMPLATES:
+        body = render_to_string(name).encode()
+        variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(body, quality=11)
+
+        (output_dir / name).write_bytes(body)
+        for encoding, data in variants.items():
+            (output_dir / (name + VARIANT_SUFFIXES[encoding])).write_bytes(data)
+
+        manifest[name] = {
+            'etag': hashlib.sha256(body).hexdigest()[:20],
+            'encodings': sorted(variants),
+        }
+
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    load_pages.cache_clear()
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def load_pages():
+    """{template name: (etag, {encoding or None: bytes})} from the last build, or {} if there is none."""
+    root = settings.PRERENDERED_PAGES_ROOT
+    try:
+        manifest = json.loads((root / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return {}
+
+    pages = {}
+    for name, entry in manifest.items():
+        variants = {None: (root / name).read_bytes()}
+        for encoding in entry['encodings']:
+            variants[encoding] = (root / (name + VARIANT_SUFFIXES[encoding])).read_bytes()
+        pages[name] = (entry['etag'], variants)
+    logger.info("Serving %s pre-rendered pages from %s", len(pages), root)
+    return pages
+
+
+class PageView(TemplateView):
+    def get(self, request, *args, **kwargs):
+        page = load_pages().get(self.template_name)
+        if page is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, variants = page
+        etag = f'W/"{etag}"'
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponseNotModified()
+        else:
+            encoding = negotiate_encoding(request)
+            encoding = encoding if encoding in variants else None
+            response = HttpResponse(variants[encoding], content_type='text/html; charset=utf-8')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
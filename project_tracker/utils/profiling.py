@@ -0,0 +1,235 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware is off unless PROFILING_ENABLED is set. It profiles a
+request when either:
+  - the request sends "X-Profile-Request: <PROFILING_TOKEN>", in which case
+    the response carries the profile id in X-Profile-Id, or
+  - it is picked by PROFILING_SAMPLE_RATE (0..1).
+
+A profiled request runs under cProfile. Every SQL statement it executes is
+recorded with its duration, and its cache calls (django-redis, the async
+Redis helpers, and raw Redis commands) are totalled from the profile. Each profile is
+written to PROFILING_DIR as <id>.prof (pstats data) and <id>.json (request,
+SQL and cache summary). The directory is a ring: once it holds more than
+PROFILING_MAX_FILES profiles, the oldest are removed.
+
+`manage.py profiles` lists them, and `manage.py profiles <id>` summarizes one.
+
+cProfile follows a single thread. Under ASGI, the event loop thread is
+profiled; ORM work that sync_to_async moves to another thread shows up as
+time spent waiting for it, though its SQL is still recorded. Only one async
+request per process is profiled at a time, because others share the loop.
+"""
+import cProfile
+import hmac
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger('tracker_logger')
+
+PROFILE_HEADER = 'X-Profile-Request'
+MAX_SQL_ENTRIES = 1000          # Per profile; further statements are only counted
+# (module path suffix, label, functions counted; None = every public one)
+CACHE_FUNCTIONS = (
+    ('django_redis/cache.py', 'cache', None),
+    ('project_tracker/utils/async_cache.py', 'async_cache', None),
+    ('redis/client.py', 'redis', {'execute_command', 'execute'}),            # Every round trip, raw clients included
+    ('redis/asyncio/client.py', 'redis', {'execute_command', 'execute'}),
+)
+
+_profile = ContextVar('request_profile', default=None)
+_sequence = itertools.count()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.sql = []
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+    def add_query(self, sql, seconds, many):
+        self.sql_count += 1
+        self.sql_seconds += seconds
+        if len(self.sql) < MAX_SQL_ENTRIES:
+            self.sql.append({'sql': sql, 'ms': round(seconds * 1000, 3), 'many': many})
+
+
+def record_query(execute, sql, params, many, context):
+    profile = _profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, perf_counter() - start, many)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# ------------------------------------------------------------------ storage --
+
+def profile_dir():
+    return settings.PROFILING_DIR
+
+
+def list_profiles():
+    """Metadata of the stored profiles, newest first."""
+    root = profile_dir()
+    if not root.exists():
+        return []
+    entries = []
+    for path in sorted(root.glob('*.json'), reverse=True):
+        try:
+            entries.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue    # Removed by another process, or still being written
+    return entries
+
+
+def cache_calls(stats):
+    """{'cache.get': {'calls': n, 'ms': total}, ...} from a profiler's stats."""
+    calls = {}
+    for (filename, _, name), (_, ncalls, _, cumtime, _) in stats.items():
+        filename = filename.replace(os.sep, '/')
+        for suffix, label, names in CACHE_FUNCTIONS:
+            if filename.endswith(suffix) and (name in names if names else not name.startswith(('_', '<')) and name != 'client'):
+                break
+        else:
+            continue
+        entry = calls.setdefault(f"{label}.{name}", {'calls': 0, 'ms': 0.0})
+        entry['calls'] += ncalls
+        entry['ms'] = round(entry['ms'] + cumtime * 1000, 3)
+    return calls
+
+
+def save_profile(profiler, profile, request, response, elapsed, trigger):
+    root = profile_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{int(time.time() * 1000)}-{os.getpid()}-{next(_sequence)}"
+
+    profiler.dump_stats(root / f"{profile_id}.prof")     # Also fills profiler.stats
+    match = getattr(request, 'resolver_match', None)
+    metadata = {
+        'id': profile_id,
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'trigger': trigger,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': match.view_name if match else None,
+        'status': response.status_code,
+        'ms': round(elapsed * 1000, 3),
+        'sql_count': profile.sql_count,
+        'sql_ms': round(profile.sql_seconds * 1000, 3),
+        'sql': profile.sql,
+        'cache': cache_calls(profiler.stats),
+    }
+    (root / f"{profile_id}.json").write_text(json.dumps(metadata))
+    prune_profiles(root)
+    return profile_id
+
+
+def prune_profiles(root):
+    for path in sorted(root.glob('*.json'), reverse=True)[settings.PROFILING_MAX_FILES:]:
+        for stale in (path, path.with_suffix('.prof')):
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# --------------------------------------------------------------- middleware --
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._async_busy = False
+        connection_created.connect(install_query_recorder, dispatch_uid='profiling_query_recorder')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(None, connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def trigger(request):
+        token = settings.PROFILING_TOKEN
+        header = request.headers.get(PROFILE_HEADER)
+        if header and token and hmac.compare_digest(header, token):
+            return 'header'
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sample'
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trigger = self.trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        profiler, profile = cProfile.Profile(), RequestProfile()
+        try:
+            profiler.enable()
+        except ValueError:      # Another profiler is already active
+            return self.get_response(request)
+        token = _profile.set(profile)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            _profile.reset(token)
+        return self.finish(profiler, profile, request, response, perf_counter() - start, trigger)
+
+    async def __acall__(self, request):
+        trigger = self.trigger(request)
+        if trigger is None or self._async_busy:
+            return await self.get_response(request)
+
+        profiler, profile = cProfile.Profile(), RequestProfile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return await self.get_response(request)
+        self._async_busy = True
+        token = _profile.set(profile)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.disable()
+            _profile.reset(token)
+            self._async_busy = False
+        return self.finish(profiler, profile, request, response, perf_counter() - start, trigger)
+
+    @staticmethod
+    def finish(profiler, profile, request, response, elapsed, trigger):
+        try:
+            profile_id = save_profile(profiler, profile, request, response, elapsed, trigger)
+        except Exception as e:
+            logger.warning("Failed to save profile for %s: %s", request.path, e)
+            return response
+        logger.info("Profiled %s %s in %.1f ms (%s)", request.method, request.path, elapsed * 1000, profile_id)
+        if trigger == 'header':
+            response.headers['X-Profile-Id'] = profile_id
+        return response
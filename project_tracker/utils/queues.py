@@ -0,0 +1,73 @@
+"""
+Celery queue helpers.
+
+Work is split across dedicated queues (see CELERY_TASK_ROUTES): 'sweeps' for
+the overdue/due-date passes, 'notifications' for building notifications,
+'mail' for SMTP delivery and 'maintenance' for cache/index upkeep. Producers
+that fan out many messages wrap their loop in throttled() so they pause while
+the target queue is deeper than QUEUE_MAX_DEPTH instead of flooding it.
+"""
+from kombu.exceptions import ChannelError
+import logging
+import time
+from django.conf import settings
+
+logger = logging.getLogger('tracker_logger')
+
+SWEEPS_QUEUE = 'sweeps'
+NOTIFICATIONS_QUEUE = 'notifications'
+MAIL_QUEUE = 'mail'
+MAINTENANCE_QUEUE = 'maintenance'
+
+
+def queue_depth(queue_name):
+    """
+    Return the number of messages waiting on a Celery queue.
+    An empty queue does not exist on the Redis broker, so it reports 0.
+    """
+    from project_tracker.celery import app
+
+    try:
+        with app.connection_for_read() as connection:
+            return connection.default_channel.queue_declare(queue=queue_name, passive=True).message_count
+    except ChannelError:
+        return 0
+    except Exception as e:
+        logger.warning("Could not read depth of queue '%s': %s", queue_name, e)
+        return None
+
+
+def wait_for_capacity(queue_name, max_depth=None):
+    """
+    Block while `queue_name` holds more than max_depth messages, polling every
+    QUEUE_BACKPRESSURE_POLL seconds for at most QUEUE_BACKPRESSURE_MAX_WAIT.
+    Returns the number of seconds spent waiting.
+    """
+    max_depth = settings.QUEUE_MAX_DEPTH.get(queue_name) if max_depth is None else max_depth
+    if not max_depth or settings.CELERY_TASK_ALWAYS_EAGER:
+        return 0
+
+    waited = 0
+    while waited < settings.QUEUE_BACKPRESSURE_MAX_WAIT:
+        depth = queue_depth(queue_name)
+        if depth is None or depth <= max_depth:
+            break
+        logger.info("Queue '%s' holds %s messages (max %s); pausing producer", queue_name, depth, max_depth)
+        time.sleep(settings.QUEUE_BACKPRESSURE_POLL)
+        waited += settings.QUEUE_BACKPRESSURE_POLL
+    else:
+        logger.warning("Queue '%s' still deep after %ss; continuing anyway", queue_name, waited)
+
+    return waited
+
+
+def throttled(items, queue_name):
+    """
+    Yield items, checking the depth of `queue_name` every
+    QUEUE_BACKPRESSURE_CHECK_EVERY items (small fan-outs never pay for a check).
+    """
+    check_every = settings.QUEUE_BACKPRESSURE_CHECK_EVERY
+    for count, item in enumerate(items):
+        if count and count % check_every == 0:
+            wait_for_capacity(queue_name)
+        yield item
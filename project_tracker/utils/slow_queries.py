@@ -0,0 +1,222 @@
+"""
+Slow query log for the default database.
+
+Every statement on the `default` connection runs through log_slow_query(), an
+execute_wrapper installed when the connection opens. A statement that takes
+at least SLOW_QUERY_MS milliseconds is:
+
+  - normalized: literals, placeholders and IN/VALUES lists collapse to "?" and
+    "(...)", so the same query with different arguments has one fingerprint;
+  - attributed to the project code that issued it (e.g. api/views.py:186 in
+    get_queryset), not to the ORM frame underneath;
+  - logged as a tracker_logger warning, with duration_ms, fingerprint and
+    call_site as extra fields for the JSON log;
+  - aggregated in Redis by fingerprint (count, total, max, call sites), so
+    every gunicorn and Celery process adds to the same table. Entries expire
+    SLOW_QUERY_RETENTION seconds after they were last seen.
+
+When SLOW_QUERY_EXPLAIN is on (the default outside production), the first
+slow run of each SELECT fingerprint in a process is re-run under
+EXPLAIN (ANALYZE, BUFFERS) inside a savepoint, and the plan is stored with
+the aggregate. ANALYZE executes the query a second time, which is why it is
+opt-in for production and is never used for writes.
+
+`manage.py slow_queries` shows the worst offenders, and
+`manage.py slow_queries <fingerprint>` shows one query's plan.
+"""
+import hashlib
+import logging
+import re
+import sys
+import time
+from contextvars import ContextVar
+from time import perf_counter
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django_redis import get_redis_connection
+
+logger = logging.getLogger('tracker_logger')
+
+SLOW_QUERY_KEY_PREFIX = "project_tracker:slow_queries"
+INDEX_KEY = f"{SLOW_QUERY_KEY_PREFIX}:index"
+EXPLAIN_PREFIXES = {'postgresql': 'EXPLAIN (ANALYZE, BUFFERS)'}
+MAX_EXPLAINED = 1000            # Fingerprints remembered per process
+# Wrappers that sit between the caller and this one; never reported as call sites.
+INSTRUMENTATION_FILES = (
+    'project_tracker/utils/slow_queries.py',
+    'project_tracker/utils/metrics.py',
+    'project_tracker/utils/profiling.py',
+)
+
+# KEYS[1] = entry, KEYS[2] = call sites, KEYS[3] = index
+# ARGV = fingerprint, duration ms, normalized sql, call site, now, retention seconds, plan ('' = none)
+RECORD_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], 'count', 1)
+local total = redis.call('HINCRBYFLOAT', KEYS[1], 'total_ms', ARGV[2])
+local max = tonumber(redis.call('HGET', KEYS[1], 'max_ms') or '0')
+if tonumber(ARGV[2]) > max then
+    redis.call('HSET', KEYS[1], 'max_ms', ARGV[2])
+end
+redis.call('HSET', KEYS[1], 'sql', ARGV[3], 'last_seen', ARGV[5])
+if ARGV[7] ~= '' then
+    redis.call('HSET', KEYS[1], 'plan', ARGV[7])
+end
+redis.call('HINCRBY', KEYS[2], ARGV[4], 1)
+redis.call('ZADD', KEYS[3], total, ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('EXPIRE', KEYS[2], ARGV[6])
+redis.call('EXPIRE', KEYS[3], ARGV[6])
+return total
+"""
+
+_string_literal = re.compile(r"'(?:[^']|'')*'")
+_number = re.compile(r"\b\d+(?:\.\d+)?\b")
+_value_list = re.compile(r"\((?:\s*\?\s*,)*\s*\?\s*\)")
+_repeated_lists = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_whitespace = re.compile(r"\s+")
+
+_explaining = ContextVar('explaining_slow_query', default=False)
+_explained = set()
+_script = None
+
+
+def normalize(sql):
+    sql = _string_literal.sub('?', sql)
+    sql = _number.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _value_list.sub('(...)', sql)
+    sql = _repeated_lists.sub('(...)', sql)
+    return _whitespace.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def call_site():
+    """The innermost project frame outside the ORM and the DB instrumentation."""
+    root = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and 'site-packages' not in filename and not filename.endswith(INSTRUMENTATION_FILES):
+            return f"{filename[len(root) + 1:]}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+def explain(connection, sql, params):
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip()[:6].upper() == 'SELECT':
+        return None
+    token = _explaining.set(True)
+    try:
+        # A savepoint keeps a failed EXPLAIN from breaking the caller's transaction.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+    except Exception as e:
+        logger.warning("EXPLAIN of slow query failed: %s", e)
+        return None
+    finally:
+        _explaining.reset(token)
+
+
+def record_slow_query(connection, sql, params, seconds, succeeded):
+    normalized = normalize(sql)
+    key = fingerprint(normalized)
+    site = call_site()
+    duration_ms = round(seconds * 1000, 2)
+
+    plan = None
+    if succeeded and settings.SLOW_QUERY_EXPLAIN and key not in _explained and len(_explained) < MAX_EXPLAINED:
+        _explained.add(key)
+        plan = explain(connection, sql, params)
+
+    logger.warning(
+        "Slow query (%.1f ms) at %s [%s]: %s", duration_ms, site, key, normalized,
+        extra={'duration_ms': duration_ms, 'fingerprint': key, 'call_site': site, 'plan': plan},
+    )
+
+    global _script
+    try:
+        if _script is None:
+            _script = get_redis_connection("default").register_script(RECORD_SCRIPT)
+        _script(
+            keys=[f"{SLOW_QUERY_KEY_PREFIX}:{key}", f"{SLOW_QUERY_KEY_PREFIX}:{key}:sites", INDEX_KEY],
+            args=[key, duration_ms, normalized, site, int(time.time()), settings.SLOW_QUERY_RETENTION, plan or ''],
+        )
+    except Exception as e:
+        logger.warning("Failed to record slow query %s: %s", key, e)
+
+
+def log_slow_query(execute, sql, params, many, context):
+    if _explaining.get():
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    succeeded = False
+    try:
+        result = execute(sql, params, many, context)
+        succeeded = True
+        return result
+    finally:
+        seconds = perf_counter() - start
+        if seconds * 1000 >= settings.SLOW_QUERY_MS:
+            record_slow_query(context['connection'], sql, None if many else params, seconds, succeeded and not many)
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    if connection.alias != 'default' or not settings.SLOW_QUERY_MS:
+        return
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+connection_created.connect(install_slow_query_log, dispatch_uid='slow_query_log')
+
+
+# ------------------------------------------------------------------ reports --
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def slow_queries():
+    """Every recorded fingerprint with its stats and call sites."""
+    client = get_redis_connection("default")
+    keys = [_decode(key) for key in client.zrange(INDEX_KEY, 0, -1)]
+    with client.pipeline() as pipe:
+        for key in keys:
+            pipe.hgetall(f"{SLOW_QUERY_KEY_PREFIX}:{key}")
+            pipe.hgetall(f"{SLOW_QUERY_KEY_PREFIX}:{key}:sites")
+        results = pipe.execute()
+
+    entries = []
+    for key, entry, sites in zip(keys, results[::2], results[1::2]):
+        if not entry:
+            client.zrem(INDEX_KEY, key)     # Expired
+            continue
+        entry = {_decode(field): _decode(value) for field, value in entry.items()}
+        count, total_ms = int(entry['count']), float(entry['total_ms'])
+        entries.append({
+            'fingerprint': key,
+            'sql': entry['sql'],
+            'count': count,
+            'total_ms': total_ms,
+            'mean_ms': total_ms / count,
+            'max_ms': float(entry['max_ms']),
+            'last_seen': int(entry['last_seen']),
+            'plan': entry.get('plan'),
+            'call_sites': sorted(((_decode(site), int(n)) for site, n in sites.items()), key=lambda item: -item[1]),
+        })
+    return entries
+
+
+def reset_slow_queries():
+    client = get_redis_connection("default")
+    keys = list(client.scan_iter(f"{SLOW_QUERY_KEY_PREFIX}:*"))
+    if keys:
+        client.delete(*keys)
+    return len(keys)
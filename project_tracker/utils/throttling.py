@@ -0,0 +1,132 @@
+"""
+Redis token-bucket throttles for DRF views.
+
+Each bucket holds up to N tokens and refills continuously at N per period,
+for a rate of "N/period" in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] (same
+syntax as DRF's own throttles). Refill and take run in one Lua script, so a
+check costs a single round trip and is atomic across gunicorn workers. The
+script reads the clock from Redis, so web nodes never disagree about time.
+
+Views name their scope with `throttle_scope`. Each throttle class appends its
+own suffix to find the rate, e.g. 'otp_send' + IPTokenBucketThrottle ->
+'otp_send_ip'. A scope without a configured rate is not throttled. Denied
+requests get DRF's 429 response with a Retry-After header.
+"""
+import hashlib
+import logging
+import math
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+logger = logging.getLogger('tracker_logger')
+
+THROTTLE_KEY_PREFIX = "project_tracker:throttle"
+
+# KEYS[1] = bucket, ARGV[1] = capacity, ARGV[2] = tokens per second
+# Returns {allowed (0/1), seconds until a token is available}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+_script = None
+
+
+def take_token(key, capacity, per_seconds):
+    """Take one token from bucket `key`; returns (allowed, wait_seconds)."""
+    global _script
+    if _script is None:
+        _script = get_redis_connection("default").register_script(TOKEN_BUCKET_SCRIPT)
+    allowed, wait = _script(keys=[key], args=[capacity, capacity / per_seconds])
+    return bool(allowed), float(wait)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class: subclasses set `suffix` and implement get_ident_key()."""
+    suffix = None
+    parse_rate = SimpleRateThrottle.parse_rate
+
+    def __init__(self):
+        self._wait = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}_{self.suffix}")
+        capacity, per_seconds = self.parse_rate(rate)
+        if capacity is None:
+            return True
+
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        key = f"{THROTTLE_KEY_PREFIX}:{scope}:{self.suffix}:{ident}"
+        try:
+            allowed, self._wait = take_token(key, capacity, per_seconds)
+        except Exception as e:
+            # Fail open: an unavailable Redis must not lock everyone out.
+            logger.warning("Throttle check for '%s_%s' failed, allowing request: %s", scope, self.suffix, e)
+            return True
+
+        if not allowed:
+            logger.warning("Throttled %s_%s request; retry in %.1fs", scope, self.suffix, self._wait)
+        return allowed
+
+    def wait(self):
+        return math.ceil(self._wait) if self._wait else None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per client IP (honours NUM_PROXIES like DRF's throttles)."""
+    suffix = 'ip'
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per email address in the request body (hashed in the key)."""
+    suffix = 'email'
+
+    def get_ident_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per authenticated user, falling back to the client IP."""
+    suffix = 'user'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        return self.get_ident(request)
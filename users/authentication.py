@@ -0,0 +1,132 @@
+"""
+Stateless JWT authentication.
+
+The request user is a ClaimsUser built from the signed token claims (id,
+email, role, names) instead of a CustomUser row fetched on every request.
+Deactivation, role and email changes bump CustomUser.token_version, and a
+token whose 'ver' claim no longer matches is rejected. Versions are cached in
+Redis (TOKEN_VERSION_CACHE_TTL) and in-process (TOKEN_VERSION_LOCAL_TTL), so a
+change reaches every worker within the local TTL.
+
+aauthenticate() is the same check for async views: the version lookup
+awaits the redis.asyncio client and the async ORM instead of blocking.
+"""
+import logging
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from project_tracker.utils import async_cache
+from .models import ClaimsUser, CustomUser
+from .tokens import TOKEN_VERSION_CLAIM, USER_CLAIMS
+
+logger = logging.getLogger('tracker_logger')
+
+INACTIVE = -1
+_local_versions = {}
+
+
+def _cache_key(user_id):
+    return f"token_version:{user_id}"
+
+
+def get_token_version(user_id):
+    """Current token version for a user, or INACTIVE for missing/deactivated users."""
+    now = time.monotonic()
+    local = _local_versions.get(user_id)
+    if local and local[1] > now:
+        return local[0]
+
+    version = cache.get(_cache_key(user_id))
+    if version is None:
+        row = CustomUser.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        version = row[0] if row and row[1] else INACTIVE
+        cache.set(_cache_key(user_id), version, timeout=settings.TOKEN_VERSION_CACHE_TTL)
+
+    _local_versions[user_id] = (version, now + settings.TOKEN_VERSION_LOCAL_TTL)
+    return version
+
+
+async def aget_token_version(user_id):
+    """Async get_token_version(), sharing the same local and Redis caches."""
+    now = time.monotonic()
+    local = _local_versions.get(user_id)
+    if local and local[1] > now:
+        return local[0]
+
+    version = await async_cache.aget(_cache_key(user_id))
+    if version is None:
+        row = await CustomUser.objects.filter(pk=user_id).values_list('token_version', 'is_active').afirst()
+        version = row[0] if row and row[1] else INACTIVE
+        await async_cache.aset(_cache_key(user_id), version, timeout=settings.TOKEN_VERSION_CACHE_TTL)
+
+    _local_versions[user_id] = (version, now + settings.TOKEN_VERSION_LOCAL_TTL)
+    return version
+
+
+def forget_token_version(user_id):
+    _local_versions.pop(user_id, None)
+    cache.delete(_cache_key(user_id))
+
+
+def revoke_user_tokens(user_id):
+    """Invalidate every JWT issued to the user so far."""
+    CustomUser.objects.filter(pk=user_id).update(token_version=F('token_version') + 1)
+    forget_token_version(user_id)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            # Tokens issued before the claims were added: fall back to the row lookup.
+            return super().get_user(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        return self.build_user(user_id, validated_token, get_token_version(user_id))
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        user_id = self.get_user_id(validated_token)
+        return self.build_user(user_id, validated_token, await aget_token_version(user_id))
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise AuthenticationFailed(_("Token contained no recognizable user identification"), code="token_not_valid")
+
+    @staticmethod
+    def build_user(user_id, validated_token, version):
+        if version == INACTIVE:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token[TOKEN_VERSION_CLAIM] != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_not_valid")
+
+        user = ClaimsUser(
+            id=user_id,
+            is_active=True,
+            **{claim: validated_token.get(claim) or '' for claim in USER_CLAIMS},
+        )
+        user._state.adding = False
+        user._state.db = CustomUser.objects.db
+        return user
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TrackerArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with work factors from settings. Changing ARGON2_* makes
+    must_update() true for older hashes, so they are upgraded on next login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
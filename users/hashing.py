@@ -0,0 +1,98 @@
+"""
+Password hashing off the request thread.
+
+Hashing and verifying passwords (Argon2/PBKDF2) runs on a small per-process
+thread pool: both hashers release the GIL, so a login burst uses at most
+PASSWORD_HASHING_WORKERS cores per web process while the worker's other
+threads keep serving list requests. At most PASSWORD_HASHING_QUEUE_SIZE
+calls wait for the pool; beyond that, callers get PasswordHashingBusy (503)
+instead of piling up behind the burst.
+
+Only the hashing runs on the pool; database reads and the rehash save stay
+on the request thread.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from project_tracker.utils.response_handler import build_response
+
+logger = logging.getLogger('tracker_logger')
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in requests right now. Please retry in a moment."
+    default_code = 'password_hashing_busy'
+
+
+def busy_response(exc):
+    response = build_response(False, errors=str(exc.detail), status_code=exc.status_code)
+    response['Retry-After'] = str(settings.PASSWORD_HASHING_RETRY_AFTER)
+    return response
+
+
+def _pool():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                _slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASHING_QUEUE_SIZE)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor, _slots
+
+
+def run_hashing(func, *args):
+    """Run a CPU-bound hashing call on the bounded pool and wait for its result."""
+    executor, slots = _pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_WAIT):
+        logger.warning("Password hashing pool saturated; rejecting request")
+        raise PasswordHashingBusy()
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(raw_password):
+    return run_hashing(make_password, raw_password)
+
+
+def set_password(user, raw_password):
+    """AbstractBaseUser.set_password() with the hashing offloaded."""
+    user.password = hash_password(raw_password)
+    user._password = raw_password
+
+
+def authenticate_credentials(email, password):
+    """
+    ModelBackend.authenticate() for email/password with the hashing
+    offloaded. Outdated hashes (other algorithm or work factors) are
+    upgraded transparently on a successful login.
+    """
+    User = get_user_model()
+    try:
+        user = User._default_manager.get_by_natural_key(email)
+    except User.DoesNotExist:
+        # Same cost as a real check, so response time does not reveal accounts.
+        hash_password(password)
+        return None
+
+    is_correct, must_update = run_hashing(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        set_password(user, password)
+        user.save(update_fields=['password'])
+        logger.info("Password hash upgraded for %s", user.email)
+    return user
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_emailotp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='notification_mode',
+            field=models.CharField(choices=[('digest', 'Daily Digest'), ('immediate', 'Immediate')], default='digest', max_length=20),
+        ),
+    ]
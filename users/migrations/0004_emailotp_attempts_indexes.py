@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_notification_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailotp',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='emailotp',
+            index=models.Index(fields=['email', '-created_at'], name='emailotp_email_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailotp',
+            index=models.Index(fields=['created_at'], name='emailotp_created_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.conf import settings
 from django.db import models
-import random
+import secrets
 from datetime import timedelta
 from django.utils import timezone
 
@@ -29,7 +30,13 @@ class CustomUser(AbstractUser):
    ]
     username = None
     email = models.EmailField(unique=True, blank=False, null=False)
+    NOTIFICATION_MODE_CHOICES = [
+        ('digest', 'Daily Digest'),
+        ('immediate', 'Immediate'),
+    ]
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='member')
+    notification_mode = models.CharField(max_length=20, choices=NOTIFICATION_MODE_CHOICES, default='digest')
+    token_version = models.PositiveIntegerField(default=0)   # Bumped to invalidate every issued JWT
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []  
 
@@ -37,26 +44,60 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        # token_version only moves through atomic F() updates (users.authentication.revoke_user_tokens);
+        # a full save of an instance loaded earlier must not roll it back.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'token_version'
+            ]
+        super().save(*args, **kwargs)
     
 
 
+class ClaimsUser(CustomUser):
+    """
+    User built from signed JWT claims by StatelessJWTAuthentication, without
+    a database read. Only the claim fields are populated, so it is read-only:
+    load the CustomUser row before changing anything.
+    """
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("ClaimsUser is read-only; load the CustomUser row to save changes.")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("ClaimsUser is read-only; load the CustomUser row to delete it.")
+
+
 
 
 class EmailOTP(models.Model):
+    """Database OTP backend (OTP_BACKEND='db'); the default backend keeps codes in Redis."""
     email = models.EmailField()
     otp = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
     is_used = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['email', '-created_at'], name='emailotp_email_created_idx'),
+            models.Index(fields=['created_at'], name='emailotp_created_idx'),
+        ]
 
-    def is_valid(self, minutes=5):
-        """OTP valid if not used and within `minutes` from creation."""
-        return (not self.is_used) and (timezone.now() < self.created_at + timedelta(minutes=minutes))
+    def is_valid(self, seconds=None):
+        """OTP valid if not used and within OTP_TTL_SECONDS from creation."""
+        seconds = settings.OTP_TTL_SECONDS if seconds is None else seconds
+        return (not self.is_used) and (timezone.now() < self.created_at + timedelta(seconds=seconds))
 
     @staticmethod
     def generate_otp():
-        return f"{random.randint(100000, 999999):06d}"
+        return f"{secrets.randbelow(900000) + 100000:06d}"
 
     def mark_used(self):
         self.is_used = True
         self.save()
-
@@ -0,0 +1,135 @@
+"""
+Email OTP storage.
+
+RedisOTPStore (the default) keeps one hash per email holding an HMAC of the
+code and a wrong-attempts counter, with a native OTP_TTL_SECONDS expiry.
+Verification runs as a single Lua script that compares, counts the attempt
+and consumes the code atomically, so a code can be used exactly once and is
+discarded after OTP_MAX_ATTEMPTS wrong guesses.
+
+DatabaseOTPStore is the fallback (OTP_BACKEND='db') on the EmailOTP table;
+expired rows are removed in batches by users.tasks.purge_expired_otps.
+"""
+import hashlib
+import hmac
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+from .models import EmailOTP
+
+logger = logging.getLogger('tracker_logger')
+
+VERIFIED = 'verified'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+LOCKED = 'locked'
+
+OTP_KEY_PREFIX = "project_tracker:otp"
+
+# KEYS[1] = otp hash, ARGV[1] = code digest, ARGV[2] = max attempts
+VERIFY_SCRIPT = """
+local digest = redis.call('HGET', KEYS[1], 'code')
+if not digest then
+    return 'expired'
+end
+if digest == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 'verified'
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return 'locked'
+end
+return 'invalid'
+"""
+
+
+def _normalize(email):
+    return email.strip().lower()
+
+
+def _digest(email, code):
+    message = f"{_normalize(email)}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+class RedisOTPStore:
+    def __init__(self):
+        self._verify = None
+
+    def _client(self):
+        return get_redis_connection("default")
+
+    def _key(self, email):
+        return f"{OTP_KEY_PREFIX}:{hashlib.sha256(_normalize(email).encode()).hexdigest()}"
+
+    def issue(self, email):
+        """Create a code for `email`, replacing any previous one, and return it."""
+        code = EmailOTP.generate_otp()
+        key = self._key(email)
+        with self._client().pipeline() as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={'code': _digest(email, code), 'attempts': 0})
+            pipe.expire(key, settings.OTP_TTL_SECONDS)
+            pipe.execute()
+        return code
+
+    def verify(self, email, code):
+        if self._verify is None:
+            self._verify = self._client().register_script(VERIFY_SCRIPT)
+        result = self._verify(keys=[self._key(email)], args=[_digest(email, code), settings.OTP_MAX_ATTEMPTS])
+        return result.decode() if isinstance(result, bytes) else result
+
+
+class DatabaseOTPStore:
+    def issue(self, email):
+        code = EmailOTP.generate_otp()
+        EmailOTP.objects.create(email=_normalize(email), otp=code)
+        return code
+
+    def verify(self, email, code):
+        record = EmailOTP.objects.filter(email=_normalize(email)).order_by('-created_at').first()
+
+        if not record or not record.is_valid():
+            return EXPIRED
+        if record.attempts >= settings.OTP_MAX_ATTEMPTS:
+            return LOCKED
+
+        if not hmac.compare_digest(record.otp, str(code)):
+            EmailOTP.objects.filter(pk=record.pk).update(attempts=F('attempts') + 1)
+            return LOCKED if record.attempts + 1 >= settings.OTP_MAX_ATTEMPTS else INVALID
+
+        # Conditional update: only one concurrent request can consume the code.
+        if not EmailOTP.objects.filter(pk=record.pk, is_used=False).update(is_used=True):
+            return EXPIRED
+        return VERIFIED
+
+    @staticmethod
+    def purge(batch_size=None):
+        """Delete rows older than the OTP TTL in id batches; returns the number deleted."""
+        batch_size = batch_size or settings.OTP_PURGE_BATCH_SIZE
+        cutoff = timezone.now() - timedelta(seconds=settings.OTP_TTL_SECONDS)
+        deleted = 0
+
+        while True:
+            ids = list(EmailOTP.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += EmailOTP.objects.filter(id__in=ids).delete()[0]
+
+        return deleted
+
+
+_stores = {'redis': RedisOTPStore, 'db': DatabaseOTPStore}
+_instances = {}
+
+
+def get_otp_store():
+    backend = settings.OTP_BACKEND
+    if backend not in _instances:
+        _instances[backend] = _stores[backend]()
+    return _instances[backend]
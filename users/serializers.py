@@ -1,11 +1,15 @@
-from django.core.mail import send_mail
+from project_tracker.utils.mailer import PRIORITY_INTERACTIVE, enqueue_email
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from project_tracker import settings
-from .models import EmailOTP
+from .otp_store import EXPIRED, LOCKED, VERIFIED, get_otp_store
 from django.core import signing
-from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from .hashing import authenticate_credentials, hash_password
+from .tokens import TOKEN_VERSION_CLAIM, TrackerRefreshToken
+from .authentication import INACTIVE, get_token_version
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 import logging
 logger = logging.getLogger('tracker_logger')
 
@@ -26,26 +30,24 @@ class SendOTPSerializer(serializers.Serializer):
     def create(self, validated_data):
         email = validated_data['email']
         try:
-            otp = EmailOTP.generate_otp()
-            EmailOTP.objects.create(email=email, otp=otp)
-            send_mail(
+            otp = get_otp_store().issue(email)
+            enqueue_email(
                 subject='Login OTP',
-               message = (
+                body=(
                 f"Dear User,\n\n"
                 f"Your One-Time Password (OTP) for verification is: {otp}\n\n"
-                f"This OTP is valid for the next 5 minutes. "
+                f"This OTP is valid for the next {settings.OTP_TTL_SECONDS // 60} minutes. "
                 f"Please do not share this code with anyone.\n\n"
                 f"Best regards,\n"
                 f"Project Tracker Team"
                 ),
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                fail_silently=False,
+                to=[email],
+                priority=PRIORITY_INTERACTIVE,
             )
-            logger.info(f"OTP generated and sent to {email}")
+            logger.info("OTP generated and queued for %s", email)
             return {"email": email}
         except Exception as e:
-            logger.error(f"Failed to send OTP to {email}: {e}", exc_info=True)
+            logger.error("Failed to send OTP to %s: %s", email, e, exc_info=True)
             raise serializers.ValidationError("Failed to send OTP. Please try again later.")
     
 class VerifyOTPSerializer(serializers.Serializer):
@@ -55,20 +57,23 @@ class VerifyOTPSerializer(serializers.Serializer):
     def validate(self, data):
         email = data.get('email')
         otp = data.get('otp')
-        logger.debug(f"Verifying OTP for email: {email}")
+        logger.debug("Verifying OTP for email: %s", email)
 
-        otp_record = EmailOTP.objects.filter(email=email, otp=otp).order_by('-created_at').first()
+        result = get_otp_store().verify(email, otp)
 
-        if not otp_record:
-            logger.warning(f"Invalid OTP attempt for {email}")
-            raise serializers.ValidationError({"otp": "Invalid OTP"})
-
-        if not otp_record.is_valid():
-            logger.warning(f"Expired or used OTP for {email}")
+        if result == EXPIRED:
+            logger.warning("Expired or used OTP for %s", email)
             raise serializers.ValidationError({"otp": "OTP expired or already used"})
 
-        otp_record.mark_used()
-        logger.info(f"OTP marked as used for {email}")
+        if result == LOCKED:
+            logger.warning("Too many OTP attempts for %s", email)
+            raise serializers.ValidationError({"otp": "Too many invalid attempts. Please request a new OTP."})
+
+        if result != VERIFIED:
+            logger.warning("Invalid OTP attempt for %s", email)
+            raise serializers.ValidationError({"otp": "Invalid OTP"})
+
+        logger.info("OTP consumed for %s", email)
 
         token = signing.dumps({'email': email})
         data['email_token'] = token
@@ -110,7 +115,7 @@ class ManagerRegisterSerializer(serializers.ModelSerializer):
             logger.warning("Expired email token")
             raise serializers.ValidationError("Email token has expired.")
         except Exception as e:
-            logger.error(f"Unexpected error during token validation: {e}", exc_info=True)
+            logger.error("Unexpected error during token validation: %s", e, exc_info=True)
             raise serializers.ValidationError("Unable to validate email token.")
 
         # Attach email to validated data
@@ -127,15 +132,13 @@ class ManagerRegisterSerializer(serializers.ModelSerializer):
 
         # Check existence efficiently
         if User.objects.filter(email=email).only('id').exists():
-            logger.warning(f"User with email {email} already exists")
+            logger.warning("User with email %s already exists", email)
             raise serializers.ValidationError("User with this email already exists.")
 
         role = 'manager'
-        user = User.objects.create(email=email, role=role, **validated_data)
-        user.set_password(password)
-        user.save()
+        user = User.objects.create(email=email, role=role, password=hash_password(password), **validated_data)
 
-        logger.info(f"Manager account created successfully for {email}")
+        logger.info("Manager account created successfully for %s", email)
         return user
     
 class LoginSerializer(serializers.Serializer):
@@ -148,14 +151,72 @@ class LoginSerializer(serializers.Serializer):
         if not email or not password:
             logger.warning("Missing email or password in login request")
             raise serializers.ValidationError("Both email and password are required.")
-        user = authenticate(email=email, password=password)
+        user = authenticate_credentials(email, password)
         if not user:
-            logger.warning(f"Invalid credentials for email: {email}")
+            logger.warning("Invalid credentials for email: %s", email)
             raise serializers.ValidationError("Invalid email or password.")
         if not user.is_active:
-            logger.warning(f"Inactive account login attempt for {email}")
+            logger.warning("Inactive account login attempt for %s", email)
             raise serializers.ValidationError("This account is inactive.")
-        refresh = RefreshToken.for_user(user)
-        logger.info(f"User logged in successfully: {email}")
+        refresh = TrackerRefreshToken.for_user(user)
+        logger.info("User logged in successfully: %s", email)
         return {"email": user.email, "role": user.role, "access": str(refresh.access_token), "refresh": str(refresh)}
-    
\ No newline at end of file
+
+
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['notification_mode']
+
+
+class TrackerTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    token/refresh/ without database reads: the user check uses the cached
+    token version, and rotated tokens are revoked in the Redis store.
+    """
+    token_class = TrackerRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        version = get_token_version(user_id) if user_id else INACTIVE
+        if version == INACTIVE:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        if refresh.payload.get(TOKEN_VERSION_CLAIM, version) != version:
+            raise InvalidToken("Token has been revoked")
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if not refresh.blacklist():
+                logger.warning("Refresh token reuse detected for user %s", user_id)
+                raise InvalidToken("Token has already been used")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+    everywhere = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        if data['everywhere']:
+            return data
+        if not data.get('refresh'):
+            raise serializers.ValidationError({"refresh": "Refresh token is required."})
+
+        try:
+            token = TrackerRefreshToken(data['refresh'])
+        except TokenError:
+            raise serializers.ValidationError({"refresh": "Token is invalid or expired."})
+
+        if str(token.payload.get(api_settings.USER_ID_CLAIM)) != str(self.context['request'].user.pk):
+            raise serializers.ValidationError({"refresh": "Token does not belong to this user."})
+
+        data['token'] = token
+        return data
@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .authentication import forget_token_version, revoke_user_tokens
+from .models import CustomUser
+
+# Changing any of these invalidates the user's issued tokens
+TOKEN_FIELDS = ('role', 'is_active', 'email')
+
+
+@receiver(pre_save, sender=CustomUser)
+def detect_token_field_change(sender, instance, update_fields=None, **kwargs):
+    instance._revoke_tokens = False
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_FIELDS):
+        return
+
+    current = CustomUser.objects.filter(pk=instance.pk).values(*TOKEN_FIELDS).first()
+    instance._revoke_tokens = bool(current) and any(current[field] != getattr(instance, field) for field in TOKEN_FIELDS)
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_tokens_on_change(sender, instance, **kwargs):
+    if getattr(instance, '_revoke_tokens', False):
+        instance._revoke_tokens = False
+        revoke_user_tokens(instance.pk)
+        transaction.on_commit(lambda: forget_token_version(instance.pk))
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_deleted_user(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_token_version(instance.pk))
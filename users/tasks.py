@@ -0,0 +1,15 @@
+from celery import shared_task
+from .otp_store import DatabaseOTPStore
+import logging
+
+logger = logging.getLogger('tracker_logger')
+
+
+@shared_task
+def purge_expired_otps():
+    """
+    Delete EmailOTP rows past their TTL (database OTP backend and legacy rows)
+    """
+    deleted = DatabaseOTPStore.purge()
+    logger.info("Purged %s expired OTP rows", deleted)
+    return deleted
@@ -0,0 +1,41 @@
+"""
+Refresh-token revocation store in Redis.
+
+Instead of simplejwt's token_blacklist app (OutstandingToken/BlacklistedToken
+rows on every refresh), a revoked refresh token is a single key per jti that
+expires together with the token, so the store never outgrows the set of live
+tokens. Revoking is SET NX: exactly one caller wins, which makes refresh
+rotation safe against the same token being replayed concurrently. Checks are
+a single EXISTS.
+
+Logging out everywhere does not touch this store: it bumps the user's token
+version (users.authentication.revoke_user_tokens), which invalidates every
+access and refresh token issued before.
+"""
+import time
+from django_redis import get_redis_connection
+
+REVOKED_KEY_PREFIX = "project_tracker:revoked_refresh"
+
+
+def _client():
+    return get_redis_connection("default")
+
+
+def _key(jti):
+    return f"{REVOKED_KEY_PREFIX}:{jti}"
+
+
+def revoke(jti, exp):
+    """
+    Revoke a refresh token until it expires at `exp` (unix time).
+    Returns False if it was already revoked (e.g. rotated by another request).
+    """
+    ttl = int(exp - time.time()) + 1
+    if ttl <= 0:
+        return True
+    return bool(_client().set(_key(jti), 1, nx=True, ex=ttl))
+
+
+def is_revoked(jti):
+    return bool(_client().exists(_key(jti)))
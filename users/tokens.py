@@ -0,0 +1,34 @@
+"""
+JWTs carrying the user claims StatelessJWTAuthentication needs, so requests
+can be authenticated without loading the user row. Refresh tokens are checked
+against the Redis revocation store (users/token_store.py).
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import token_store
+
+USER_CLAIMS = ('email', 'role', 'first_name', 'last_name')
+TOKEN_VERSION_CLAIM = 'ver'
+
+
+class TrackerRefreshToken(RefreshToken):
+    """Refresh token whose claims (and those of its access tokens) describe the user."""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if token_store.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Revoke this token; returns False if it had already been revoked."""
+        return token_store.revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
@@ -13,4 +13,8 @@ urlpatterns = [
     # ---------------------- AUTHENTICATION ------------------------
     path('login/', LoginView.as_view(), name='user_login'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('logout/', LogoutView.as_view(), name='logout'),
+
+    # ---------------------- PREFERENCES ---------------------------
+    path('preferences/notifications/', NotificationPreferenceView.as_view(), name='notification-preferences'),
 ]
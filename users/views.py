@@ -2,10 +2,13 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from .serializers import *
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import TrackerRefreshToken
+from .authentication import revoke_user_tokens
+from .hashing import PasswordHashingBusy, busy_response
 from rest_framework.exceptions import ValidationError
 from project_tracker.utils.response_handler import build_response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from project_tracker.utils.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
 import logging
 logger = logging.getLogger('tracker_logger')
 
@@ -16,6 +19,8 @@ User = get_user_model()
 class SendOTPView(generics.GenericAPIView):
     serializer_class = SendOTPSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'otp_send'
 
     def post(self, request, *args, **kwargs):
         logger.debug("Entered SendOTPView.post()")
@@ -23,17 +28,19 @@ class SendOTPView(generics.GenericAPIView):
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             data = serializer.save()
-            logger.info(f"OTP sent successfully to {data.get('email')}")
+            logger.info("OTP sent successfully to %s", data.get('email'))
             return build_response(True, f"OTP sent successfully to {data.get('email')}")
         except ValidationError as e:
-            logger.warning(f"Validation error: {e.detail}")
+            logger.warning("Validation error: %s", e.detail)
             return build_response(False, errors=e.detail)
         except Exception as e:
-            logger.error(f"Unexpected error: {e}", exc_info=True)
+            logger.error("Unexpected error: %s", e, exc_info=True)
             return build_response(False, message="Failed to send OTP", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 class VerifyOTPView(generics.GenericAPIView):
     serializer_class = VerifyOTPSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'otp_verify'
 
     def post(self, request, *args, **kwargs):
         logger.debug("Entered VerifyOTPView.post()")
@@ -41,7 +48,7 @@ class VerifyOTPView(generics.GenericAPIView):
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             data = serializer.save()
-            logger.info(f"OTP verified successfully for {data.get('email')}")
+            logger.info("OTP verified successfully for %s", data.get('email'))
             return build_response(
                 success=True,
                 message="OTP verified successfully",
@@ -49,14 +56,16 @@ class VerifyOTPView(generics.GenericAPIView):
                 status_code=status.HTTP_200_OK,
             )
         except ValidationError as e:
-            logger.warning(f"Validation error in VerifyOTPView: {e.detail}")
+            logger.warning("Validation error in VerifyOTPView: %s", e.detail)
             return build_response(False, errors=e.detail)
         except Exception as e:
-            logger.error(f"Unexpected error in VerifyOTPView: {e}", exc_info=True)
+            logger.error("Unexpected error in VerifyOTPView: %s", e, exc_info=True)
             return build_response(False, "Something went wrong while verifying OTP", status.HTTP_500_INTERNAL_SERVER_ERROR)
 class LoginView(generics.GenericAPIView):
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         logger.debug("Entered LoginView.post()")
@@ -64,13 +73,15 @@ class LoginView(generics.GenericAPIView):
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             data = serializer.validated_data
-            logger.info(f"Login successful for {data.get('email')}")
+            logger.info("Login successful for %s", data.get('email'))
             return build_response(True, "Login successful", data=data, status_code=status.HTTP_200_OK)
         except ValidationError as e:
-            logger.warning(f"Validation error in LoginView: {e.detail}")
+            logger.warning("Validation error in LoginView: %s", e.detail)
             return build_response(False, errors=e.detail)
+        except PasswordHashingBusy as e:
+            return busy_response(e)
         except Exception as e:
-            logger.error(f"Unexpected error during login: {e}", exc_info=True)
+            logger.error("Unexpected error during login: %s", e, exc_info=True)
             return build_response(False, "Invalid credentials", status.HTTP_401_UNAUTHORIZED)
 
 class ManagerRegisterView(generics.CreateAPIView):
@@ -86,11 +97,11 @@ class ManagerRegisterView(generics.CreateAPIView):
             serializer.is_valid(raise_exception=True)
             user = serializer.save()
 
-            refresh = RefreshToken.for_user(user)
+            refresh = TrackerRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
 
-            logger.info(f"Manager registered successfully: {user.email}")
+            logger.info("Manager registered successfully: %s", user.email)
 
             return build_response(
                 success=True,
@@ -104,9 +115,66 @@ class ManagerRegisterView(generics.CreateAPIView):
             )
 
         except ValidationError as e:
-            logger.warning(f"Validation error during manager registration: {e.detail}")
+            logger.warning("Validation error during manager registration: %s", e.detail)
             return build_response(False, errors=e.detail)
 
+        except PasswordHashingBusy as e:
+            return busy_response(e)
+
+        except Exception as e:
+            logger.error("Unexpected error in ManagerRegisterView: %s", e, exc_info=True)
+            return build_response(False, "Something went wrong during registration", status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class NotificationPreferenceView(generics.GenericAPIView):
+    serializer_class = NotificationPreferenceSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        # request.user is built from token claims; preferences live on the row
+        return User.objects.get(pk=self.request.user.pk)
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        return build_response(True, "Notification preferences retrieved successfully", data=serializer.data)
+
+    def patch(self, request, *args, **kwargs):
+        logger.debug("Entered NotificationPreferenceView.patch()")
+        try:
+            serializer = self.get_serializer(self.get_object(), data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            logger.info("Notification mode set to '%s' for %s", serializer.data['notification_mode'], request.user.email)
+            return build_response(True, "Notification preferences updated successfully", data=serializer.data)
+        except ValidationError as e:
+            logger.warning("Validation error in NotificationPreferenceView: %s", e.detail)
+            return build_response(False, errors=e.detail)
+        except Exception as e:
+            logger.error("Unexpected error in NotificationPreferenceView: %s", e, exc_info=True)
+            return build_response(False, errors="Failed to update notification preferences", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LogoutView(generics.GenericAPIView):
+    serializer_class = LogoutSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        logger.debug("Entered LogoutView.post()")
+        try:
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+
+            if serializer.validated_data['everywhere']:
+                revoke_user_tokens(request.user.pk)
+                logger.info("All tokens revoked for %s", request.user.email)
+                return build_response(True, "Logged out from all devices")
+
+            serializer.validated_data['token'].blacklist()
+            logger.info("Refresh token revoked for %s", request.user.email)
+            return build_response(True, "Logged out successfully")
+        except ValidationError as e:
+            logger.warning("Validation error in LogoutView: %s", e.detail)
+            return build_response(False, errors=e.detail)
         except Exception as e:
-            logger.error(f"Unexpected error in ManagerRegisterView: {e}", exc_info=True)
-            return build_response(False, "Something went wrong during registration", status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            logger.error("Unexpected error in LogoutView: %s", e, exc_info=True)
+            return build_response(False, errors="Failed to log out", status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)